@@ -1,9 +1,18 @@
 import streamlit as st
 import pandas as pd
-from io import BytesIO
 from datetime import datetime
-import plotly.express as px
-import base64
+import functools
+from collections import deque
+from smartbiz.assets import APP_STYLE, template_csv, template_xlsx
+from smartbiz.instrumentation import DEBUG_ENABLED, RerunRecorder, profiling
+from smartbiz.ingest import (
+    ARROW_ENABLED, SQL_ENABLED_BY_DEFAULT, MissingColumnsError, content_hash, content_hash_stream,
+    get_default_cache, load_transactions
+)
+from smartbiz.normalize import format_memory_report
+from smartbiz.quality import QualityReport, format_quality_report
+# Modul lain (cube, grafik, SQL, streaming, Excel, proyeksi, laporan, ...) baru
+# diimpor di fungsi yang memakainya, seperti plotly: halaman Home tetap ringan
 
 # ---------- SETUP ---------- #
 st.set_page_config(
@@ -12,115 +21,202 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ---------- BACKGROUND STYLE ---------- #
-blue_sky = "#E2F9FF"
-st.markdown(f"<style>body {{ background-color: {blue_sky}; }}</style>", unsafe_allow_html=True)
-
-# ---------- UI STYLE ---------- #
-st.markdown("""
-<style>
-    /* Font Family Utama - Gunakan font sans-serif profesional */
-    html, body, [class*="css"]  {
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        color: #1a2e44;
-    }
-
-    h1, h2, h3, h4 {
-        font-family: 'Segoe UI Semibold', Tahoma, Geneva, Verdana, sans-serif;
-        color: #1a2e44;
-        font-weight: 700;
-    }
-
-    /* Font untuk label dan teks info */
-    label, .css-1cpxqw2 {
-        font-family: 'Segoe UI', sans-serif;
-        color: #2a3b4c;
-        font-weight: 500;
-    }
-
-    /* Metric dan angka */
-    .element-container .metric-container .big-number {
-        font-size: 28px !important;
-        font-weight: bold !important;
-    }
-
-    .metric-label {
-        font-size: 14px !important;
-        font-weight: 500;
-        color: #4b5c6b;
-    }
-
-    /* Teks biasa */
-    p, span, div {
-        font-family: 'Segoe UI', sans-serif;
-        font-size: 16px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# ---------- FORM STYLE ---------- #
-st.markdown("""
-    <style>
-    /* Umum untuk semua input */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div,
-    .stNumberInput > div > div input {
-        background-color: #F8FEFF;  /* ganti abu jadi putih kebiruan */
-        color: black;
-        border: 1px solid #9AE1FF;
-        border-radius: 8px;
-    }      
-             
-    /* Khusus tombol + dan - pada NumberInput */
-    .stNumberInput button {
-        background-color: #F8FEFF;
-        color: black;
-        border: 1px solid #9AE1FF;
-    }
-
-    /* Hover & fokus */
-    .stNumberInput > div > div input:focus,
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div:focus {
-        border: 2px solid #62c4e6;
-        outline: none;
-    }
-
-    /* Label */
-    label {
-        color: #9AE1FF;
-        font-weight: bold;
-    }
-            
-    /* Ubah warna tag di multiselect */
-    .stMultiSelect [data-baseweb="tag"] {
-        background-color: #d0e7ff !important;  /* pastel biru */
-        color: #003366 !important;            /* teks biru tua */
-        border: none !important;
-    }
-    .stMultiSelect [data-baseweb="tag"] span {
-        color: #003366 !important;
-    }  
-    </style>
-""", unsafe_allow_html=True)
+# Pilihan jumlah baris per halaman tabel "Data Penjualan"
+PAGE_SIZES = [25, 50, 100, 250]
+# Daftar customer per segmen RFM di halaman dibatasi (urut nilai belanja)
+SEGMENT_ROWS = 500
+# Interval (detik) pengecekan progres laporan yang dibuat di background
+REPORT_POLL_SECONDS = 0.5
+# Interval (detik) pengecekan progres konversi Excel di background
+EXCEL_POLL_SECONDS = 0.2
+# Jumlah rerun fragment terakhir yang ditampilkan di panel debug
+FRAGMENT_HISTORY = 20
+
+# ---------- STYLE ---------- #
+# CSS dibaca sekali per proses dari smartbiz/templates/app.css
+st.markdown(APP_STYLE, unsafe_allow_html=True)
 
 # ---------- SESSION STATE ---------- #
-if "generating_pdf" not in st.session_state:
-    st.session_state.generating_pdf = False
-
-if "pdf_ready" not in st.session_state:
-    st.session_state.pdf_ready = False
-
 if "page" not in st.session_state:
     st.session_state.page = "home"
 if "valid_file" not in st.session_state:
     st.session_state.valid_file = False
-if "df" not in st.session_state:
-    st.session_state.df = None
+if "dataset_key" not in st.session_state:
+    st.session_state.dataset_key = None
+if "store" not in st.session_state:
+    st.session_state.store = None
+if "sql_dataset" not in st.session_state:
+    st.session_state.sql_dataset = None
 if "info" not in st.session_state:
     st.session_state.info = {}
+if "excel_jobs" not in st.session_state:
+    st.session_state.excel_jobs = {}
+if "perf_fragments" not in st.session_state:
+    # Recorder rerun fragment terakhir untuk panel debug (jumlahnya dibatasi)
+    st.session_state.perf_fragments = deque(maxlen=FRAGMENT_HISTORY)
+
+# ---------- INSTRUMENTASI ---------- #
+def perf_stage(name, rows=None):
+    # Tahap rerun yang diukur: waktu, baris & (opsional) peak memori
+    return st.session_state.perf.stage(name, rows)
+
+def measured(name):
+    # Dekorator untuk section/fragment. Rerun fragment (rerun halaman sudah
+    # selesai) dicatat di recorder baru, bukan ditumpuk ke rerun halaman
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            page_recorder = st.session_state.perf
+            if not page_recorder.finished:
+                with perf_stage(name):
+                    return fn(*args, **kwargs)
+            recorder = page_recorder.fragment_rerun()
+            st.session_state.perf = recorder
+            try:
+                with recorder, perf_stage(name):
+                    return fn(*args, **kwargs)
+            finally:
+                st.session_state.perf = page_recorder
+                st.session_state.perf_fragments.append(recorder)
+        return wrapper
+    return decorator
 
 # ---------- HALAMAN: HOME ---------- #
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_sheet_names(file_hash, _data):
+    from smartbiz.excel import list_sheets
+    return list_sheets(_data)
+
+@st.fragment(run_every=EXCEL_POLL_SECONDS)
+def excel_progress(job):
+    # Dipanggil ulang tiap EXCEL_POLL_SECONDS selama konversi berjalan; setelah
+    # selesai seluruh halaman di-rerun sekali untuk memakai datasetnya
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text=f"⏳ {job.stage}...")
+
+def load_excel_upload(file, slot="upload"):
+    # df None = konversi masih berjalan; script tidak menunggu, progres
+    # dipantau fragment. ``slot`` memisahkan upload Home & tambah transaksi.
+    from smartbiz.excel import sheet_dataset_key, submit_conversion
+    data = file.getvalue()
+    file_hash = content_hash(data)
+    sheets = get_sheet_names(file_hash, data)
+    sheet = st.selectbox("Pilih Sheet", sheets, key=f"{slot}_sheet") if len(sheets) > 1 else sheets[0]
+
+    dataset_key = sheet_dataset_key(file_hash, sheet)
+    jobs = st.session_state.excel_jobs
+    df = get_default_cache().get(dataset_key)
+    if df is not None:
+        # Konversi (bila ada) sudah selesai dan hasilnya ada di cache
+        jobs.pop(slot, None)
+        return dataset_key, df
+
+    # Konversi workbook → snapshot columnar berjalan di background worker.
+    # Job disimpan per sesi supaya konversi yang gagal tidak diulang tiap rerun
+    job = jobs.get(slot)
+    if job is None or job.key != dataset_key:
+        job = jobs[slot] = submit_conversion(data, sheet, file_hash=file_hash)
+    if not job.done():
+        excel_progress(job)
+        return dataset_key, None
+    with perf_stage("parse_excel") as stage:
+        df = job.result()
+        stage.rows = len(df)
+    del jobs[slot]
+    return dataset_key, df
+
+def show_quality_report(report):
+    # Hasil pemeriksaan kualitas data saat upload (tersimpan bersama dataset)
+    if report is None:
+        return
+    if not report.has_issues:
+        st.caption(f"🧪 {format_quality_report(report)}.")
+        return
+    st.warning(f"🧪 Kualitas data: {report.dropped:,} dari {report.rows:,} baris dibuang. {format_quality_report(report)}.")
+    with st.expander("Detail masalah data"):
+        st.dataframe(pd.DataFrame(
+            [(label, action, count, ", ".join(map(str, examples))) for label, action, count, examples in report.issues()],
+            columns=["Masalah", "Tindakan", "Jumlah Baris", "Contoh Baris"]
+        ), hide_index=True, use_container_width=True)
+
+def use_dataset(dataset_key, df=None, store=None, name=None, use_sql=False):
+    # Mode SQL: data dipindah ke SQLite lokal, sesi hanya menyimpan referensinya
+    sql_dataset = None
+    if use_sql:
+        from smartbiz.sql_backend import SqlDataset
+        from smartbiz.table_view import StoreRows
+        sql_dataset = SqlDataset(dataset_key)
+        if not sql_dataset.exists():
+            with st.spinner("💽 Menyimpan ke database lokal..."), perf_stage("sql_import"):
+                if df is not None:
+                    sql_dataset.import_frame(df, name)
+                else:
+                    sql_dataset.import_chunks(StoreRows(store).iter_chunks(), name)
+        df, store = None, None
+    st.session_state.valid_file = True
+    # DataFrame-nya sendiri tetap di cache bersama, sesi cukup menyimpan key
+    st.session_state.dataset_key = dataset_key
+    st.session_state.store = store
+    st.session_state.sql_dataset = sql_dataset
+
+def saved_datasets_picker():
+    from smartbiz.sql_backend import SqlDataset, list_datasets
+    saved = list_datasets()
+    if saved.empty:
+        return False
+    with st.expander(f"📂 Dataset tersimpan di database lokal ({len(saved)})"):
+        labels = {
+            row.key: f"{row.name or row.key[:8]} — {row.rows:,} baris ({row.created_at})"
+            for row in saved.itertuples()
+        }
+        key = st.selectbox("Pilih dataset", list(labels), format_func=labels.get)
+        col1, col2 = st.columns(2)
+        with col1:
+            use = st.toggle("Pakai dataset ini", key="use_saved_dataset")
+        with col2:
+            if st.button("🗑️ Hapus dari database"):
+                SqlDataset(key).remove()
+                st.rerun()
+    if use:
+        use_dataset(key, use_sql=True)
+        st.success("✅ Dataset dari database lokal siap dipakai.")
+    return use
+
+def load_multi_upload(files, use_sql=False):
+    from smartbiz.multi_file import FileColumnsError, load_many
+    drop_overlap = st.checkbox(
+        "🧹 Buang baris yang sama persis antar file",
+        value=True,
+        help="Berguna bila periode ekspor tumpang tindih. Baris kembar di dalam satu file tetap dipertahankan."
+    )
+    try:
+        # Semua file diparse paralel di process pool, lalu digabung & diurutkan
+        progress_bar = st.progress(0.0, text=f"⏳ Membaca {len(files)} file...")
+        with perf_stage("parse_multi") as stage:
+            dataset_key, df, report = load_many(
+                [(file.name, file.getvalue()) for file in files], drop_overlap=drop_overlap,
+                progress=lambda done, total: progress_bar.progress(done / total, text=f"⏳ Membaca file... {done}/{total}")
+            )
+            stage.rows = len(df)
+        progress_bar.empty()
+        use_dataset(dataset_key, df, name=f"{len(files)} file ({files[0].name}, ...)", use_sql=use_sql)
+        st.success(f"✅ {len(files)} file berhasil digabung: {len(df):,} baris.")
+        if report.duplicates_across:
+            action = "dibuang" if drop_overlap else "dipertahankan"
+            st.caption(f"🔁 {report.duplicates_across:,} baris sudah ada di file lain ({action}).")
+        if report.duplicates_within:
+            st.caption(f"ℹ️ {report.duplicates_within:,} baris kembar di dalam file yang sama (dipertahankan).")
+        if "memory_report" in df.attrs:
+            st.caption(f"💾 Memori data: {format_memory_report(df.attrs['memory_report'])}")
+        show_quality_report(QualityReport.from_dict(df.attrs.get("quality_report")))
+    except FileColumnsError as e:
+        st.session_state.valid_file = False
+        st.error(f"⚠️ Kolom file **{e.filename}** tidak sesuai format. Gunakan file template di bawah.")
+    except Exception as e:
+        st.session_state.valid_file = False
+        st.error(f"⚠️ Gagal membaca file: {e}")
+
 def home_page():
     col1, col2, col3 = st.columns([1, 6, 1])
     with col1:
@@ -160,18 +256,69 @@ def home_page():
 
     # UPLOAD
     st.subheader("📤 Upload File Data Transaksi")
-    file = st.file_uploader("Unggah file (.csv / .xlsx)", type=["csv", "xlsx"])
-    if file:
+    use_sql = st.toggle(
+        "💽 Simpan ke database lokal (SQLite)",
+        value=SQL_ENABLED_BY_DEFAULT,
+        help="Dataset tetap tersimpan setelah aplikasi restart dan analisis dijalankan sebagai query ber-index, bukan di memori sesi."
+    )
+    using_saved = use_sql and saved_datasets_picker()
+    files = st.file_uploader(
+        "Unggah file (.csv / .xlsx) — boleh lebih dari satu, mis. satu file per bulan/outlet",
+        type=["csv", "xlsx"], accept_multiple_files=True
+    )
+    if using_saved:
+        pass
+    elif len(files) > 1:
+        load_multi_upload(files, use_sql)
+    elif files:
+        file = files[0]
+        streaming = False
+        if file.name.lower().endswith(".csv"):
+            from smartbiz.streaming import STREAMING_THRESHOLD_BYTES, TransactionStore, ingest_csv_stream
+            streaming = st.toggle(
+                "⚡ Mode streaming (file besar)",
+                value=file.size > STREAMING_THRESHOLD_BYTES,
+                help="File dibaca per bagian dan disimpan di disk, hanya ringkasan agregat yang dimuat ke memori."
+            )
         try:
-            df = pd.read_csv(file) if file.name.endswith(".csv") else pd.read_excel(file)
-            required_columns = {"Tanggal", "Nama Customer", "Nama Produk", "Kategori", "Jumlah", "Harga", "Total"}
-            if required_columns.issubset(df.columns):
-                st.session_state.valid_file = True
-                st.session_state.df = df
-                st.success("✅ Successfully uploaded!")
+            if streaming:
+                dataset_key = content_hash_stream(file)
+                store = TransactionStore(dataset_key)
+                if not store.exists():
+                    progress_bar = st.progress(0.0, text="⏳ Membaca file per chunk...")
+                    with perf_stage("parse_stream") as stage:
+                        store = ingest_csv_stream(
+                            file, dataset_key, total_bytes=file.size,
+                            progress=lambda fraction, rows: progress_bar.progress(fraction, text=f"⏳ Membaca file per chunk... {rows:,} baris")
+                        )
+                        stage.rows = store.num_rows
+                    progress_bar.empty()
+                df = None
+            elif file.name.lower().endswith(".xlsx"):
+                dataset_key, df = load_excel_upload(file)
+                store = None
             else:
+                # Parsing & validasi kolom hanya sekali per isi file (cache by hash)
+                with perf_stage("parse_csv") as stage:
+                    dataset_key, df = load_transactions(file.getvalue(), file.name)
+                    stage.rows = len(df)
+                store = None
+            if df is None and store is None:
+                # Konversi Excel masih berjalan di background
                 st.session_state.valid_file = False
-                st.error("⚠️ Kolom tidak sesuai format. Gunakan file template di bawah.")
+            else:
+                use_dataset(dataset_key, df, store, file.name, use_sql=use_sql)
+                st.success("✅ Successfully uploaded!")
+                if use_sql:
+                    st.caption("💽 Data disimpan di database lokal; dashboard membaca hasil query saja.")
+                elif store is not None:
+                    st.caption(f"💾 {store.num_rows:,} baris disimpan di disk; hanya cube agregat yang dimuat ke memori.")
+                elif "memory_report" in df.attrs:
+                    st.caption(f"💾 Memori data: {format_memory_report(df.attrs['memory_report'])}")
+                show_quality_report(store.quality_report if store is not None else QualityReport.from_dict(df.attrs.get("quality_report")))
+        except MissingColumnsError:
+            st.session_state.valid_file = False
+            st.error("⚠️ Kolom tidak sesuai format. Gunakan file template di bawah.")
         except Exception as e:
             st.session_state.valid_file = False
             st.error(f"⚠️ Gagal membaca file: {e}")
@@ -199,311 +346,249 @@ def home_page():
     # DOWNLOAD TEMPLATE
     st.markdown("### 📥 Unduh Format Template:")
     colcsv, colsheet = st.columns(2)
-    template_data = pd.DataFrame({
-        "Tanggal": ["2024-01-01"],
-        "Nama Customer": ["Contoh Pelanggan"],
-        "Nama Produk": ["Contoh Produk"],
-        "Kategori": ["Minuman"],
-        "Jumlah": [5],
-        "Harga": [10000],
-        "Total": [50000]
-    })
     with colcsv:
-        csv_buffer = template_data.to_csv(index=False)
-        st.download_button("📎 Format CSV", csv_buffer, "format_template.csv", mime="text/csv")
+        st.download_button("📎 Format CSV", template_csv(), "format_template.csv", mime="text/csv")
     with colsheet:
-        excel_bytes = BytesIO()
-        template_data.to_excel(excel_bytes, index=False)
-        st.download_button("📄 Excel Format", excel_bytes.getvalue(), "format_template.xlsx")
+        # File Excel baru dibuat saat diklik (openpyxl tidak diimpor saat startup)
+        st.download_button("📄 Excel Format", template_xlsx, "format_template.xlsx", on_click="ignore")
 
     st.markdown("---")  
     st.markdown("""<footer style='text-align: center; padding: 10px;'><p>© 2025 SmartBiz by Zai. All rights reserved.</p></footer>""", unsafe_allow_html=True)
 
 # ---------- HALAMAN: DASHBOARD ---------- #
-def plot_to_base64(fig):
-    img_bytes = fig.to_image(format="png", width=800, height=400)
-    return base64.b64encode(img_bytes).decode("utf-8")
-
-def img_tag(fig):
-    return f'<img src="data:image/png;base64,{plot_to_base64(fig)}" style="width:100%; margin-bottom:20px;" />'
-
-def dashboard_page():
-    # ---------- HEADER ---------- #
-    st.markdown("""
-        <div class="header-container">
-            <div class="header-content">
-                <img src="https://cdn-icons-png.flaticon.com/512/6062/6062646.png" alt="Business Icon" width="60" style="margin-right: 15px;">
-                <div>
-                    <p class="header-title">Dashboard Analisis Bisnis - SmartBiz</p>
-                    <p class="header-subtitle">Berikut ini analisis bisnis kamu</p>
-                </div>
-            </div>
-        </div>
-
-        <style>
-        .header-container {
-            background: linear-gradient(to right, #cfefff, #eaf8ff);
-            padding: 20px 30px;
-            border-radius: 10px;
-            margin-bottom: 25px;
-        }
-        .header-content {
-            display: flex;
-            align-items: center;
-        }
-        .header-title {
-            font-size: 26px;
-            font-weight: bold;
-            color: #1a3c5d;
-            margin: 0;
-        }
-        .header-subtitle {
-            font-size: 16px;
-            color: #446178;
-            margin: 0;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-    info = st.session_state.info
-    df = st.session_state.df.copy()
-
-    # --- Informasi Usaha
-    st.markdown("### 📋 Informasi Usaha")
-    col1, col2, col3 = st.columns(3)
-    with col1: st.write(f"**Nama Usaha:** {info['nama']}")
-    with col2: st.write(f"**Jenis Usaha:** {info['jenis']}")
-    with col3: st.write(f"**Usia Usaha:** {datetime.now().year - int(info['tahun'])} tahun")
-
-    # --- Preprocessing
-    df["Tanggal"] = pd.to_datetime(df["Tanggal"])
-    df.sort_values("Tanggal", inplace=True)
-
-    # --- Filter
-    st.markdown("### 🔍 Filter Data")
-    col1, col2, col3 = st.columns(3)
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_cube(dataset_key, _df, _store=None, _seed=None):
+    from smartbiz.cube import build_cube
+    # Cube dibangun sekali per dataset (key = hash isi file), dipakai lintas sesi.
+    # Mode streaming: cube sudah dibangun saat upload, tinggal dibaca dari store.
+    # ``_seed``: cube yang sudah diperbarui secara inkremental (append transaksi).
+    if _seed is not None:
+        return _seed
+    return build_cube(_df) if _df is not None else _store.load_cube()
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_aggregates(dataset_key, _cube, _seed=None):
+    from smartbiz.incremental import RunningAggregates
+    # Agregat tanpa filter; setelah append cukup dijumlahkan dengan agregat delta
+    return _seed if _seed is not None else RunningAggregates.from_frame(_cube)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_filter_index(dataset_key, kind, _df):
+    from smartbiz.filters import FilterIndex
+    # kind: "rows" (baris mentah) atau "cube"; index dibangun sekali per dataset
+    return FilterIndex(_df)
+
+def render_sales_table(rows):
+    from smartbiz.table_view import SORT_COLUMNS, export_csv, page_count
+    # Hanya halaman yang terlihat yang dikirim ke browser; cari & sort di server
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
     with col1:
-        date_range = st.date_input("Rentang Tanggal", [df["Tanggal"].min(), df["Tanggal"].max()])
+        query = st.text_input("🔎 Cari Customer / Produk / Kategori", key="table_search")
     with col2:
-        kategori_filter = st.multiselect("Jenis Produk", df["Kategori"].unique().tolist(), default=df["Kategori"].unique().tolist())
+        sort_by = st.selectbox("Urutkan", SORT_COLUMNS, key="table_sort")
     with col3:
-        # Multiselect tanpa default (kosong) artinya awalnya semua ditampilkan
-        customer_filter = st.multiselect("Nama Customer", df["Nama Customer"].unique().tolist())
-
-    # Terapkan filter jika tanggal valid
-    if len(date_range) == 2:
-        start_date = pd.to_datetime(date_range[0])
-        end_date = pd.to_datetime(date_range[1])
-
-        # Filter tanggal & kategori dulu
-        filtered_df = df[
-            df["Tanggal"].between(start_date, end_date) &
-            df["Kategori"].isin(kategori_filter)
-        ]
-
-        # Kalau user milih customer, baru di-filter berdasarkan itu
-        if customer_filter:
-            filtered_df = filtered_df[filtered_df["Nama Customer"].isin(customer_filter)]
-    else:
-        filtered_df = df.copy()
-
-    # --- Tabel Data Penjualan
-    st.markdown("### 🧾 Data Penjualan")
-    st.dataframe(filtered_df, use_container_width=True, height=300)
+        ascending = st.selectbox("Arah", ["Naik", "Turun"], key="table_direction") == "Naik"
+    with col4:
+        page_size = st.selectbox("Baris", PAGE_SIZES, key="table_page_size")
+
+    with perf_stage("table_search") as stage:
+        rows = rows.search(query)
+        total_rows = stage.rows = len(rows)
+    pages = page_count(total_rows, page_size)
+    if st.session_state.get("table_page", 1) > pages:
+        st.session_state.table_page = pages
+    page = st.number_input(f"Halaman (dari {pages:,})", min_value=1, max_value=pages, step=1, key="table_page")
+
+    with perf_stage("table_page", page_size):
+        # Termasuk serialisasi st.dataframe ke browser
+        st.dataframe(rows.page(page - 1, page_size, sort_by, ascending), use_container_width=True, height=300)
+    first_row = min((page - 1) * page_size + 1, total_rows)
+    last_row = min(page * page_size, total_rows)
+    st.caption(f"Menampilkan baris {first_row:,}–{last_row:,} dari {total_rows:,}")
+    st.download_button(
+        "📥 Download Data Terfilter (CSV)",
+        data=lambda: export_csv(rows),
+        file_name="SmartBiz_Data_Penjualan.csv",
+        mime="text/csv",
+        on_click="ignore"
+    )
 
-    # --- Ringkasan Bisnis
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_metrics(dataset_key, filter_args, _cube_index):
+    from smartbiz.metrics import compute_metrics
+    # Agregat di-cache per (dataset, state filter); rerun fragment tidak menghitung ulang
+    return compute_metrics(_cube_index.filter(*filter_args))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_total_metrics(dataset_key, _aggregates):
+    # Tampilan tanpa filter: diturunkan dari agregat tersimpan, bukan dari cube
+    return _aggregates.to_metrics()
+
+def is_unfiltered(filter_args, min_date, max_date, kategori_options):
+    if not filter_args:
+        return True
+    start_date, end_date, kategori, customers = filter_args
+    return (start_date <= pd.Timestamp(min_date).normalize() and end_date >= pd.Timestamp(max_date).normalize()
+            and (kategori is None or set(kategori) >= set(kategori_options)) and not customers)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_sql_filter_options(dataset_key, _sql_dataset):
+    min_date, max_date = _sql_dataset.date_bounds()
+    return min_date, max_date, _sql_dataset.labels("Kategori"), _sql_dataset.labels("Nama Customer")
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_sql_metrics(dataset_key, filter_args, _sql_dataset):
+    # Backend SQL: filter & group-by dijalankan sebagai query atas tabel rollup
+    return _sql_dataset.metrics(*filter_args)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_figures(dataset_key, filter_args, _metrics):
+    from smartbiz.figures import build_figures
+    # Figure Plotly dibangun sekali per (dataset, state filter)
+    return build_figures(_metrics)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_customer_analytics(dataset_key, filter_args, _cube_index=None, _sql_dataset=None):
+    from smartbiz.customers import compute_customer_analytics
+    # RFM & cohort dihitung dari cube terfilter (atau rollup SQL), sekali per (dataset, state filter)
+    if _sql_dataset is not None:
+        return compute_customer_analytics(_sql_dataset.daily_rollup("Nama Customer", *filter_args))
+    return compute_customer_analytics(_cube_index.filter(*filter_args))
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_customer_figures(dataset_key, filter_args, _analytics):
+    from smartbiz.figures import build_customer_figures
+    return build_customer_figures(_analytics)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_forecast(dataset_key, _cube=None, _sql_dataset=None):
+    from smartbiz.forecast import forecast_sales
+    # Proyeksi selalu dari seluruh data (tidak ikut filter), jadi cukup sekali per hash dataset
+    if _sql_dataset is not None:
+        return forecast_sales(_sql_dataset.daily_rollup("Nama Produk"))
+    return forecast_sales(_cube)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_forecast_figures(dataset_key, _forecast):
+    from smartbiz.figures import build_forecast_figures
+    return build_forecast_figures(_forecast)
+
+# ---------- SECTION DASHBOARD ---------- #
+# Setiap section yang punya interaksi sendiri adalah fragment: klik di dalamnya
+# hanya me-rerun section itu, bukan seluruh dashboard.
+@measured("section_summary")
+def business_summary_section(metrics):
     st.markdown("### 📌 Ringkasan Bisnis")
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("💰 Omset", f"Rp {filtered_df['Total'].sum():,.0f}")
+        st.metric("💰 Omset", f"Rp {metrics.total_omset:,.0f}")
     with col2:
-        st.metric("📦 Total Order", f"{filtered_df.shape[0]}")
+        st.metric("📦 Total Order", f"{metrics.total_order}")
     with col3:
-        st.metric("🧍 Total Customer", f"{filtered_df['Nama Customer'].nunique()}")
+        st.metric("🧍 Total Customer", f"{metrics.total_customer}")
     with col4:
-        avg_order = filtered_df['Total'].mean() if not filtered_df.empty else 0
-        st.metric("🧮 AOV", f"Rp {avg_order:,.0f}")
+        st.metric("🧮 AOV", f"Rp {metrics.aov:,.0f}")
     with col5:
-        st.metric("🛒 Produk Unik Terjual", f"{filtered_df['Nama Produk'].nunique()}")
+        st.metric("🛒 Produk Unik Terjual", f"{metrics.unique_products}")
 
-    # --- 2 Kolom Visualisasi PIE
-    st.markdown("### 📊 Distribusi Penjualan")
-    color_sequence = px.colors.qualitative.Pastel
+@st.fragment
+@measured("section_table")
+def sales_table_section(rows):
+    st.markdown("### 🧾 Data Penjualan")
+    render_sales_table(rows)
 
+@st.fragment
+@measured("section_distribution")
+def distribution_section(figures):
+    st.markdown("### 📊 Distribusi Penjualan")
     col1, col2 = st.columns(2)
-
-    # Omset per Produk
     with col1:
-        pie1 = filtered_df.groupby("Nama Produk")["Total"].sum().reset_index()
-        fig1 = px.pie(
-            pie1,
-            names="Nama Produk",
-            values="Total",
-            title="Omset per Produk",
-            color_discrete_sequence=color_sequence
-        )
-        st.plotly_chart(fig1, use_container_width=True)
-
-    # Order per Produk
+        st.plotly_chart(figures["omset_produk"], use_container_width=True)
     with col2:
-        pie2 = filtered_df.groupby("Nama Produk")["Jumlah"].sum().reset_index()
-        fig2 = px.pie(
-            pie2,
-            names="Nama Produk",
-            values="Jumlah",
-            title="Order per Produk",
-            color_discrete_sequence=color_sequence
-        )
-        st.plotly_chart(fig2, use_container_width=True)
-
-    # --- Horizontal Bar Charts
-    custom_blue = [
-        [0.0, "#a9d1f6"],  
-        [0.5, "#75b2f9"],  
-        [1.0, "#3681c4"]   
-    ]
+        st.plotly_chart(figures["order_produk"], use_container_width=True)
 
+@st.fragment
+@measured("section_ranking")
+def ranking_section(figures):
     st.markdown("### 🥇 Ranking Produk & Pelanggan")
     col1, col2 = st.columns(2)
-
     with col1:
-        rank_qty = filtered_df.groupby("Nama Produk")["Jumlah"].sum().sort_values(ascending=False).head(10).reset_index()
-        fig1 = px.bar(
-            rank_qty,
-            x="Jumlah",
-            y="Nama Produk",
-            orientation="h",
-            color="Jumlah",
-            color_continuous_scale=custom_blue,
-            title="TOP Product (by Order)",
-            category_orders={"Nama Produk": rank_qty["Nama Produk"].tolist()}
-        )
-        fig1.update_coloraxes(showscale=False)
-        st.plotly_chart(fig1, use_container_width=True)
-
+        st.plotly_chart(figures["top_produk"], use_container_width=True)
     with col2:
-        rank_cat = filtered_df.groupby("Kategori")["Jumlah"].count().sort_values(ascending=False).reset_index()
-        fig2 = px.bar(
-            rank_cat,
-            x="Jumlah",
-            y="Kategori",
-            orientation="h",
-            color="Jumlah",
-            color_continuous_scale=custom_blue,
-            title="TOP Product Category (by Order)",
-            category_orders={"Kategori": rank_cat["Kategori"].tolist()}
-        )
-        fig2.update_coloraxes(showscale=False)
-        st.plotly_chart(fig2, use_container_width=True)
-
-    # Loyal customer
-    loyal = filtered_df.groupby("Nama Customer")["Total"].sum().sort_values(ascending=False).head(10).reset_index()
-    fig3 = px.bar(
-        loyal,
-        x="Total",
-        y="Nama Customer",
-        orientation="h",
-        color="Total",
-        color_continuous_scale=custom_blue,
-        title="TOP Loyal Customer (by Total Spending)",
-        category_orders={"Nama Customer": loyal["Nama Customer"].tolist()}
-    )
-    fig3.update_coloraxes(showscale=False)
-    st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(figures["top_kategori"], use_container_width=True)
+    st.plotly_chart(figures["top_customer"], use_container_width=True)
 
-    # --- Line & Bar Chart: Order by Waktu
+@st.fragment
+@measured("section_time_pattern")
+def time_pattern_section(figures):
     st.markdown("### ⏰ Pola Pemesanan")
     col1, col2 = st.columns(2)
     with col1:
-        df_daily = filtered_df.groupby("Tanggal")["Jumlah"].sum().reset_index()
-        st.plotly_chart(px.line(df_daily, x="Tanggal", y="Jumlah", title="Order Harian"), use_container_width=True)
+        st.plotly_chart(figures["order_harian"], use_container_width=True)
     with col2:
-        df_monthly = filtered_df.copy()
-        df_monthly["Bulan"] = df_monthly["Tanggal"].dt.to_period("M").astype(str)
-        monthly_order = df_monthly.groupby("Bulan")["Jumlah"].sum().reset_index()
-        st.plotly_chart(px.bar(monthly_order, x="Bulan", y="Jumlah", title="Order Bulanan"), use_container_width=True)
+        st.plotly_chart(figures["order_bulanan"], use_container_width=True)
 
-    # --- Order per Hari dalam Minggu
     st.markdown("### 📅 Pola Order per Hari")
-    df_day = filtered_df.copy()
-    df_day["Hari"] = df_day["Tanggal"].dt.day_name()
-    df_day_avg = df_day.groupby("Hari")["Jumlah"].mean().reindex([
-        "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
-    ]).reset_index()
-    st.plotly_chart(px.bar(df_day_avg, x="Hari", y="Jumlah", title="Rata-rata Order per Hari"), use_container_width=True)
+    st.plotly_chart(figures["order_hari"], use_container_width=True)
+
+@st.fragment
+@measured("section_forecast")
+def forecast_section(forecast, figures):
+    st.markdown("### 🔮 Proyeksi Penjualan")
+    if forecast.empty:
+        st.info("Belum ada data untuk membuat proyeksi.")
+        return
+    st.caption(f"Proyeksi dari seluruh data (tidak mengikuti filter) dengan model {forecast.model}.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(f"📦 Order {len(forecast.daily)} hari ke depan", f"{forecast.daily['Jumlah'].sum():,.0f}")
+    with col2:
+        st.metric(f"💰 Omset {len(forecast.daily)} hari ke depan", f"Rp {forecast.daily['Total'].sum():,.0f}")
+    with col3:
+        st.metric("📆 Omset bulan depan", f"Rp {forecast.monthly['Total'].iloc[0]:,.0f}")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures["proyeksi_harian"], use_container_width=True)
+    with col2:
+        st.plotly_chart(figures["proyeksi_bulanan"], use_container_width=True)
+
+    st.markdown(f"**Proyeksi per produk ({len(forecast.daily)} hari ke depan)**")
+    produk = forecast.produk.assign(
+        Jumlah=forecast.produk["Jumlah"].round().astype("int64"),
+        Total=forecast.produk["Total"].map("Rp {:,.0f}".format),
+    )
+    st.dataframe(produk, hide_index=True, height=300, use_container_width=True)
 
+@st.fragment
+@measured("section_pareto")
+def pareto_section(metrics):
+    from smartbiz.metrics import pareto_display
     # --- Insight
-    bulan_tertinggi = monthly_order.loc[monthly_order['Jumlah'].idxmax(), 'Bulan'] if not monthly_order.empty else "Data tidak tersedia"
-    produk_terlaris = pie1.loc[pie1['Total'].idxmax(), 'Nama Produk'] if not pie1.empty else "Data tidak tersedia"
-    top_produk_jumlah_list = pie2.sort_values("Jumlah", ascending=False).head(3)["Nama Produk"].tolist() if not pie2.empty else []
+    bulan_tertinggi = metrics.bulan_tertinggi or "Data tidak tersedia"
+    top3_produk = metrics.top_products("Total", 3)["Nama Produk"].tolist()
+    produk_terlaris = top3_produk[0] if top3_produk else "Data tidak tersedia"
+    top_produk_jumlah_list = metrics.top_products("Jumlah", 3)["Nama Produk"].tolist()
     top_produk_jumlah = ', '.join(top_produk_jumlah_list) if top_produk_jumlah_list else "Data tidak tersedia"
-    total_sales = filtered_df["Total"].sum()
-    top_produk_jumlah_list = pie2.sort_values("Jumlah", ascending=False).head(3)["Nama Produk"].tolist() if not pie2.empty else []
-    top_produk_jumlah = ', '.join(top_produk_jumlah_list) if top_produk_jumlah_list else "Data tidak tersedia"
-    total_transaksi = filtered_df.shape[0]
-    aov = filtered_df["Total"].mean() if not filtered_df.empty else 0
-    jumlah_customer = filtered_df["Nama Customer"].nunique()
-
-    top3_produk = pie1.sort_values("Total", ascending=False).head(3)["Nama Produk"].tolist()
-    top_kategori = rank_cat.sort_values("Jumlah", ascending=False).head(1)["Kategori"].values[0] if not rank_cat.empty else "-"
-    transaksi_harian = df_day_avg["Jumlah"].mean() if not df_day_avg.empty else 0
-    hari_terbanyak = df_day_avg.loc[df_day_avg["Jumlah"].idxmax(), "Hari"] if not df_day_avg.empty else "-"
-    hari_tersibuk_value = df_day_avg["Jumlah"].max() if not df_day_avg.empty else 0
-
-    # --- Pareto Produk
-    pareto_produk = filtered_df.groupby("Nama Produk")["Total"].sum().sort_values(ascending=False)
-    pareto_produk_cumsum_pct = pareto_produk.cumsum() / pareto_produk.sum()
-    # Ambil yang kontribusi kumulatif ≤ 80%
-    produk_top_pareto = pareto_produk_cumsum_pct[pareto_produk_cumsum_pct <= 0.8].index.tolist()
-    pareto_produk_detail = pareto_produk.loc[produk_top_pareto]
-    # Buat DataFrame tabel
-    produk_pareto_tabel = pareto_produk_detail.reset_index()
-    produk_pareto_tabel.columns = ["Nama Produk", "Total"]
-    produk_pareto_tabel["Persen"] = (produk_pareto_tabel["Total"] / pareto_produk.sum()) * 100
-    produk_pareto_tabel = produk_pareto_tabel.sort_values("Total", ascending=False)
-    # --- Pareto Customer
-    pareto_customer = filtered_df.groupby("Nama Customer")["Total"].sum().sort_values(ascending=False)
-    pareto_customer_cumsum_pct = pareto_customer.cumsum() / pareto_customer.sum()
-    # Ambil yang kontribusi kumulatif ≤ 80%
-    customer_top_pareto = pareto_customer_cumsum_pct[pareto_customer_cumsum_pct <= 0.8].index.tolist()
-    pareto_customer_detail = pareto_customer.loc[customer_top_pareto]
-    # Buat DataFrame tabel
-    customer_pareto_tabel = pareto_customer_detail.reset_index()
-    customer_pareto_tabel.columns = ["Nama Customer", "Total"]
-    customer_pareto_tabel["Persen"] = (customer_pareto_tabel["Total"] / pareto_customer.sum()) * 100
-    customer_pareto_tabel = customer_pareto_tabel.sort_values("Total", ascending=False)
-
-    # --- DataFrame Produk
-    produk_pareto_df = pareto_produk_detail.reset_index()
-    produk_pareto_df.columns = ["Nama Produk", "Omset"]
-    produk_pareto_df["%"] = (produk_pareto_df["Omset"] / pareto_produk.sum()) * 100
-    produk_pareto_df["Omset"] = produk_pareto_df["Omset"].round(0).astype(int)
-    produk_pareto_df["%"] = produk_pareto_df["%"].round(1)
-
-    # --- DataFrame Customer
-    customer_pareto_df = pareto_customer_detail.reset_index()
-    customer_pareto_df.columns = ["Nama Customer", "Omset"]
-    customer_pareto_df["%"] = (customer_pareto_df["Omset"] / pareto_customer.sum()) * 100
-    customer_pareto_df["Omset"] = customer_pareto_df["Omset"].round(0).astype(int)
-    customer_pareto_df["%"] = customer_pareto_df["%"].round(1)
+    top_kategori = metrics.top_kategori or "-"
+    hari_terbanyak, hari_tersibuk_value = metrics.busiest_day()
+    hari_terbanyak = hari_terbanyak or "-"
 
     # --- Insight Pareto
     st.markdown("### 📈 Analisis Pareto")
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("### 📊 Detail Produk (Kontributor 80% Omset)")
-        st.dataframe(produk_pareto_df, height=300, use_container_width=True)
+        st.dataframe(pareto_display(metrics.pareto_produk), height=300, use_container_width=True)
     with col2:
         st.markdown("### 👑 Detail Customer (Kontributor 80% Omset)")
-        st.dataframe(customer_pareto_df, height=300, use_container_width=True)
-
+        st.dataframe(pareto_display(metrics.pareto_customer), height=300, use_container_width=True)
 
     # Insight ditampilkan
     st.markdown("### 💡 Insight Summary")
     st.info(f"""
-    💰 **Omset & AOV**: Total omset sebesar Rp {total_sales:,.0f}, dengan rata-rata nilai transaksi (AOV) Rp {aov:,.0f} — menjadi tolok ukur performa bisnis.
+    💰 **Omset & AOV**: Total omset sebesar Rp {metrics.total_omset:,.0f}, dengan rata-rata nilai transaksi (AOV) Rp {metrics.aov:,.0f} — menjadi tolok ukur performa bisnis.
 
-    🛒 **Transaksi & Customer**: Terdapat {total_transaksi} transaksi dari {jumlah_customer} pelanggan unik — bisa ditingkatkan dengan program loyalitas atau retensi.
+    🛒 **Transaksi & Customer**: Terdapat {metrics.total_order} transaksi dari {metrics.total_customer} pelanggan unik — bisa ditingkatkan dengan program loyalitas atau retensi.
 
     📆 **Bulan Tertinggi**: Aktivitas penjualan tertinggi terjadi di bulan **{bulan_tertinggi}** — manfaatkan momen ini untuk promosi musiman.
 
@@ -511,7 +596,7 @@ def dashboard_page():
 
     📉 **Hari Sepi**: Hari sepi bisa dianalisis lebih lanjut (misalnya: jadwal buka, cuaca, promosi kurang aktif).
 
-    📈 **Rata-rata Order per Hari**: {transaksi_harian:.1f} order/hari — bisa dijadikan tolok ukur ritme harian.
+    📈 **Rata-rata Order per Hari**: {metrics.avg_weekday_order:.1f} order/hari — bisa dijadikan tolok ukur ritme harian.
 
     📦 **Kategori Terpopuler**: Produk terbanyak terjual berasal dari kategori **{top_kategori}** — cocok jadi andalan lini utama.
 
@@ -521,204 +606,255 @@ def dashboard_page():
 
     🏅 **Top 3 Produk Jumlah Order**: {top_produk_jumlah} — fokus pada produk ini untuk meningkatkan volume penjualan.
 
-    📊 **Pareto Produk**: Hanya {len(produk_top_pareto)} produk (sekitar 20%) menyumbang >80% dari total omset — fokus promosi & stok pada produk ini untuk efisiensi.
+    📊 **Pareto Produk**: Hanya {metrics.pareto_produk.count} produk (sekitar 20%) menyumbang >80% dari total omset — fokus promosi & stok pada produk ini untuk efisiensi.
 
-    👑 **Pareto Customer**: {len(customer_top_pareto)} pelanggan menyumbang >80% dari penjualan — ideal ditarget dengan program loyalitas atau benefit eksklusif.
+    👑 **Pareto Customer**: {metrics.pareto_customer.count} pelanggan menyumbang >80% dari penjualan — ideal ditarget dengan program loyalitas atau benefit eksklusif.
     """)
 
-    # --- Download Report
-    def generate_summary_report(info, filtered_df, start_date, end_date, pie1, pie2, loyal, df_day_avg, monthly_order, rank_cat):
-        nama = info['nama']
-        jenis = info['jenis']
-        usia = datetime.now().year - int(info['tahun'])
-
-        total_transaksi = filtered_df.shape[0]
-        total_omset = filtered_df['Total'].sum()
-        avg_order = filtered_df['Total'].mean() if not filtered_df.empty else 0
-        total_customer = filtered_df['Nama Customer'].nunique()
-
-        produk_terlaris = pie1.loc[pie1['Total'].idxmax(), 'Nama Produk'] if not pie1.empty else "-"
-        bulan_tertinggi = monthly_order.loc[monthly_order['Jumlah'].idxmax(), 'Bulan'] if not monthly_order.empty else "-"
-        hari_terbanyak = df_day_avg.loc[df_day_avg["Jumlah"].idxmax(), "Hari"] if not df_day_avg.empty else "-"
-        hari_tersibuk_value = df_day_avg["Jumlah"].max() if not df_day_avg.empty else 0
-        hari_tersepi = df_day_avg.loc[df_day_avg["Jumlah"].idxmin(), "Hari"] if not df_day_avg.empty else "-"
-
-        html_report = f"""
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    padding: 40px;
-                    color: #333;
-                    background-color: #f9f9fb;
-                    line-height: 1.6;
-                    font-size: 15px;
-                }}
-
-                h1 {{
-                    color: #68A1E1;
-                    font-size: 26px;
-                    margin-bottom: 10px;
-                }}
-
-                h2 {{
-                    color: #333;
-                    font-size: 20px;
-                    margin-top: 30px;
-                    margin-bottom: 10px;
-                    border-bottom: 2px solid #e0e0e0;
-                    padding-bottom: 4px;
-                }}
-
-                ul {{
-                    padding-left: 25px;
-                    margin-top: 5px;
-                }}
-
-                li {{
-                    margin-bottom: 8px;
-                }}
-
-                b {{
-                    color: #073E34;
-                }}
-
-                .section {{
-                    background-color: #ffffff;
-                    border: 1px solid #ddd;
-                    border-radius: 8px;
-                    padding: 20px;
-                    margin-bottom: 25px;
-                    box-shadow: 0px 1px 3px rgba(0,0,0,0.05);
-                }}
-
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin-top: 10px;
-                }}
-
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                    text-align: left;
-                    font-size: 14px;
-                }}
-
-                th {{
-                    background-color: #f0f0f0;
-                    color: #333;
-                }}
-
-                .scrollable-table {{
-                    overflow-x: auto; 
-                }}
-
-                .table-container {{
-                    display: flex;
-                    gap: 40px;
-                }}
-
-                .table-box {{
-                    flex: 1;
-                }}
-            </style>
-        </head>
-        <body>
-
-            <div class="section">
-                <h1>📊 SmartBiz Business Summary Report</h1>
-                <p style="margin-top:-5px;">Laporan ringkas performa usaha berbasis data transaksi</p>
-            </div>
-
-            <div class="section">
-                <h2>📋 Informasi Usaha</h2>
-                <ul>
-                    <li>🏢 <b>Nama Usaha:</b> {nama}</li>
-                    <li>🔧 <b>Jenis Usaha:</b> {jenis}</li>
-                    <li>📅 <b>Tahun Berdiri:</b> {info['tahun']}</li>
-                    <li>⏳ <b>Usia Usaha:</b> {usia} tahun</li>
-                </ul>
-            </div>
+@st.fragment
+@measured("section_customers")
+def customer_section(analytics, figures):
+    from smartbiz.customers import SEGMENT_NAMES
+    st.markdown("### 🧑‍🤝‍🧑 Analisis Customer (RFM & Cohort)")
+    if analytics.empty:
+        st.info("Belum ada transaksi customer pada filter ini.")
+        return
+    st.caption(
+        f"Skor Recency, Frequency & Monetary 1–5 per quantile (5 = terbaik); "
+        f"recency dihitung sampai transaksi terakhir ({analytics.as_of:%d %b %Y})."
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures["rfm_segmen"], use_container_width=True)
+    with col2:
+        segments = analytics.segments.assign(
+            Total=analytics.segments["Total"].map("Rp {:,.0f}".format),
+            **{"Persen Omset": analytics.segments["Persen Omset"].map("{:.1f}%".format)}
+        )
+        st.dataframe(segments, hide_index=True, use_container_width=True)
+
+    segment = st.selectbox("Lihat customer di segmen", SEGMENT_NAMES, key="rfm_segment")
+    members = analytics.customers_in(segment)
+    st.dataframe(members.head(SEGMENT_ROWS), hide_index=True, height=300, use_container_width=True)
+    if len(members) > SEGMENT_ROWS:
+        st.caption(f"Menampilkan {SEGMENT_ROWS:,} dari {len(members):,} customer dengan belanja terbesar.")
+
+    st.plotly_chart(figures["cohort_retention"], use_container_width=True)
+
+@st.fragment(run_every=REPORT_POLL_SECONDS)
+def report_progress(key):
+    from smartbiz.report_jobs import find_report
+    # Dipanggil ulang tiap REPORT_POLL_SECONDS selama job berjalan; setelah
+    # selesai halaman di-rerun sekali untuk menampilkan hasilnya
+    job = find_report(key)
+    if job is None or job.done():
+        st.rerun()
+    st.progress(job.progress, text=f"⏳ {job.stage}...")
+
+@st.fragment
+@measured("section_report")
+def report_section(dataset_key, filter_args, info, metrics, figures, start_date, end_date):
+    from smartbiz.report_jobs import find_report, report_key, submit_report
+    # === Generate laporan di background; hasilnya tersimpan per (dataset, filter, info)
+    key = report_key(dataset_key, filter_args, info)
+    if st.button("🛠️ Generate HTML Summary Report"):
+        job = submit_report(key, info, metrics, figures, start_date, end_date)
+    else:
+        job = find_report(key)
+    if job is None:
+        return
+
+    if not job.done():
+        # Script tidak menunggu job: progres dipantau fragment terpisah
+        report_progress(key)
+        return
+    try:
+        artifact = job.result()
+    except Exception as e:
+        st.error(f"⚠️ Gagal membuat laporan: {e}")
+        return
+    if artifact.interactive_charts:
+        st.warning(
+            f"⚠️ {artifact.interactive_charts} grafik disematkan sebagai grafik interaktif Plotly, bukan gambar PNG "
+            "(paket `kaleido` belum terpasang atau render gagal). Laporan butuh koneksi internet untuk memuat "
+            "plotly.js; pasang `kaleido` dari requirements.txt untuk grafik statis."
+        )
 
-            <div class="section">
-                <h2>📌 Ringkasan Penjualan</h2>
-                <p>📆 Periode: <b>{start_date.date()}</b> s.d. <b>{end_date.date()}</b></p>
-                <ul>
-                    <li>🧾 <b>Total Transaksi:</b> {total_transaksi}</li>
-                    <li>💰 <b>Total Omset:</b> Rp {total_omset:,.0f}</li>
-                    <li>📈 <b>Rata-rata Transaksi (AOV):</b> Rp {avg_order:,.0f}</li>
-                    <li>🧍 <b>Jumlah Customer Unik:</b> {total_customer}</li>
-                    <li>🥇 <b>Produk Terlaris:</b> {produk_terlaris}</li>
-                </ul>
-            </div>
+    st.download_button(
+        label="📥 Download Summary Report (HTML)",
+        data=artifact.read,
+        file_name="SmartBiz_Summary_Report.html",
+        mime="text/html",
+        on_click="ignore"
+    )
 
-            <div class="section">
-                <h2>📅 Pola Order</h2>
-                <ul>
-                    <li>📊 <b>Bulan Paling Ramai:</b> {bulan_tertinggi}</li>
-                    <li>🔥 <b>Hari Tersibuk:</b> {hari_terbanyak} (avg {hari_tersibuk_value:.1f} order)</li>
-                    <li>😴 <b>Hari Tersepi:</b> {hari_tersepi}</li>
-                </ul>
-            </div>
+    # Preview langsung di halaman Streamlit
+    st.markdown("### 🖥️ Preview Laporan")
+    st.components.v1.html(artifact.preview_html, height=600, scrolling=True)
+
+    st.info("✅ File HTML berhasil dibuat. Kamu bisa buka hasilnya di browser lalu tekan **Ctrl+P → Save as PDF** untuk menyimpannya.")
+
+def append_section(dataset_key, df, cube):
+    from smartbiz.incremental import append_transactions
+    message = st.session_state.pop("append_message", None)
+    if message:
+        st.success(message)
+    with st.expander("➕ Tambah Transaksi Baru"):
+        st.caption("Unggah file berisi transaksi baru saja (mis. penjualan hari ini). Hanya transaksi baru yang diproses; agregat dashboard diperbarui tanpa menghitung ulang seluruh histori.")
+        delta_file = st.file_uploader("File transaksi baru (.csv / .xlsx)", type=["csv", "xlsx"], key="append_file")
+        if delta_file is None:
+            return
+        drop_overlap = st.checkbox("🧹 Lewati baris yang sudah ada di dataset", value=True, key="append_drop_overlap")
+        try:
+            if delta_file.name.lower().endswith(".xlsx"):
+                delta_key, delta = load_excel_upload(delta_file, slot="append")
+            else:
+                delta_key, delta = load_transactions(delta_file.getvalue(), delta_file.name)
+        except MissingColumnsError:
+            st.error("⚠️ Kolom tidak sesuai format. Gunakan file template di halaman Home.")
+            return
+        except Exception as e:
+            st.error(f"⚠️ Gagal membaca file: {e}")
+            return
+        if delta is None:
+            return
+        show_quality_report(QualityReport.from_dict(delta.attrs.get("quality_report")))
+
+        if st.button(f"➕ Tambahkan {len(delta):,} transaksi ke dataset"):
+            with perf_stage("append") as stage:
+                result = append_transactions(
+                    dataset_key, df, cube, get_aggregates(dataset_key, cube), delta_key, delta, drop_overlap
+                )
+                stage.rows = result.added
+                # Cube & agregat dataset baru langsung masuk cache, tidak dibangun ulang
+                get_cube(result.key, result.df, _seed=result.cube)
+                get_aggregates(result.key, result.cube, _seed=result.aggregates)
+            get_default_cache().put(result.key, result.df)
+            st.session_state.dataset_key = result.key
+            skipped = f" ({result.duplicates:,} baris sudah ada, dilewati)" if drop_overlap and result.duplicates else ""
+            st.session_state.append_message = f"✅ {result.added:,} transaksi baru ditambahkan{skipped}. Total {len(result.df):,} baris."
+            st.rerun()
 
-            <div class="section">
-                <h2>🧠 Insight & Rekomendasi</h2>
-                <ul>
-                    <li>🚀 Fokus promosi ke produk <b>{produk_terlaris}</b></li>
-                    <li>🏅 Fokus volume ke produk: <b>{top_produk_jumlah}</b></li>
-                    <li>📦 Manfaatkan hari <b>{hari_terbanyak}</b> untuk promo bundling atau flash sale</li>
-                    <li>🔍 Evaluasi performa hari <b>{hari_tersepi}</b></li>
-                </ul>
+def dashboard_page():
+    from smartbiz.cube import date_bounds
+    from smartbiz.table_view import ArrowRows, FrameRows, SqlRows, StoreRows
+    # ---------- HEADER ---------- #
+    st.markdown("""
+        <div class="header-container">
+            <div class="header-content">
+                <img src="https://cdn-icons-png.flaticon.com/512/6062/6062646.png" alt="Business Icon" width="60" style="margin-right: 15px;">
+                <div>
+                    <p class="header-title">Dashboard Analisis Bisnis - SmartBiz</p>
+                    <p class="header-subtitle">Berikut ini analisis bisnis kamu</p>
+                </div>
             </div>
+        </div>
+    """, unsafe_allow_html=True)
 
-            <div class="section">
-            <h2>📊 Analisis Pareto (80/20)</h2>
-            <p>Berikut adalah produk dan customer yang menyumbang lebih dari 80% total omset:</p>
+    info = st.session_state.info
+    dataset_key = st.session_state.dataset_key
+    store = st.session_state.store
+    sql_dataset = st.session_state.sql_dataset
+    df = None
+    if store is None and sql_dataset is None:
+        # Satu DataFrame dipakai bersama semua sesi; yang didapat view tanpa salin data
+        df = get_default_cache().get(dataset_key)
+        if df is None:
+            st.warning("⚠️ Dataset sudah dikeluarkan dari cache server. Silakan upload ulang file transaksi.")
+            if st.button("⬅️ Kembali ke Home"):
+                st.session_state.page = "home"
+                st.rerun()
+            return
+    if sql_dataset is None:
+        with perf_stage("cube") as stage:
+            cube = get_cube(dataset_key, df, store)
+            cube_index = get_filter_index(dataset_key, "cube", cube)
+            stage.rows = len(cube)
 
-            <h3>📦 Detail Produk (Kontributor 80% Omset)</h3>
-            <div class="scrollable-table">
-                <table>
-                    <tr><th>Nama Produk</th><th>Omset</th><th>%</th></tr>
-                    {''.join([f"<tr><td>{row['Nama Produk']}</td><td>Rp {row['Total']:,.0f}</td><td>{row['Persen']:.1f}%</td></tr>" for _, row in produk_pareto_tabel.iterrows()])}
-                </table>
-            </div>
+    # --- Informasi Usaha
+    st.markdown("### 📋 Informasi Usaha")
+    col1, col2, col3 = st.columns(3)
+    with col1: st.write(f"**Nama Usaha:** {info['nama']}")
+    with col2: st.write(f"**Jenis Usaha:** {info['jenis']}")
+    with col3: st.write(f"**Usia Usaha:** {datetime.now().year - int(info['tahun'])} tahun")
 
-            <h3>👥 Detail Customer (Kontributor 80% Omset)</h3>
-            <div class="scrollable-table">
-                <table>
-                    <tr><th>Nama Customer</th><th>Omset</th><th>%</th></tr>
-                    {''.join([f"<tr><td>{row['Nama Customer']}</td><td>Rp {row['Total']:,.0f}</td><td>{row['Persen']:.1f}%</td></tr>" for _, row in customer_pareto_tabel.iterrows()])}
-                </table>
-            </div>
-        </div>
-        </body>
-        </html>
-        """
-        return html_report
-    
-    # === Generate PDF
-    if st.button("🛠️ Generate HTML Summary Report"):
-        summary_html = generate_summary_report(
-            info, filtered_df, start_date, end_date,
-            pie1, pie2, loyal, df_day_avg, monthly_order, rank_cat
-        )
-        html_bytes = summary_html.encode("utf-8")
-
-        # Tombol download HTML
-        st.download_button(
-            label="📥 Download Summary Report (HTML)",
-            data=html_bytes,
-            file_name="SmartBiz_Summary_Report.html",
-            mime="text/html"
-        )
+    # --- Tambah transaksi baru (dataset di memori)
+    if df is not None and sql_dataset is None:
+        append_section(dataset_key, df, cube)
 
-        # Preview langsung di halaman Streamlit
-        st.markdown("### 🖥️ Preview Laporan")
-        st.components.v1.html(summary_html, height=600, scrolling=True)
+    # --- Filter (perubahan filter me-rerun seluruh halaman; section lain memakai input ter-cache)
+    st.markdown("### 🔍 Filter Data")
+    col1, col2, col3 = st.columns(3)
+    if sql_dataset is None:
+        min_date, max_date = date_bounds(cube)
+        kategori_options = cube["Kategori"].cat.categories.tolist()
+        customer_options = cube["Nama Customer"].cat.categories.tolist()
+    else:
+        min_date, max_date, kategori_options, customer_options = get_sql_filter_options(dataset_key, sql_dataset)
+    with col1:
+        date_range = st.date_input("Rentang Tanggal", [min_date, max_date])
+    with col2:
+        kategori_filter = st.multiselect("Jenis Produk", kategori_options, default=kategori_options)
+    with col3:
+        # Multiselect tanpa default (kosong) artinya awalnya semua ditampilkan
+        customer_filter = st.multiselect("Nama Customer", customer_options)
 
-        st.info("✅ File HTML berhasil dibuat. Kamu bisa buka hasilnya di browser lalu tekan **Ctrl+P → Save as PDF** untuk menyimpannya.")
+    # Terapkan filter jika tanggal valid
+    if len(date_range) == 2:
+        start_date = pd.to_datetime(date_range[0])
+        end_date = pd.to_datetime(date_range[1])
+        # Semua kategori terpilih = tanpa filter kategori (None), jadi baris
+        # dengan Kategori kosong tetap ikut di semua backend
+        kategori_arg = None if set(kategori_filter) >= set(kategori_options) else tuple(kategori_filter)
+        filter_args = (start_date, end_date, kategori_arg, tuple(customer_filter))
+    else:
+        start_date, end_date = min_date, max_date
+        filter_args = ()
+
+    # Metrik cukup dari potongan cube; baris mentah hanya untuk tabel
+    with perf_stage("metrics") as stage:
+        if sql_dataset is None and is_unfiltered(filter_args, min_date, max_date, kategori_options):
+            metrics = get_total_metrics(dataset_key, get_aggregates(dataset_key, cube))
+        elif sql_dataset is None:
+            metrics = get_metrics(dataset_key, filter_args, cube_index)
+        else:
+            metrics = get_sql_metrics(dataset_key, filter_args, sql_dataset)
+        stage.rows = metrics.total_order
+    with perf_stage("figures"):
+        figures = get_figures(dataset_key, filter_args, metrics)
+
+    with perf_stage("filter_rows"):
+        # Jalur Arrow: tabel diambil dari entry cache dataset, bukan dibangun ulang dari df
+        table = get_default_cache().get_table(dataset_key) if df is not None and ARROW_ENABLED else None
+        if sql_dataset is not None:
+            sales_rows = SqlRows(sql_dataset, filter_args)
+        elif table is not None:
+            sales_rows = ArrowRows(table, filter_args)
+        elif df is not None:
+            rows_index = get_filter_index(dataset_key, "rows", df)
+            sales_rows = FrameRows(df, rows_index.positions(*filter_args))
+        else:
+            sales_rows = StoreRows(store, filter_args)
+
+    sales_table_section(sales_rows)
+    business_summary_section(metrics)
+    distribution_section(figures)
+    ranking_section(figures)
+    time_pattern_section(figures)
+    with perf_stage("forecast"):
+        forecast = get_forecast(dataset_key, _cube=cube if sql_dataset is None else None, _sql_dataset=sql_dataset)
+        forecast_figures = get_forecast_figures(dataset_key, forecast)
+    forecast_section(forecast, forecast_figures)
+    pareto_section(metrics)
+    with perf_stage("customers") as stage:
+        analytics = get_customer_analytics(
+            dataset_key, filter_args,
+            _cube_index=cube_index if sql_dataset is None else None, _sql_dataset=sql_dataset
+        )
+        customer_figures = get_customer_figures(dataset_key, filter_args, analytics)
+        stage.rows = len(analytics.rfm)
+    customer_section(analytics, customer_figures)
+    report_section(dataset_key, filter_args, info, metrics, figures, start_date, end_date)
 
     # ⬅️ TOMBOL KEMBALI (Selalu tampil)
     st.markdown("---")
@@ -726,8 +862,50 @@ def dashboard_page():
         st.session_state.page = "home"
         st.rerun()
 
+# ---------- PANEL DEBUG ---------- #
+def debug_panel(recorder):
+    # Aktif lewat SMARTBIZ_DEBUG=1 atau ?debug=1 di URL
+    with st.sidebar.expander("🐞 Debug Performa", expanded=False):
+        table = recorder.to_frame()
+        st.caption(f"Rerun `{recorder.rerun_id}` ({recorder.page}): {recorder.total_seconds:.3f} detik")
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        fragments = list(st.session_state.perf_fragments)
+        if fragments:
+            st.caption(f"{len(fragments)} rerun fragment terakhir")
+            st.dataframe(pd.DataFrame({
+                "Rerun": [r.rerun_id for r in fragments],
+                "Rerun Halaman": [r.parent_id for r in fragments],
+                "Tahap": [", ".join(record.name for record in r.records) for r in fragments],
+                "Detik": [r.total_seconds for r in fragments],
+            }), hide_index=True, use_container_width=True)
+        stats = get_default_cache().stats()
+        st.caption(
+            f"Cache dataset: {stats['entries']} dataset, {stats['bytes'] / 2**20:,.1f} / {stats['max_bytes'] / 2**20:,.0f} MB · "
+            f"hit {stats['hits']:,} · dari disk {stats['disk_hits']:,} · miss {stats['misses']:,} · eviction {stats['evictions']:,}"
+        )
+        st.toggle("Lacak peak memori (lebih lambat)", key="perf_trace_memory")
+        if st.button("⏱️ Profil rerun berikutnya (cProfile)"):
+            st.session_state.profile_next_rerun = True
+            st.rerun()
+        profile = st.session_state.get("last_profile")
+        if profile and "path" in profile:
+            st.caption(f"Profil tersimpan di `{profile['path']}`")
+            st.code(profile["summary"], language=None)
+            with open(profile["path"], "rb") as f:
+                st.download_button("📥 Download .prof", f.read(), file_name="smartbiz_rerun.prof")
+
 # ---------- ROUTING ---------- #
-if st.session_state.page == "home":
-    home_page()
-elif st.session_state.page == "dashboard":
-    dashboard_page()   
\ No newline at end of file
+PAGES = {"home": home_page, "dashboard": dashboard_page}
+debug_enabled = DEBUG_ENABLED or st.query_params.get("debug") == "1"
+page = st.session_state.page
+st.session_state.perf = RerunRecorder(page, trace_memory=debug_enabled and st.session_state.get("perf_trace_memory", False))
+with st.session_state.perf:
+    if debug_enabled and st.session_state.pop("profile_next_rerun", False):
+        with profiling(page) as profile:
+            # Diisi saat blok selesai, juga bila halaman memanggil st.rerun()
+            st.session_state.last_profile = profile
+            PAGES[page]()
+    else:
+        PAGES[page]()
+if debug_enabled:
+    debug_panel(st.session_state.perf)   
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Benchmark append transaksi harian vs hitung ulang seluruh histori.
+
+Histori sintetis (``benchmarks.synthetic``) dipotong: hari terakhir jadi
+delta. Cara lama menormalisasi ulang semua baris, membangun cube dan
+menghitung metrik dari nol; cara inkremental hanya memproses delta.
+
+    python -m benchmarks.bench_append [--sizes 100k 1M 5M]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import iter_chunks, parse_rows
+from smartbiz.cube import build_cube
+from smartbiz.incremental import RunningAggregates, append_transactions
+from smartbiz.metrics import compute_metrics
+from smartbiz.normalize import normalize_transactions
+
+
+def split_last_day(n_rows):
+    raw = pd.concat(iter_chunks(n_rows), ignore_index=True)
+    raw = raw.astype({"Nama Customer": str, "Nama Produk": str})
+    last_day = raw["Tanggal"] == raw["Tanggal"].max()
+    return raw[~last_day].reset_index(drop=True), raw[last_day].reset_index(drop=True)
+
+
+def full_rebuild(history, delta):
+    df = normalize_transactions(pd.concat([history, delta], ignore_index=True))
+    return compute_metrics(build_cube(df))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100k", "1M"])
+    args = parser.parse_args()
+
+    print(f"{'histori':>11} {'delta':>8} {'ulang (s)':>10} {'append (s)':>11}")
+    for size in args.sizes:
+        history_raw, delta_raw = split_last_day(parse_rows(size))
+        df = normalize_transactions(history_raw)
+        cube = build_cube(df)
+        aggregates = RunningAggregates.from_frame(cube)
+
+        start = time.perf_counter()
+        expected = full_rebuild(history_raw, delta_raw)
+        rebuild = time.perf_counter() - start
+
+        start = time.perf_counter()
+        delta = normalize_transactions(delta_raw)
+        result = append_transactions("history", df, cube, aggregates, "delta", delta)
+        metrics = result.aggregates.to_metrics()
+        append = time.perf_counter() - start
+
+        assert metrics.total_omset == expected.total_omset and np.array_equal(
+            metrics.produk["Total"].to_numpy(), expected.produk["Total"].to_numpy()
+        )
+        print(f"{len(history_raw):>11,} {len(delta_raw):>8,} {rebuild:>10.3f} {append:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
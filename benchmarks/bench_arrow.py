@@ -0,0 +1,145 @@
+"""Benchmark jalur Arrow (``SMARTBIZ_ARROW=1``) terhadap jalur pandas.
+
+Per ukuran data sintetis diukur untuk kedua jalur: parsing + normalisasi
+CSV, persiapan (``FilterIndex`` vs view Arrow zero-copy), satu rerun tabel
+"Data Penjualan" (filter khas + cari + sort ``Total`` + halaman 50 baris,
+termasuk serialisasi Arrow untuk ``st.dataframe``), dan group-by produk
+(pandas ``groupby`` vs ``Table.group_by``).
+
+Peak memori tiap tahap = puncak RSS proses dikurangi RSS sebelum tahap
+(``/proc/self/clear_refs``, Linux), jadi alokasi numpy maupun memory pool
+Arrow ikut terhitung; memori bebas dilepas ke OS dulu sebelum tiap tahap.
+Di luar Linux kolom memori diisi ``-``.
+
+    python -m benchmarks.bench_arrow [--sizes 100k 1M 5M] [--repeat 3]
+"""
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import time
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+from streamlit.dataframe_util import convert_anything_to_arrow_bytes
+
+from benchmarks.bench_pipeline import typical_filter
+from benchmarks.synthetic import csv_bytes, parse_rows
+from smartbiz.cube import build_cube
+from smartbiz.filters import FilterIndex
+from smartbiz.ingest import read_csv_arrow
+from smartbiz.normalize import normalize_transactions
+from smartbiz.table_view import ArrowRows, FrameRows, arrow_table
+
+QUERY = "dress"
+PAGE_ROWS = 50
+
+
+def _status_kib(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def _release_memory():
+    # Memori bebas dikembalikan ke OS dulu, supaya alokasi tahap berikutnya
+    # benar-benar menaikkan RSS (bukan memakai ulang halaman lama)
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    libc = ctypes.util.find_library("c")
+    if libc:
+        try:
+            ctypes.CDLL(libc).malloc_trim(0)
+        except AttributeError:
+            pass
+
+
+def measure(fn, repeat):
+    """(waktu terbaik, peak MiB di atas RSS awal atau None, hasil)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+        del result
+    _release_memory()
+    before = _status_kib("VmRSS")
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # reset puncak RSS (VmHWM)
+    except OSError:
+        before = None
+    result = fn()
+    peak = None if before is None else max(_status_kib("VmHWM") - before, 0) / 1024
+    return min(times), peak, result
+
+
+def pandas_path(data, flt):
+    def parse():
+        return normalize_transactions(pd.read_csv(BytesIO(data)))
+
+    def rerun(df, index):
+        rows = FrameRows(df, index.positions(*flt)).search(QUERY)
+        return convert_anything_to_arrow_bytes(rows.page(0, PAGE_ROWS, "Total", False))
+
+    def group(df):
+        return df.groupby("Nama Produk", observed=True)[["Jumlah", "Total"]].sum()
+
+    return parse, FilterIndex, rerun, group
+
+
+def arrow_path(data, flt):
+    def parse():
+        return normalize_transactions(read_csv_arrow(data))
+
+    def rerun(df, table):
+        rows = ArrowRows(table, flt).search(QUERY)
+        return convert_anything_to_arrow_bytes(rows.page(0, PAGE_ROWS, "Total", False))
+
+    def group(df):
+        return arrow_table(df).group_by("Nama Produk").aggregate([("Jumlah", "sum"), ("Total", "sum")])
+
+    return parse, arrow_table, rerun, group
+
+
+def run_path(path, data, flt, repeat):
+    parse, prepare, rerun, group = path(data, flt)
+    parse_time, parse_peak, df = measure(parse, 1)
+    prepare_time, prepare_peak, prepared = measure(lambda: prepare(df), repeat)
+    rerun_time, rerun_peak, _ = measure(lambda: rerun(df, prepared), repeat)
+    group_time, group_peak, _ = measure(lambda: group(df), repeat)
+    return [parse_time, prepare_time, rerun_time, group_time], [parse_peak, prepare_peak, rerun_peak, group_peak]
+
+
+def _mib(value):
+    return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100k", "1M", "5M"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'baris':>11} {'jalur':>6} {'parse (s)':>10} {'siap (ms)':>10} {'rerun (ms)':>11} {'group (ms)':>11}"
+          f" {'MiB parse':>9} {'MiB siap':>8} {'MiB rerun':>9} {'MiB group':>9}")
+    for size in args.sizes:
+        n_rows = parse_rows(size)
+        data = csv_bytes(n_rows)
+        flt = tuple(typical_filter(build_cube(normalize_transactions(pd.read_csv(BytesIO(data))))))
+        for name, path in [("pandas", pandas_path), ("arrow", arrow_path)]:
+            (parse, prepare, rerun, group), peaks = run_path(path, data, flt, args.repeat)
+            print(
+                f"{n_rows:>11,} {name:>6} {parse:>10.3f} {prepare * 1e3:>10.1f} {rerun * 1e3:>11.1f} {group * 1e3:>11.1f}"
+                f" {_mib(peaks[0]):>9} {_mib(peaks[1])} {_mib(peaks[2]):>9} {_mib(peaks[3]):>9}"
+            )
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
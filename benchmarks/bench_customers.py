@@ -0,0 +1,51 @@
+"""Benchmark analitik customer (RFM + retensi cohort) terhadap jumlah baris.
+
+Data sintetis (``benchmarks.synthetic``) dengan jumlah customer ikut naik
+bersama jumlah baris. Kolom ``ns/baris`` yang kurang lebih tetap
+menunjukkan biaya yang naik linear; ``cube`` adalah input yang dipakai
+dashboard (hasil ``build_cube``, jauh lebih sedikit baris).
+
+    python -m benchmarks.bench_customers [--sizes 1M 2M 5M 10M] [--repeat 3]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import iter_chunks, parse_rows
+from smartbiz.cube import build_cube
+from smartbiz.customers import compute_customer_analytics
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1M", "2M", "5M", "10M"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'baris':>11} {'customer':>9} {'cohort':>7} {'baris (s)':>10} {'ns/baris':>9} {'cube (s)':>9}")
+    for size in args.sizes:
+        n_rows = parse_rows(size)
+        df = pd.concat(iter_chunks(n_rows), ignore_index=True)
+        df["Tanggal"] = pd.to_datetime(df["Tanggal"])
+        cube = build_cube(df)
+
+        rows_time, analytics = best_of(lambda: compute_customer_analytics(df), args.repeat)
+        cube_time, _ = best_of(lambda: compute_customer_analytics(cube), args.repeat)
+        print(
+            f"{n_rows:>11,} {len(analytics.rfm):>9,} {len(analytics.retention):>7,} "
+            f"{rows_time:>10.3f} {rows_time / n_rows * 1e9:>9.1f} {cube_time:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark setiap tahap dashboard dengan data sintetis (lihat ``benchmarks.synthetic``).
+
+Tahap yang diukur: parsing CSV, normalisasi, cube, indeks filter, filter,
+agregasi produk/customer/kategori, pola waktu, Pareto, ``compute_metrics``
+(cube dan baris mentah), figure Plotly, halaman tabel dan laporan HTML.
+Tiap tahap dicatat waktunya (``perf_counter``) dan peak memori
+(``tracemalloc``, di run terpisah), lalu ditulis ke file JSON.
+
+    python -m benchmarks.bench_pipeline [--sizes 1k 10k 100k 1M] [--out hasil.json] [--no-memory]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import csv_bytes, parse_rows
+from smartbiz.cube import build_cube, date_bounds
+from smartbiz.figures import build_figures
+from smartbiz.filters import FilterIndex
+from smartbiz.ingest import parse_transactions
+from smartbiz.metrics import _group, _pareto, _time_patterns, compute_metrics
+from smartbiz.normalize import normalize_transactions
+from smartbiz.report import export_report, render_report
+from smartbiz.table_view import FrameRows
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+INFO = {"nama": "Benchmark", "jenis": "Fashion", "tahun": 2020, "usia": "5 tahun"}
+
+
+def typical_filter(cube):
+    """Filter khas pengguna: paruh tengah rentang tanggal + separuh kategori."""
+    start, end = date_bounds(cube)
+    span = end - start
+    kategori = sorted(cube["Kategori"].cat.categories)
+    return (start + span / 4, end - span / 4, kategori[: max(1, len(kategori) // 2)], [])
+
+
+def _one(series):
+    return np.ones(len(series), dtype="int64")
+
+
+def stages(data):
+    """Daftar (nama, fungsi(state)); hasil tiap tahap disimpan di ``state``
+    dengan nama yang sama sehingga tahap berikutnya bisa memakainya."""
+    return [
+        ("parse", lambda s: parse_transactions(data, "bench.csv")),
+        ("normalize", lambda s: normalize_transactions(s["parse"])),
+        ("build_cube", lambda s: build_cube(s["normalize"])),
+        ("filter_index", lambda s: (FilterIndex(s["normalize"]), FilterIndex(s["build_cube"]))),
+        ("filter_cube", lambda s: s["filter_index"][1].filter(*typical_filter(s["build_cube"]))),
+        ("filter_rows", lambda s: s["filter_index"][0].positions(*typical_filter(s["build_cube"]))),
+        ("group_produk", lambda s: _group(s["normalize"]["Nama Produk"], _one(s["normalize"]),
+                                          s["normalize"]["Total"].to_numpy(), s["normalize"]["Jumlah"].to_numpy())),
+        ("group_customer", lambda s: _group(s["normalize"]["Nama Customer"], _one(s["normalize"]),
+                                            s["normalize"]["Total"].to_numpy())),
+        ("group_kategori", lambda s: _group(s["normalize"]["Kategori"], _one(s["normalize"]))),
+        ("time_patterns", lambda s: _time_patterns(s["normalize"]["Tanggal"].to_numpy(), _one(s["normalize"]),
+                                                   s["normalize"]["Jumlah"].to_numpy())),
+        ("pareto_customer", lambda s: _pareto(s["group_customer"][0], s["group_customer"][2][0], "Nama Customer")),
+        ("metrics_rows", lambda s: compute_metrics(s["normalize"])),
+        ("metrics_cube", lambda s: compute_metrics(s["filter_cube"])),
+        ("build_figures", lambda s: build_figures(s["metrics_cube"])),
+        ("table_page", lambda s: FrameRows(s["normalize"], s["filter_rows"]).page(0, 50, "Total", False)),
+        ("report_preview", lambda s: render_report(INFO, s["metrics_rows"], *_report_dates(s), max_rows=500)),
+        ("report_export", lambda s: _drain(export_report(INFO, s["metrics_rows"], *_report_dates(s)))),
+    ]
+
+
+def _report_dates(state):
+    dates = state["normalize"]["Tanggal"]
+    return dates.iloc[0], dates.iloc[-1]
+
+
+def _drain(fileobj):
+    # Ukuran file unduhan; file sementara langsung ditutup
+    with fileobj:
+        fileobj.seek(0, os.SEEK_END)
+        return fileobj.tell()
+
+
+def run_size(n_rows, with_memory=True, seed=0):
+    data = csv_bytes(n_rows, seed)
+    state, results = {}, []
+    for name, fn in stages(data):
+        start = time.perf_counter()
+        state[name] = fn(state)
+        elapsed = time.perf_counter() - start
+        entry = {"stage": name, "rows": n_rows, "seconds": round(elapsed, 6)}
+        if with_memory:
+            # Peak memori diukur di run terpisah: tracemalloc memperlambat kode Python
+            tracemalloc.start()
+            fn(state)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            entry["peak_mib"] = round(peak / 1024 ** 2, 3)
+        results.append(entry)
+    return {"rows": n_rows, "csv_bytes": len(data), "cube_rows": len(state["build_cube"]),
+            "filtered_cube_rows": len(state["filter_cube"]), "stages": results}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1k", "10k", "100k", "1M"], help="mis. 1k 100k 1M 10M")
+    parser.add_argument("--out", default=None, help="file JSON hasil (default: benchmarks/results/pipeline-<waktu>.json)")
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran peak memori (lebih cepat)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(RESULTS_DIR, f"pipeline-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    report = {"environment": environment(), "runs": []}
+    print(f"{'rows':>11} {'tahap':<16} {'detik':>9} {'peak MiB':>9}")
+    for size in args.sizes:
+        run = run_size(parse_rows(size), not args.no_memory, args.seed)
+        report["runs"].append(run)
+        for entry in run["stages"]:
+            peak = f"{entry['peak_mib']:>9.1f}" if "peak_mib" in entry else f"{'-':>9}"
+            print(f"{entry['rows']:>11,} {entry['stage']:<16} {entry['seconds']:>9.3f} {peak}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil ditulis ke {out}")
+
+
+if __name__ == "__main__":
+    main()
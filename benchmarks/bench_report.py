@@ -0,0 +1,70 @@
+"""Benchmark render tabel Pareto laporan HTML.
+
+Membandingkan cara lama (``iterrows`` + f-string per baris) dengan renderer
+kolom di ``smartbiz.report`` pada tabel 10k, 100k dan 1M baris.
+
+    python -m benchmarks.bench_report [--sizes 10000 100000 1000000] [--skip-legacy-above 100000]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from smartbiz.report import iter_table_rows, render_table_rows
+
+
+def make_pareto_table(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    total = np.sort(rng.pareto(1.2, n_rows) * 1e6)[::-1].round()
+    return pd.DataFrame({
+        "Nama Customer": pd.Categorical([f"Customer {i:07d}" for i in range(n_rows)]),
+        "Total": total.astype("int64"),
+        "Persen": total / total.sum() * 100,
+    })
+
+
+def legacy_rows(table):
+    return ''.join([f"<tr><td>{row['Nama Customer']}</td><td>Rp {row['Total']:,.0f}</td><td>{row['Persen']:.1f}%</td></tr>" for _, row in table.iterrows()])
+
+
+def chunked_rows(table):
+    # Mensimulasikan penulisan ke file unduhan: chunk tidak digabung
+    return sum(len(chunk) for chunk in iter_table_rows(table))
+
+
+def measure(fn, table):
+    start = time.perf_counter()
+    result = fn(table)
+    elapsed = time.perf_counter() - start
+    # Peak memori diukur di run terpisah: tracemalloc memperlambat kode Python
+    tracemalloc.start()
+    fn(table)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-legacy-above", type=int, default=100_000,
+                        help="lewati cara lama untuk tabel di atas ukuran ini (terlalu lambat)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'renderer':<12} {'detik':>9} {'peak MiB':>9}")
+    for n_rows in args.sizes:
+        table = make_pareto_table(n_rows)
+        vectorized, elapsed, peak = measure(render_table_rows, table)
+        print(f"{n_rows:>10,} {'vektorisasi':<12} {elapsed:>9.3f} {peak:>9.1f}")
+        _, elapsed, peak = measure(chunked_rows, table)
+        print(f"{n_rows:>10,} {'chunked':<12} {elapsed:>9.3f} {peak:>9.1f}")
+        if n_rows <= args.skip_legacy_above:
+            legacy, elapsed, peak = measure(legacy_rows, table)
+            assert legacy == vectorized, "output renderer berbeda dari cara lama"
+            print(f"{n_rows:>10,} {'iterrows':<12} {elapsed:>9.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
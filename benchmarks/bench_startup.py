@@ -0,0 +1,92 @@
+"""Benchmark cold start halaman Home.
+
+Setiap percobaan berjalan di proses Python baru: diukur waktu impor
+Streamlit + pandas (dasar yang tidak bisa dihindari), waktu render pertama
+``app.py`` (impor modul app + rerun pertama) dan biaya rerun berikutnya.
+Modul berat yang sudah ter-load setelah render pertama ikut dicatat.
+
+    python -m benchmarks.bench_startup [--runs 5] [--reruns 20] [--out hasil.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "app.py")
+HEAVY_MODULES = [
+    "plotly.express", "openpyxl", "kaleido", "torch", "transformers", "sqlite3", "pyarrow.dataset",
+    # Modul dashboard yang seharusnya baru diimpor setelah halaman Home
+    "smartbiz.sql_backend", "smartbiz.streaming", "smartbiz.excel", "smartbiz.forecast",
+    "smartbiz.customers", "smartbiz.report", "smartbiz.report_jobs",
+]
+
+
+def child(reruns):
+    start = time.perf_counter()
+    import pandas  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+    baseline = time.perf_counter() - start
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - start
+    if at.exception:
+        raise SystemExit(f"app.py gagal dirender: {at.exception}")
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    rerun_times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        rerun_times.append(time.perf_counter() - start)
+    print(json.dumps({"baseline": baseline, "first_render": first_render, "reruns": rerun_times, "loaded": loaded}))
+
+
+def cold_start(reruns):
+    # Proses baru per percobaan supaya cache impor & cache Streamlit kosong
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--reruns", str(reruns)],
+        capture_output=True, text=True, check=True, cwd=os.path.join(os.path.dirname(__file__), os.pardir),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="jumlah cold start")
+    parser.add_argument("--reruns", type=int, default=20, help="jumlah rerun setelah render pertama")
+    parser.add_argument("--out", default=None, help="simpan hasil mentah sebagai JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.reruns)
+        return
+
+    runs = [cold_start(args.reruns) for _ in range(args.runs)]
+    reruns = [t for run in runs for t in run["reruns"]]
+    summary = {
+        "baseline_median": statistics.median(run["baseline"] for run in runs),
+        "first_render_median": statistics.median(run["first_render"] for run in runs),
+        "rerun_median": statistics.median(reruns) if reruns else None,
+        "rerun_p95": statistics.quantiles(reruns, n=20)[-1] if len(reruns) > 1 else None,
+        "loaded_after_first_render": runs[0]["loaded"],
+    }
+    print(f"Impor streamlit + pandas : {summary['baseline_median'] * 1000:8.1f} ms (median {args.runs} proses)")
+    print(f"Render pertama Home      : {summary['first_render_median'] * 1000:8.1f} ms")
+    if reruns:
+        print(f"Rerun Home               : {summary['rerun_median'] * 1000:8.1f} ms median, "
+              f"{summary['rerun_p95'] * 1000:.1f} ms p95")
+    print(f"Modul berat ter-load     : {', '.join(summary['loaded_after_first_render']) or '-'}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "runs": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Generator data transaksi sintetis berskema sama dengan ``data/Velveta Wear.csv``.
+
+Distribusi diambil dari file contoh: katalog produk + kategorinya beserta
+frekuensinya, rentang harga per produk, distribusi `Jumlah`, bobot hari
+dalam minggu dan rata-rata transaksi per customer. Jumlah customer ikut
+bertambah sesuai jumlah baris (nama contoh + nomor urut), sedangkan
+`Total` selalu `Jumlah × Harga`. Data dibuat per chunk sehingga 50 juta
+baris pun bisa ditulis ke file tanpa memuat semuanya ke memori.
+
+    python -m benchmarks.synthetic --rows 1M --out /tmp/sales-1M.csv
+    python -m benchmarks.synthetic --rows 50M --out /tmp/sales-50M.parquet
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "data", "Velveta Wear.csv")
+DEFAULT_CHUNK_ROWS = 1_000_000
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    """'10k' → 10000, '1.5M' → 1500000."""
+    text = str(text).strip().lower().replace("_", "")
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def fit_profile(sample_path=SAMPLE_PATH):
+    """Ringkasan distribusi file contoh yang dipakai generator."""
+    sample = pd.read_csv(sample_path)
+    dates = pd.to_datetime(sample["Tanggal"])
+    products = sample.groupby(["Nama Produk", "Kategori"]).agg(
+        weight=("Harga", "size"), price_min=("Harga", "min"), price_max=("Harga", "max")
+    ).reset_index()
+    qty = sample["Jumlah"].value_counts(normalize=True).sort_index()
+    weekday = dates.dt.dayofweek.value_counts().reindex(range(7), fill_value=0)
+    return {
+        "products": products["Nama Produk"].tolist(),
+        "kategori": products["Kategori"].tolist(),
+        "product_weights": (products["weight"] / products["weight"].sum()).to_numpy(),
+        "price_min": products["price_min"].to_numpy(),
+        "price_max": products["price_max"].to_numpy(),
+        "qty_values": qty.index.to_numpy(),
+        "qty_weights": qty.to_numpy(),
+        "weekday_weights": (weekday / weekday.sum()).to_numpy(),
+        "customers": sorted(sample["Nama Customer"].unique()),
+        "rows_per_customer": len(sample) / sample["Nama Customer"].nunique(),
+        "start": dates.min().normalize(),
+        "days": (dates.max() - dates.min()).days + 1,
+    }
+
+
+def customer_names(profile, n_rows):
+    base = profile["customers"]
+    count = max(len(base), int(round(n_rows / profile["rows_per_customer"])))
+    # Nama contoh dipakai dulu, lalu "Rina 2", "Dewi 2", ... dst.
+    return [base[i % len(base)] if i < len(base) else f"{base[i % len(base)]} {i // len(base) + 1}" for i in range(count)]
+
+
+def generate(n_rows, seed=0, profile=None, customers=None, days=None):
+    """Satu DataFrame berisi ``n_rows`` transaksi (belum terurut tanggal,
+    sama seperti file contoh)."""
+    profile = profile or fit_profile()
+    customers = customers if customers is not None else customer_names(profile, n_rows)
+    days = days or profile["days"]
+    rng = np.random.default_rng(seed)
+
+    day_offsets = np.arange(days)
+    weekdays = (profile["start"].dayofweek + day_offsets) % 7
+    day_p = profile["weekday_weights"][weekdays]
+    day = rng.choice(day_offsets, size=n_rows, p=day_p / day_p.sum())
+    tanggal = (np.datetime64(profile["start"].date(), "D") + day).astype(str)
+
+    product = rng.choice(len(profile["products"]), size=n_rows, p=profile["product_weights"])
+    harga = rng.integers(profile["price_min"][product], profile["price_max"][product] + 1)
+    jumlah = rng.choice(profile["qty_values"], size=n_rows, p=profile["qty_weights"])
+    customer = rng.integers(0, len(customers), size=n_rows)
+
+    return pd.DataFrame({
+        "Tanggal": tanggal,
+        "Nama Customer": pd.Categorical.from_codes(customer, customers),
+        "Nama Produk": pd.Categorical.from_codes(product, profile["products"]),
+        "Kategori": np.asarray(profile["kategori"], dtype=object)[product],
+        "Jumlah": jumlah,
+        "Harga": harga,
+        "Total": jumlah * harga,
+    })
+
+
+def iter_chunks(n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, days=None):
+    """Dataset ``n_rows`` baris per chunk; tiap chunk punya seed turunan sendiri
+    sehingga hasilnya deterministik berapa pun ukuran chunk-nya."""
+    profile = fit_profile()
+    customers = customer_names(profile, n_rows)
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_rows // chunk_rows) or 1)
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        size = min(chunk_rows, n_rows - start)
+        yield generate(size, seeds[i], profile, customers, days)
+
+
+def write_dataset(path, n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, days=None):
+    """Tulis dataset ke ``.csv`` atau ``.parquet`` per chunk."""
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in iter_chunks(n_rows, seed, chunk_rows, days):
+                table = pa.Table.from_pandas(chunk.astype({"Nama Customer": str, "Nama Produk": str}), preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for i, chunk in enumerate(iter_chunks(n_rows, seed, chunk_rows, days)):
+            chunk.to_csv(f, index=False, header=i == 0)
+    return path
+
+
+def csv_bytes(n_rows, seed=0, days=None):
+    """Dataset sebagai bytes CSV, seperti ``file.getvalue()`` dari uploader."""
+    return "".join(
+        chunk.to_csv(index=False, header=i == 0) for i, chunk in enumerate(iter_chunks(n_rows, seed, days=days))
+    ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator data transaksi sintetis")
+    parser.add_argument("--rows", default="100k", help="jumlah baris, mis. 1k, 250k, 1M, 50M")
+    parser.add_argument("--out", required=True, help="file tujuan (.csv atau .parquet)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=None, help="rentang hari (default: sama dengan file contoh)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    n_rows = parse_rows(args.rows)
+    start = time.perf_counter()
+    write_dataset(args.out, n_rows, args.seed, args.chunk_rows, args.days)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.out)
+    print(f"{n_rows:,} baris → {args.out} ({size / 1024 ** 2:,.1f} MB) dalam {elapsed:.1f} detik")
+
+
+if __name__ == "__main__":
+    main()
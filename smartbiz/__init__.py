@@ -0,0 +1 @@
+"""SmartBiz analytics core: ingestion, caching dan agregasi data transaksi UMKM."""
@@ -0,0 +1,57 @@
+"""Buat laporan HTML banyak merchant sekaligus tanpa membuka aplikasi.
+
+    python -m smartbiz --input data/merchants --manifest merchants.csv --out laporan/
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from smartbiz.batch import ManifestError, build_jobs, load_manifest, run_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m smartbiz", description=__doc__.splitlines()[0])
+    parser.add_argument("--input", required=True, help="folder berisi file transaksi (.csv / .xlsx)")
+    parser.add_argument("--manifest", required=True,
+                        help="CSV/JSON: file, nama, jenis, tahun (opsional: output)")
+    parser.add_argument("--out", required=True, help="folder tujuan laporan HTML")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default: jumlah CPU)")
+    parser.add_argument("--start", default=None, help="tanggal awal laporan (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="tanggal akhir laporan (YYYY-MM-DD)")
+    parser.add_argument("--charts", action="store_true", help="sertakan grafik (PNG dengan kaleido, selain itu HTML Plotly interaktif)")
+    parser.add_argument("--summary", default=None, help="tulis ringkasan hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except ManifestError as e:
+        parser.error(str(e))
+    os.makedirs(args.out, exist_ok=True)
+    jobs = build_jobs(manifest, args.input, args.out, args.start, args.end, args.charts)
+    if not jobs:
+        print("Manifest kosong, tidak ada laporan dibuat.")
+        return 0
+
+    def progress(result, done, total):
+        status = "gagal: " + result.error if result.error else f"{result.rows:,} baris"
+        print(f"[{done}/{total}] {os.path.basename(result.output)} ({result.seconds:.2f}s, {status})", flush=True)
+
+    summary = run_batch(jobs, args.workers, progress)
+    print(
+        f"{len(summary.succeeded)} laporan selesai, {len(summary.failed)} gagal "
+        f"dalam {summary.seconds:.1f}s ({summary.reports_per_minute:.1f} laporan/menit)"
+    )
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({
+                "seconds": summary.seconds,
+                "reports_per_minute": summary.reports_per_minute,
+                "results": [asdict(r) for r in summary.results],
+            }, f, indent=2)
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Aset statis halaman: CSS aplikasi dan file template unduhan.
+
+Semuanya dibuat sekali per proses, bukan di setiap rerun. File Excel
+template baru dibuat (dan openpyxl baru diimpor) saat tombol unduhnya
+diklik pertama kali.
+"""
+import functools
+import os
+from io import BytesIO
+
+import pandas as pd
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+def _read_template(name):
+    with open(os.path.join(TEMPLATE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Satu blok <style> untuk seluruh aplikasi (background, font, form, header)
+APP_STYLE = f"<style>\n{_read_template('app.css')}</style>"
+
+
+@functools.lru_cache(maxsize=None)
+def template_frame():
+    return pd.DataFrame({
+        "Tanggal": ["2024-01-01"],
+        "Nama Customer": ["Contoh Pelanggan"],
+        "Nama Produk": ["Contoh Produk"],
+        "Kategori": ["Minuman"],
+        "Jumlah": [5],
+        "Harga": [10000],
+        "Total": [50000]
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def template_csv():
+    return template_frame().to_csv(index=False)
+
+
+@functools.lru_cache(maxsize=None)
+def template_xlsx():
+    excel_bytes = BytesIO()
+    template_frame().to_excel(excel_bytes, index=False)
+    return excel_bytes.getvalue()
@@ -0,0 +1,177 @@
+"""Laporan ringkasan tanpa Streamlit, untuk banyak merchant sekaligus.
+
+``analyze_transactions`` dan ``write_report`` adalah versi library dari
+alur dashboard (cube → filter → metrik → laporan HTML). ``run_batch``
+menjalankan banyak laporan paralel di process pool; dipakai oleh CLI
+``python -m smartbiz``.
+
+Manifest (CSV atau JSON) berisi satu baris per merchant dengan kolom
+``file``, ``nama``, ``jenis``, ``tahun`` dan opsional ``output``.
+"""
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from smartbiz.cube import build_cube, date_bounds
+from smartbiz.filters import FilterIndex
+from smartbiz.ingest import parse_transactions
+from smartbiz.metrics import compute_metrics
+from smartbiz.normalize import normalize_transactions
+from smartbiz.report import save_report
+
+MANIFEST_COLUMNS = {"file", "nama", "jenis", "tahun"}
+
+
+class ManifestError(ValueError):
+    """Manifest tidak bisa dibaca atau kolom wajibnya tidak lengkap."""
+
+
+@dataclass
+class MerchantJob:
+    path: str
+    info: dict
+    output: str
+    start_date: pd.Timestamp = None
+    end_date: pd.Timestamp = None
+    charts: bool = False
+
+
+@dataclass
+class ReportResult:
+    path: str
+    output: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = None
+
+
+@dataclass
+class BatchSummary:
+    results: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self):
+        return [r for r in self.results if r.error is None]
+
+    @property
+    def failed(self):
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def reports_per_minute(self):
+        return len(self.succeeded) / self.seconds * 60 if self.seconds else 0.0
+
+
+def load_dataset(path):
+    """Baca + normalisasi satu file transaksi (.csv / .xlsx)."""
+    with open(path, "rb") as f:
+        return normalize_transactions(parse_transactions(f.read(), os.path.basename(path)))
+
+
+def analyze_transactions(df, start_date=None, end_date=None, kategori=None, customers=None):
+    """Kembalikan (metrics, start_date, end_date) seperti dashboard; tanpa
+    rentang tanggal, seluruh data dipakai."""
+    cube = build_cube(df)
+    min_date, max_date = date_bounds(cube)
+    start_date = min_date if start_date is None else pd.Timestamp(start_date)
+    end_date = max_date if end_date is None else pd.Timestamp(end_date)
+    metrics = compute_metrics(FilterIndex(cube).filter(start_date, end_date, kategori, customers))
+    return metrics, start_date, end_date
+
+
+def render_chart_images(metrics):
+    """PNG grafik dirender langsung di proses ini (worker batch sudah paralel).
+    Tanpa kaleido, grafik disematkan sebagai HTML Plotly interaktif."""
+    from smartbiz.chart_images import HAS_KALEIDO, IMAGE_HEIGHT, IMAGE_WIDTH, with_interactive
+    from smartbiz.figures import build_figures
+    figures = build_figures(metrics)
+    if not HAS_KALEIDO:
+        return with_interactive(figures, {})
+    return {
+        name: fig.to_image(format="png", width=IMAGE_WIDTH, height=IMAGE_HEIGHT)
+        for name, fig in figures.items()
+    }
+
+
+def write_report(df, info, output, start_date=None, end_date=None, charts=False):
+    """Tulis laporan HTML lengkap ``df`` ke ``output``."""
+    metrics, start_date, end_date = analyze_transactions(df, start_date, end_date)
+    images = render_chart_images(metrics) if charts else None
+    save_report(output, info, metrics, start_date, end_date, images)
+    return metrics
+
+
+def run_job(job):
+    """Satu laporan; error dikembalikan sebagai hasil agar batch tetap jalan."""
+    start = time.perf_counter()
+    result = ReportResult(job.path, job.output)
+    try:
+        df = load_dataset(job.path)
+        result.rows = len(df)
+        write_report(df, job.info, job.output, job.start_date, job.end_date, job.charts)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def load_manifest(path):
+    """Baris manifest sebagai list dict."""
+    try:
+        if path.lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                rows = json.load(f)
+        else:
+            rows = pd.read_csv(path, dtype=str, keep_default_na=False).to_dict("records")
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Manifest tidak bisa dibaca: {e}") from e
+    if not isinstance(rows, list):
+        raise ManifestError("Manifest JSON harus berupa list merchant")
+    for i, row in enumerate(rows, start=1):
+        missing = MANIFEST_COLUMNS - set(row)
+        if missing:
+            raise ManifestError(f"Baris {i} manifest: kolom {', '.join(sorted(missing))} tidak ada")
+        try:
+            row["tahun"] = int(str(row["tahun"]).strip())
+        except ValueError:
+            raise ManifestError(f"Baris {i} manifest: tahun {row['tahun']!r} bukan angka") from None
+    return rows
+
+
+def build_jobs(manifest, input_dir, output_dir, start_date=None, end_date=None, charts=False):
+    jobs = []
+    for row in manifest:
+        output = row.get("output") or os.path.splitext(os.path.basename(row["file"]))[0] + ".html"
+        jobs.append(MerchantJob(
+            path=os.path.join(input_dir, row["file"]),
+            info={"nama": row["nama"], "jenis": row["jenis"], "tahun": int(row["tahun"])},
+            output=os.path.join(output_dir, output),
+            start_date=start_date,
+            end_date=end_date,
+            charts=charts,
+        ))
+    return jobs
+
+
+def run_batch(jobs, workers=None, progress=None):
+    """Jalankan ``jobs`` paralel. ``progress`` dipanggil dengan (ReportResult,
+    jumlah selesai, total) setiap satu laporan selesai."""
+    summary = BatchSummary()
+    start = time.perf_counter()
+    workers = workers or min(len(jobs), os.cpu_count() or 1) or 1
+    # "spawn" sama seperti pool aplikasi (lihat smartbiz.workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            summary.results.append(result)
+            if progress:
+                progress(result, done, len(jobs))
+    summary.seconds = time.perf_counter() - start
+    return summary
@@ -0,0 +1,69 @@
+"""Reduksi data chart sebelum masuk ke ``px.*``.
+
+Deret waktu diperkecil dengan LTTB (Largest-Triangle-Three-Buckets) yang
+mempertahankan bentuk puncak/lembah, sedangkan chart kategorikal dibatasi
+ke top-N ditambah satu bucket "Lainnya". Dengan begitu ukuran JSON Plotly
+tetap terbatas berapa pun besar datasetnya.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = int(os.environ.get("SMARTBIZ_CHART_MAX_POINTS", "500"))
+MAX_SLICES = int(os.environ.get("SMARTBIZ_CHART_MAX_SLICES", "12"))
+MAX_BARS = int(os.environ.get("SMARTBIZ_CHART_MAX_BARS", "20"))
+OTHERS_LABEL = "Lainnya"
+
+
+def lttb_indices(x, y, n_out):
+    """Indeks titik terpilih LTTB; titik pertama & terakhir selalu ikut."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    # n - 2 titik tengah dibagi ke n_out - 2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Titik acuan: rata-rata bucket berikutnya (atau titik terakhir)
+        if i + 2 < len(edges):
+            nxt_lo, nxt_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(area.argmax())
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample_series(df, x, y, max_points=MAX_POINTS):
+    if len(df) <= max_points:
+        return df
+    xs = df[x].to_numpy()
+    if np.issubdtype(xs.dtype, np.datetime64):
+        xs = xs.astype("int64")
+    elif not np.issubdtype(xs.dtype, np.number):
+        xs = np.arange(len(df))
+    return df.iloc[lttb_indices(xs, df[y].to_numpy(), max_points)]
+
+
+def top_n_with_others(df, label, value, n=MAX_SLICES, others_label=OTHERS_LABEL):
+    """Top ``n - 1`` baris berdasarkan ``value`` + satu baris ``others_label``
+    berisi jumlah sisanya. Urutan hasil: terbesar dulu, "Lainnya" di akhir."""
+    ranked = df[[label, value]].sort_values(value, ascending=False, kind="stable")
+    if len(ranked) <= n:
+        return ranked.reset_index(drop=True)
+    head = ranked.head(n - 1)
+    others = pd.DataFrame({label: [others_label], value: [ranked[value].iloc[n - 1:].sum()]})
+    head = head.astype({label: object})
+    return pd.concat([head, others], ignore_index=True)
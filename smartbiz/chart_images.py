@@ -0,0 +1,137 @@
+"""Render figure Plotly ke PNG statis untuk disematkan di laporan HTML.
+
+Render berjalan di process pool (``fig.to_image`` lewat kaleido cukup
+berat dan terikat CPU), dan tiap gambar di-cache dengan hash spesifikasi
+figure. Generate ulang laporan dengan filter yang sama tidak merender
+ulang apa pun. Kalau kaleido tidak terpasang (atau render PNG gagal),
+grafik disematkan sebagai grafik interaktif Plotly: plotly.js dimuat dari
+CDN, jadi laporan tetap lengkap tapi butuh koneksi internet saat dibuka.
+"""
+import base64
+import importlib.util
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+
+from smartbiz.ingest import content_hash
+from smartbiz.workers import get_pool, reset_pool
+
+logger = logging.getLogger(__name__)
+
+HAS_KALEIDO = importlib.util.find_spec("kaleido") is not None
+if not HAS_KALEIDO:
+    # kaleido ada di requirements.txt: lingkungan yang tidak memasangnya perlu terlihat di log
+    logger.warning("Paket kaleido tidak terpasang: grafik laporan disematkan sebagai HTML Plotly interaktif")
+IMAGE_WIDTH = 800
+IMAGE_HEIGHT = 400
+MAX_CACHED_IMAGES = int(os.environ.get("SMARTBIZ_CHART_CACHE_ENTRIES", "256"))
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def figure_key(spec, width=IMAGE_WIDTH, height=IMAGE_HEIGHT):
+    """Hash spesifikasi figure (JSON Plotly) + ukuran gambar."""
+    return content_hash(f"{width}x{height}:{spec}".encode("utf-8"))
+
+
+def _render_png(spec, width, height):
+    # Dijalankan di worker: figure dikirim sebagai JSON agar murah di-pickle
+    import plotly.io as pio
+    return pio.from_json(spec).to_image(format="png", width=width, height=height)
+
+
+def _cache_get(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key, png):
+    with _cache_lock:
+        _cache[key] = png
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_IMAGES:
+            _cache.popitem(last=False)
+
+
+def render_figures(figures, width=IMAGE_WIDTH, height=IMAGE_HEIGHT):
+    """Kembalikan {nama: grafik} untuk setiap figure: png bytes bila berhasil
+    dirender, selain itu HTML interaktif (``with_interactive``). Gambar yang
+    sudah ada di cache langsung dipakai; sisanya dirender paralel."""
+    images, pending = {}, {}
+    for name, fig in figures.items():
+        spec = fig.to_json()
+        key = figure_key(spec, width, height)
+        png = _cache_get(key)
+        if png is not None:
+            images[name] = png
+        else:
+            pending[name] = (key, spec)
+
+    if not pending or not HAS_KALEIDO:
+        return with_interactive(figures, images, height)
+
+    try:
+        pool = get_pool()
+        futures = {name: (key, pool.submit(_render_png, spec, width, height)) for name, (key, spec) in pending.items()}
+    except BrokenProcessPool:
+        logger.warning("Process pool render grafik rusak, dibuat ulang pada permintaan berikutnya", exc_info=True)
+        reset_pool()
+        return with_interactive(figures, images, height)
+    for name, (key, future) in futures.items():
+        try:
+            png = future.result()
+        except BrokenProcessPool:
+            logger.warning("Worker render grafik mati saat merender %s", name, exc_info=True)
+            reset_pool()
+            continue
+        except Exception:
+            # Yang gagal tetap masuk laporan sebagai grafik interaktif
+            logger.warning("Gagal merender grafik %s", name, exc_info=True)
+            continue
+        _cache_put(key, png)
+        images[name] = png
+    return with_interactive(figures, images, height)
+
+
+def interactive_html(fig, height=IMAGE_HEIGHT, include_plotlyjs=False):
+    """Grafik Plotly interaktif (div + script) untuk disematkan di laporan."""
+    return fig.to_html(
+        full_html=False, include_plotlyjs=include_plotlyjs, default_width="100%",
+        default_height=f"{height}px", config={"displaylogo": False},
+    )
+
+
+def with_interactive(figures, images, height=IMAGE_HEIGHT):
+    """Lengkapi ``images`` dengan HTML interaktif untuk figure yang tidak punya
+    PNG; urutan mengikuti ``figures``. Tag script plotly.js (CDN) ikut di
+    grafik interaktif pertama, sebelum grafik lain memakainya."""
+    charts, plotlyjs = {}, "cdn"
+    for name, fig in figures.items():
+        if name in images:
+            charts[name] = images[name]
+        else:
+            charts[name] = interactive_html(fig, height, plotlyjs)
+            plotlyjs = False
+    return charts
+
+
+def is_interactive(chart):
+    return isinstance(chart, str)
+
+
+def img_tag(png):
+    encoded = base64.b64encode(png).decode("utf-8")
+    return f'<img src="data:image/png;base64,{encoded}" style="width:100%; margin-bottom:20px;" />'
+
+
+def chart_tag(chart):
+    """Tag HTML satu grafik hasil ``render_figures``."""
+    if is_interactive(chart):
+        return f'<div style="width:100%; margin-bottom:20px;">{chart}</div>'
+    return img_tag(chart)
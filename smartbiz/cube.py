@@ -0,0 +1,72 @@
+"""Rollup cube: jumlah & hitungan transaksi pada grain hari × produk × kategori × customer.
+
+Cube dibangun sekali per dataset. Perubahan filter di dashboard cukup
+memotong cube lalu menjumlahkannya (lihat ``compute_metrics``), sehingga
+biayanya mengikuti jumlah kombinasi unik, bukan jumlah transaksi.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from smartbiz.metrics import COUNT_COLUMN
+from smartbiz.normalize import concat_numeric, downcast_numeric
+
+DIMENSIONS = ["Tanggal", "Nama Produk", "Kategori", "Nama Customer"]
+MEASURES = ["Jumlah", "Total"]
+
+
+def _finalize(cube):
+    for col in MEASURES:
+        cube[col] = downcast_numeric(cube[col])
+    cube[COUNT_COLUMN] = pd.to_numeric(cube[COUNT_COLUMN], downcast="integer")
+    return cube
+
+
+def build_cube(df):
+    keys = [df["Tanggal"].dt.normalize()] + [df[col] for col in DIMENSIONS[1:]]
+    # dropna=False: nama kosong tetap jadi grup sendiri supaya omset & jumlah
+    # order sama dengan total baris mentah
+    grouped = df[MEASURES].groupby(keys, observed=True, dropna=False, sort=True)
+    cube = grouped.sum()
+    cube[COUNT_COLUMN] = grouped.size()
+    return _finalize(cube.reset_index())
+
+
+def merge_cubes(parts):
+    """Gabungkan beberapa cube parsial (mis. per chunk/per file) jadi satu cube
+    dengan kategori terurut, setara dengan ``build_cube`` atas seluruh baris."""
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return pd.DataFrame(columns=DIMENSIONS + MEASURES + [COUNT_COLUMN])
+    combined = pd.concat(parts, ignore_index=True)
+    for col in DIMENSIONS[1:]:
+        if not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = combined[col].astype("category")
+        combined[col] = combined[col].cat.reorder_categories(sorted(combined[col].cat.categories))
+    cube = combined.groupby(DIMENSIONS, observed=True, dropna=False, sort=True)[MEASURES + [COUNT_COLUMN]].sum()
+    return _finalize(cube.reset_index())
+
+
+def append_cube(cube, delta_cube):
+    """Tambahkan cube ``delta_cube`` ke ``cube``. Hanya bagian ``cube`` mulai
+    tanggal pertama delta yang di-group ulang; bagian sebelumnya tinggal
+    disambung, jadi biayanya mengikuti rentang tanggal delta."""
+    if delta_cube.empty:
+        return cube
+    split = np.searchsorted(cube["Tanggal"].to_numpy(), delta_cube["Tanggal"].iloc[0].to_datetime64(), side="left")
+    head, tail = cube.iloc[:split], merge_cubes([cube.iloc[split:], delta_cube])
+    if head.empty:
+        return tail
+    columns = {"Tanggal": pd.concat([head["Tanggal"], tail["Tanggal"]], ignore_index=True)}
+    for col in DIMENSIONS[1:]:
+        # Kategori terurut: kode lama dipetakan ulang hanya bila ada label baru
+        columns[col] = pd.Series(union_categoricals([head[col], tail[col]], sort_categories=True, ignore_order=True))
+    for col in MEASURES + [COUNT_COLUMN]:
+        columns[col] = concat_numeric([head[col], tail[col]])
+    return pd.DataFrame(columns)
+
+
+def date_bounds(cube):
+    if cube.empty:
+        return None, None
+    return cube["Tanggal"].iloc[0], cube["Tanggal"].iloc[-1]
@@ -0,0 +1,185 @@
+"""Analitik customer: skor RFM dan retensi cohort bulanan.
+
+Cukup kolom ``Tanggal``, ``Nama Customer`` dan ``Total`` (plus ``n`` bila
+data pra-agregasi, mis. cube). Semua langkah berupa operasi vektor di atas
+kode customer integer: tanggal terakhir/pertama lewat ``np.maximum.at`` /
+``np.minimum.at``, frekuensi & nilai belanja lewat ``np.bincount``, skor
+quantile lewat ranking ``argsort``, dan matriks cohort × umur bulan lewat
+bitmap customer × bulan. Tidak ada loop per customer, jadi biaya naik
+linear terhadap jumlah baris.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from smartbiz.metrics import COUNT_COLUMN, _codes
+
+RFM_BINS = 5
+# Bitmap customer × bulan lebih besar dari ini → pasangan unik dicari lewat sort
+MAX_BITMAP_CELLS = 200_000_000
+# (segmen, syarat skor R, syarat skor F); dicek berurutan, yang pertama cocok dipakai
+SEGMENTS = [
+    ("Champion", lambda r, f: (r >= 4) & (f >= 4)),
+    ("Loyal", lambda r, f: (r >= 3) & (f >= 3)),
+    ("Pelanggan Baru", lambda r, f: (r >= 4) & (f <= 1)),
+    ("Berpotensi", lambda r, f: r >= 3),
+    ("Berisiko", lambda r, f: f >= 3),
+    ("Hampir Hilang", lambda r, f: r == 2),
+    ("Hilang", lambda r, f: r <= 1),
+]
+SEGMENT_NAMES = [name for name, _ in SEGMENTS]
+
+
+@dataclass
+class CustomerAnalytics:
+    rfm: pd.DataFrame        # Nama Customer, Recency (hari), Frequency, Monetary, R, F, M, Skor RFM, Segmen
+    segments: pd.DataFrame   # Segmen, Customer, Total, Persen Omset (urut SEGMENTS)
+    retention: pd.DataFrame  # index Cohort (YYYY-MM), kolom umur bulan 0..; porsi customer aktif (0–1)
+    cohort_sizes: pd.Series  # index Cohort → jumlah customer baru
+    as_of: pd.Timestamp      # tanggal acuan recency (transaksi terakhir)
+
+    @property
+    def empty(self):
+        return self.rfm.empty
+
+    def customers_in(self, segment):
+        return self.rfm[self.rfm["Segmen"] == segment].sort_values("Monetary", ascending=False, kind="stable")
+
+
+def quantile_scores(values, bins=RFM_BINS):
+    """Skor 1..``bins`` per quantile dari rank rata-rata (seperti
+    ``rank(method="average")`` sebelum ``qcut``): nilai yang sama selalu
+    mendapat skor yang sama."""
+    ordered = np.sort(values)
+    below = np.searchsorted(ordered, values, side="left")
+    upto = np.searchsorted(ordered, values, side="right")
+    ranks = (below + upto - 1) / 2
+    return (ranks * bins // max(len(values), 1) + 1).astype("int8")
+
+
+def _segments(r, f):
+    return np.select([rule(r, f) for _, rule in SEGMENTS], SEGMENT_NAMES, default=SEGMENT_NAMES[-1])
+
+
+def _active_months(codes, months, n_customers, n_months):
+    """Pasangan unik (customer, bulan) yang punya transaksi."""
+    if n_customers * n_months <= MAX_BITMAP_CELLS:
+        active = np.zeros(n_customers * n_months, dtype=bool)
+        active[codes * n_months + months] = True
+        flat = np.flatnonzero(active)
+    else:
+        flat = np.unique(codes * n_months + months)
+    return flat // n_months, flat % n_months
+
+
+def _retention(codes, months, first_month, n_customers, n_months, month0):
+    customer, month = _active_months(codes, months, n_customers, n_months)
+    cohort = first_month[customer]
+    counts = np.bincount(cohort * n_months + (month - cohort), minlength=n_months * n_months)
+    counts = counts.reshape(n_months, n_months)
+    sizes = counts[:, 0]
+    has_cohort = sizes > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = counts[has_cohort] / sizes[has_cohort, None]
+    # Umur bulan yang melewati akhir data belum bisa diamati → NaN, bukan 0
+    cohort_idx = np.flatnonzero(has_cohort)
+    observable = cohort_idx[:, None] + np.arange(n_months)[None, :] < n_months
+    rate = np.where(observable, rate, np.nan)
+    labels = pd.Index((cohort_idx + month0).astype("datetime64[M]").astype(str), name="Cohort")
+    retention = pd.DataFrame(rate, index=labels, columns=pd.RangeIndex(n_months, name="Bulan ke-"))
+    return retention, pd.Series(sizes[has_cohort], index=labels, name="Customer")
+
+
+def compute_customer_analytics(df, as_of=None):
+    """RFM + cohort dari ``df`` (baris transaksi atau cube). Recency dihitung
+    terhadap ``as_of`` (default: tanggal transaksi terakhir)."""
+    dates = df["Tanggal"].to_numpy()
+    codes, labels = _codes(df["Nama Customer"])
+    total = df["Total"].to_numpy()
+    if COUNT_COLUMN in df.columns:
+        n = df[COUNT_COLUMN].to_numpy().astype("int64")
+    else:
+        n = np.ones(len(df), dtype="int64")
+
+    # Customer atau tanggal kosong tidak bisa diberi skor/cohort
+    valid = (codes < len(labels)) & ~np.isnat(dates)
+    if not valid.all():
+        dates, codes, total, n = dates[valid], codes[valid], total[valid], n[valid]
+    if not len(codes):
+        return _empty_analytics()
+
+    # Kode customer dipadatkan supaya label yang tidak muncul (mis. terfilter) tidak ikut
+    present = np.bincount(codes, minlength=len(labels)) > 0
+    remap = np.cumsum(present) - 1
+    codes, labels = remap[codes], labels[present]
+    size = len(labels)
+
+    days = dates.astype("datetime64[D]").astype("int64")
+    as_of_day = int(days.max()) if as_of is None else int(np.datetime64(pd.Timestamp(as_of).date(), "D").astype("int64"))
+    last_day = np.full(size, np.iinfo("int64").min)
+    np.maximum.at(last_day, codes, days)
+    frequency = np.bincount(codes, weights=n, minlength=size).astype("int64")
+    monetary = np.bincount(codes, weights=total, minlength=size)
+    if np.issubdtype(total.dtype, np.integer):
+        monetary = monetary.round().astype("int64")
+    recency = as_of_day - last_day
+
+    # Recency kecil = baru belanja = skor tinggi
+    r = quantile_scores(-recency)
+    f = quantile_scores(frequency)
+    m = quantile_scores(monetary)
+    rfm = pd.DataFrame({
+        "Nama Customer": labels,
+        "Recency (hari)": recency,
+        "Frequency": frequency,
+        "Monetary": monetary,
+        "R": r,
+        "F": f,
+        "M": m,
+        "Skor RFM": (r.astype("int16") * 100 + f * 10 + m).astype("int16"),
+        "Segmen": pd.Categorical(_segments(r, f), categories=SEGMENT_NAMES),
+    })
+
+    seg_codes = rfm["Segmen"].cat.codes.to_numpy()
+    seg_total = np.bincount(seg_codes, weights=monetary, minlength=len(SEGMENT_NAMES))
+    grand_total = seg_total.sum()
+    segments = pd.DataFrame({
+        "Segmen": SEGMENT_NAMES,
+        "Customer": np.bincount(seg_codes, minlength=len(SEGMENT_NAMES)),
+        "Total": seg_total,
+        "Persen Omset": seg_total / grand_total * 100 if grand_total else np.zeros(len(SEGMENT_NAMES)),
+    })
+
+    months = dates.astype("datetime64[M]").astype("int64")
+    month0 = months.min()
+    months = months - month0
+    n_months = int(months.max()) + 1
+    first_month = np.full(size, n_months)
+    np.minimum.at(first_month, codes, months)
+    retention, cohort_sizes = _retention(codes, months, first_month, size, n_months, month0)
+
+    return CustomerAnalytics(
+        rfm=rfm,
+        segments=segments,
+        retention=retention,
+        cohort_sizes=cohort_sizes,
+        as_of=pd.Timestamp(np.datetime64(int(as_of_day), "D")),
+    )
+
+
+def _empty_analytics():
+    rfm = pd.DataFrame({
+        "Nama Customer": pd.Series(dtype=object),
+        "Recency (hari)": pd.Series(dtype="int64"),
+        "Frequency": pd.Series(dtype="int64"),
+        "Monetary": pd.Series(dtype="float64"),
+        "R": pd.Series(dtype="int8"),
+        "F": pd.Series(dtype="int8"),
+        "M": pd.Series(dtype="int8"),
+        "Skor RFM": pd.Series(dtype="int16"),
+        "Segmen": pd.Categorical([], categories=SEGMENT_NAMES),
+    })
+    segments = pd.DataFrame({"Segmen": SEGMENT_NAMES, "Customer": 0, "Total": 0.0, "Persen Omset": 0.0})
+    retention = pd.DataFrame(index=pd.Index([], name="Cohort", dtype=object))
+    return CustomerAnalytics(rfm, segments, retention, pd.Series(dtype="int64", name="Customer"), None)
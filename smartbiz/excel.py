@@ -0,0 +1,132 @@
+"""Jalur cepat ingestion Excel.
+
+Memakai engine ``calamine`` (python-calamine, berbasis Rust) bila
+terpasang; kalau tidak, workbook dibaca streaming dengan openpyxl mode
+read-only per batch baris sehingga progres bisa dilaporkan. Konversi ke
+format cache columnar berjalan di background worker dan dideduplikasi per
+(file, sheet), jadi rerun selama konversi tidak memulai ulang pekerjaan.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+from smartbiz.ingest import content_hash, get_default_cache, validate_columns
+from smartbiz.normalize import normalize_transactions
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+ROW_BATCH = 50_000
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="smartbiz-excel")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def list_sheets(data):
+    if HAS_CALAMINE:
+        from python_calamine import CalamineWorkbook
+        return CalamineWorkbook.from_filelike(BytesIO(data)).sheet_names
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(BytesIO(data), read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def _read_openpyxl(data, sheet_name, progress=None):
+    from openpyxl import load_workbook
+    workbook = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if isinstance(sheet_name, str) else workbook.worksheets[sheet_name]
+        total_rows = sheet.max_row or 0
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        header = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+
+        batches, batch = [], []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= ROW_BATCH:
+                batches.append(pd.DataFrame(batch, columns=header))
+                batch = []
+                if progress and total_rows:
+                    progress(min(len(batches) * ROW_BATCH / total_rows, 1.0))
+        if batch or not batches:
+            batches.append(pd.DataFrame(batch, columns=header))
+    finally:
+        workbook.close()
+    return pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+
+
+def read_excel_sheet(data, sheet_name=0, progress=None):
+    if HAS_CALAMINE:
+        return pd.read_excel(BytesIO(data), sheet_name=sheet_name, engine="calamine")
+    return _read_openpyxl(data, sheet_name, progress)
+
+
+def sheet_dataset_key(file_hash, sheet_name):
+    return content_hash(f"{file_hash}:{sheet_name}".encode("utf-8"))
+
+
+class ExcelConversionJob:
+    """Konversi satu sheet ke DataFrame ternormalisasi di background."""
+
+    def __init__(self, key, data, sheet_name, cache):
+        self.key = key
+        self.progress = 0.0
+        self.stage = "Membaca workbook"
+        self._future = _executor.submit(self._run, data, sheet_name, cache)
+
+    def _set_progress(self, fraction):
+        # Tahap baca Excel dianggap 80% pekerjaan, sisanya normalisasi & cache
+        self.progress = 0.8 * fraction
+
+    def _run(self, data, sheet_name, cache):
+        df = read_excel_sheet(data, sheet_name, progress=self._set_progress)
+        validate_columns(df.columns)
+        self.progress, self.stage = 0.8, "Normalisasi tipe data"
+        df = normalize_transactions(df)
+        self.progress, self.stage = 0.9, "Menyimpan snapshot columnar"
+        df = cache.put(self.key, df)
+        self.progress, self.stage = 1.0, "Selesai"
+        return df
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        return self._future.result(timeout)
+
+
+def submit_conversion(data, sheet_name, file_hash=None, cache=None):
+    """Kembalikan job konversi untuk (file, sheet); job yang sedang berjalan
+    untuk input yang sama dipakai ulang. Key dataset ada di ``job.key``."""
+    cache = cache or get_default_cache()
+    key = sheet_dataset_key(file_hash or content_hash(data), sheet_name)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        created = job is None
+        if created:
+            job = ExcelConversionJob(key, data, sheet_name, cache)
+            _jobs[key] = job
+    if created:
+        # Di luar lock: callback bisa langsung jalan bila job sudah selesai
+        job._future.add_done_callback(lambda _f: _forget(key, job))
+    return job
+
+
+def _forget(key, job):
+    # Hasil sukses sudah ada di cache; job yang gagal juga tidak perlu disimpan
+    with _jobs_lock:
+        if _jobs.get(key) is job:
+            del _jobs[key]
@@ -0,0 +1,144 @@
+"""Figure Plotly dashboard, dibangun dari ``DashboardMetrics``.
+
+Input chart sudah dibatasi lewat ``smartbiz.chart_data`` (top-N + "Lainnya",
+LTTB untuk deret waktu), jadi ukuran figure tidak ikut membesar bersama
+jumlah transaksi. Plotly baru diimpor saat figure pertama dibangun supaya
+halaman Home tidak ikut menanggung biaya impornya.
+"""
+import pandas as pd
+
+from smartbiz.chart_data import MAX_BARS, downsample_series, top_n_with_others
+
+
+def build_figures(metrics):
+    import plotly.express as px
+
+    color_sequence = px.colors.qualitative.Pastel
+    custom_blue = [
+        [0.0, "#a9d1f6"],  
+        [0.5, "#75b2f9"],  
+        [1.0, "#3681c4"]   
+    ]
+    figures = {}
+
+    # Omset per Produk
+    figures["omset_produk"] = px.pie(
+        top_n_with_others(metrics.produk, "Nama Produk", "Total"),
+        names="Nama Produk",
+        values="Total",
+        title="Omset per Produk",
+        color_discrete_sequence=color_sequence
+    )
+
+    # Order per Produk
+    figures["order_produk"] = px.pie(
+        top_n_with_others(metrics.produk, "Nama Produk", "Jumlah"),
+        names="Nama Produk",
+        values="Jumlah",
+        title="Order per Produk",
+        color_discrete_sequence=color_sequence
+    )
+
+    rank_qty = metrics.top_products("Jumlah", 10)
+    figures["top_produk"] = px.bar(
+        rank_qty,
+        x="Jumlah",
+        y="Nama Produk",
+        orientation="h",
+        color="Jumlah",
+        color_continuous_scale=custom_blue,
+        title="TOP Product (by Order)",
+        category_orders={"Nama Produk": rank_qty["Nama Produk"].tolist()}
+    )
+
+    rank_cat = top_n_with_others(metrics.kategori, "Kategori", "Jumlah", n=MAX_BARS)
+    figures["top_kategori"] = px.bar(
+        rank_cat,
+        x="Jumlah",
+        y="Kategori",
+        orientation="h",
+        color="Jumlah",
+        color_continuous_scale=custom_blue,
+        title="TOP Product Category (by Order)",
+        category_orders={"Kategori": rank_cat["Kategori"].tolist()}
+    )
+
+    # Loyal customer
+    loyal = metrics.top_customers(10)
+    figures["top_customer"] = px.bar(
+        loyal,
+        x="Total",
+        y="Nama Customer",
+        orientation="h",
+        color="Total",
+        color_continuous_scale=custom_blue,
+        title="TOP Loyal Customer (by Total Spending)",
+        category_orders={"Nama Customer": loyal["Nama Customer"].tolist()}
+    )
+    for key in ["top_produk", "top_kategori", "top_customer"]:
+        figures[key].update_coloraxes(showscale=False)
+
+    daily = downsample_series(metrics.daily, "Tanggal", "Jumlah")
+    figures["order_harian"] = px.line(daily, x="Tanggal", y="Jumlah", title="Order Harian")
+    monthly = downsample_series(metrics.monthly, "Bulan", "Jumlah")
+    figures["order_bulanan"] = px.bar(monthly, x="Bulan", y="Jumlah", title="Order Bulanan")
+    figures["order_hari"] = px.bar(metrics.weekday, x="Hari", y="Jumlah", title="Rata-rata Order per Hari")
+    return figures
+
+
+def build_customer_figures(analytics):
+    """Figure section analitik customer (``CustomerAnalytics``)."""
+    import plotly.express as px
+
+    figures = {}
+    figures["rfm_segmen"] = px.bar(
+        analytics.segments,
+        x="Customer",
+        y="Segmen",
+        orientation="h",
+        color="Persen Omset",
+        color_continuous_scale=[[0.0, "#a9d1f6"], [1.0, "#3681c4"]],
+        title="Segmen Customer (RFM)",
+        hover_data={"Total": ":,.0f", "Persen Omset": ":.1f"},
+        category_orders={"Segmen": analytics.segments["Segmen"].tolist()}
+    )
+    figures["rfm_segmen"].update_coloraxes(showscale=False)
+
+    retention = analytics.retention * 100
+    figures["cohort_retention"] = px.imshow(
+        retention,
+        labels={"x": "Bulan ke-", "y": "Cohort (bulan pertama belanja)", "color": "% Aktif"},
+        color_continuous_scale="Blues",
+        zmin=0,
+        zmax=100,
+        text_auto=".0f",
+        aspect="auto",
+        title="Retensi Cohort Bulanan (% customer yang belanja lagi)"
+    )
+    figures["cohort_retention"].update_xaxes(type="category")
+    figures["cohort_retention"].update_yaxes(type="category")
+    return figures
+
+
+def _actual_vs_forecast(history, forecast):
+    return pd.concat([history.assign(Data="Aktual"), forecast.assign(Data="Proyeksi")], ignore_index=True)
+
+
+def build_forecast_figures(forecast, history_days=90):
+    """Figure proyeksi (``Forecast``): riwayat terakhir disambung proyeksi."""
+    import plotly.express as px
+
+    figures = {}
+    daily = _actual_vs_forecast(forecast.history_daily.tail(history_days), forecast.daily)
+    figures["proyeksi_harian"] = px.line(
+        daily, x="Tanggal", y="Jumlah", color="Data", line_dash="Data",
+        title=f"Proyeksi Order Harian ({len(forecast.daily)} hari ke depan)"
+    )
+    monthly = _actual_vs_forecast(forecast.history_monthly, forecast.monthly)
+    figures["proyeksi_bulanan"] = px.bar(
+        monthly, x="Bulan", y="Total", color="Data",
+        color_discrete_map={"Aktual": "#75b2f9", "Proyeksi": "#f9c375"},
+        title=f"Proyeksi Omset Bulanan ({len(forecast.monthly)} bulan ke depan)"
+    )
+    figures["proyeksi_bulanan"].update_xaxes(type="category")
+    return figures
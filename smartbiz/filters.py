@@ -0,0 +1,90 @@
+"""Index filter untuk data yang sudah terurut berdasarkan `Tanggal`.
+
+Rentang tanggal diubah jadi potongan kontigu lewat ``searchsorted``,
+kategori dicek lewat tabel lookup (bitmask) di atas kode kategori, dan
+customer memakai posting list posisi baris yang dihitung sekali.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _category_codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series.cat.codes.to_numpy(), series.cat.categories
+
+
+def date_slice(dates, start_date, end_date):
+    """Potongan [lo, hi) dari array ``dates`` terurut untuk tanggal start..end
+    (seluruh hari end ikut)."""
+    # Batas dikonversi ke unit array (bukan sebaliknya) supaya tidak ada salinan O(n)
+    unit = np.datetime_data(dates.dtype)[0]
+    start = np.datetime64(pd.Timestamp(start_date).normalize(), unit)
+    end = np.datetime64(pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1), unit)
+    lo = int(np.searchsorted(dates, start, side="left"))
+    hi = int(np.searchsorted(dates, end, side="left"))
+    return lo, max(lo, hi)
+
+
+class FilterIndex:
+    def __init__(self, df):
+        self.df = df
+        self.dates = df["Tanggal"].to_numpy()
+        self.kategori_codes, self.kategori_labels = _category_codes(df["Kategori"])
+        self.customer_codes, self.customer_labels = _category_codes(df["Nama Customer"])
+        self._kategori_has_missing = bool((self.kategori_codes < 0).any())
+
+        # Posting list: posisi baris (terurut) per kode customer
+        order = np.argsort(self.customer_codes, kind="stable")
+        self._customer_order = order
+        self._customer_bounds = np.searchsorted(
+            self.customer_codes[order], np.arange(len(self.customer_labels) + 1)
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    def date_slice(self, start_date, end_date):
+        return date_slice(self.dates, start_date, end_date)
+
+    def _kategori_mask(self, kategori):
+        # Slot ekstra di akhir menampung kode -1 (nilai kosong) → selalu False
+        allowed = np.zeros(len(self.kategori_labels) + 1, dtype=bool)
+        codes = self.kategori_labels.get_indexer(list(kategori))
+        allowed[codes[codes >= 0]] = True
+        return allowed
+
+    def _customer_positions(self, customers):
+        codes = self.customer_labels.get_indexer(list(customers))
+        codes = codes[codes >= 0]
+        postings = [
+            self._customer_order[self._customer_bounds[c]:self._customer_bounds[c + 1]] for c in codes
+        ]
+        if not postings:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(postings))
+
+    def positions(self, start_date=None, end_date=None, kategori=None, customers=None):
+        """Posisi baris yang lolos filter: ``slice`` bila hasilnya kontigu,
+        atau array posisi terurut. ``customers`` kosong berarti semua."""
+        if start_date is not None and end_date is not None:
+            lo, hi = self.date_slice(start_date, end_date)
+        else:
+            lo, hi = 0, len(self)
+
+        all_kategori = kategori is None or (
+            not self._kategori_has_missing and set(kategori) >= set(self.kategori_labels)
+        )
+        if customers:
+            pos = self._customer_positions(customers)
+            pos = pos[np.searchsorted(pos, lo):np.searchsorted(pos, hi)]
+            if not all_kategori:
+                pos = pos[self._kategori_mask(kategori)[self.kategori_codes[pos]]]
+            return pos
+        if all_kategori:
+            return slice(lo, hi)
+        keep = self._kategori_mask(kategori)[self.kategori_codes[lo:hi]]
+        return np.flatnonzero(keep) + lo
+
+    def filter(self, start_date=None, end_date=None, kategori=None, customers=None):
+        return self.df.iloc[self.positions(start_date, end_date, kategori, customers)]
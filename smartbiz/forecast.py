@@ -0,0 +1,219 @@
+"""Proyeksi `Jumlah` & `Total` harian dan bulanan, per produk dan total.
+
+Semua deret (setiap produk × {Jumlah, Total}, plus total toko) disusun
+jadi satu matriks [deret × waktu] lewat ``np.bincount`` dan diproyeksikan
+dalam satu panggilan batch, bukan satu panggilan per produk.
+
+Model dimuat sekali per proses (``get_model``) dan dipakai semua sesi:
+
+- ``TorchForecaster``: model TorchScript lokal di ``SMARTBIZ_FORECAST_MODEL``
+  (butuh ``torch``; tanpa unduhan, CPU saja). Kontrak: ``model(context,
+  horizon)`` dengan ``context`` float32 [deret × panjang] yang sudah
+  diskalakan per deret, hasil [deret × horizon].
+- ``HoltWintersForecaster`` (default / fallback): exponential smoothing
+  dengan tren teredam dan musiman mingguan (harian) atau tahunan (bulanan),
+  divektorkan di numpy: loop hanya atas waktu, semua deret sekaligus.
+"""
+import importlib.util
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from smartbiz.metrics import _codes
+
+logger = logging.getLogger(__name__)
+
+HAS_TORCH = importlib.util.find_spec("torch") is not None
+MODEL_PATH = os.environ.get("SMARTBIZ_FORECAST_MODEL", "")
+FORECAST_DAYS = 30
+FORECAST_MONTHS = 3
+# Riwayat yang dipakai model (hari / bulan terakhir)
+CONTEXT_DAYS = 365
+CONTEXT_MONTHS = 36
+MEASURES = ["Jumlah", "Total"]
+
+
+class HoltWintersForecaster:
+    name = "Holt-Winters (statistik)"
+
+    def __init__(self, alpha=0.2, beta=0.05, gamma=0.1, phi=0.9):
+        self.alpha, self.beta, self.gamma, self.phi = alpha, beta, gamma, phi
+
+    def predict(self, history, horizon, season=None):
+        """``history`` [deret × waktu] → proyeksi [deret × horizon], tidak negatif."""
+        y = np.asarray(history, dtype="float64")
+        n_series, length = y.shape
+        # Musiman baru dipakai bila riwayat minimal dua siklus
+        if not season or length < 2 * season:
+            season, gamma = 1, 0.0
+        else:
+            gamma = self.gamma
+        level = y[:, :season].mean(axis=1)
+        trend = np.zeros(n_series)
+        seasonal = y[:, :season] - level[:, None]
+        for t in range(season, length):
+            s = t % season
+            prev_level = level
+            level = self.alpha * (y[:, t] - seasonal[:, s]) + (1 - self.alpha) * (prev_level + self.phi * trend)
+            trend = self.beta * (level - prev_level) + (1 - self.beta) * self.phi * trend
+            seasonal[:, s] = gamma * (y[:, t] - level) + (1 - gamma) * seasonal[:, s]
+        steps = np.arange(1, horizon + 1)
+        damped = np.cumsum(self.phi ** steps)
+        forecast = level[:, None] + damped[None, :] * trend[:, None] + seasonal[:, (length + steps - 1) % season]
+        return np.maximum(forecast, 0)
+
+
+class TorchForecaster:
+    def __init__(self, path):
+        import torch
+        self._torch = torch
+        self.model = torch.jit.load(path, map_location="cpu").eval()
+        self.name = f"Model lokal ({os.path.basename(path)})"
+
+    def predict(self, history, horizon, season=None):
+        torch = self._torch
+        y = np.asarray(history, dtype="float32")
+        # Skala per deret supaya produk murah & mahal sebanding di satu batch
+        scale = np.abs(y).mean(axis=1, keepdims=True)
+        scale[scale == 0] = 1
+        with torch.inference_mode():
+            out = self.model(torch.from_numpy(y / scale), horizon).numpy()
+        return np.maximum(out.astype("float64") * scale, 0)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Model proyeksi bersama per proses; fallback ke statistik bila model
+    lokal tidak ada atau gagal dimuat."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            if MODEL_PATH and HAS_TORCH:
+                try:
+                    _model = TorchForecaster(MODEL_PATH)
+                except Exception:
+                    logger.warning("Model proyeksi %s gagal dimuat, pakai Holt-Winters", MODEL_PATH, exc_info=True)
+            _model = _model or HoltWintersForecaster()
+        return _model
+
+
+@dataclass
+class Forecast:
+    daily: pd.DataFrame     # Tanggal, Jumlah, Total (proyeksi total toko)
+    monthly: pd.DataFrame   # Bulan (YYYY-MM), Jumlah, Total
+    history_daily: pd.DataFrame    # riwayat total toko yang dipakai model, kolom sama
+    history_monthly: pd.DataFrame
+    produk: pd.DataFrame    # Nama Produk, Jumlah, Total (jumlah proyeksi FORECAST_DAYS hari), urut Total
+    produk_monthly: pd.DataFrame  # Bulan, Nama Produk, Jumlah, Total
+    model: str
+
+    @property
+    def empty(self):
+        return self.daily.empty
+
+
+def _matrix(product_codes, n_products, time_codes, n_times, values):
+    """[produk × waktu] lewat satu bincount atas kode gabungan."""
+    flat = product_codes * n_times + time_codes
+    return np.bincount(flat, weights=values, minlength=n_products * n_times).reshape(n_products, n_times)
+
+
+def _batch(product_codes, n_products, time_codes, n_times, measures, context):
+    """Semua deret produk per ukuran + deret total toko untuk ``context``
+    periode terakhir: [(ukuran, produk), ...] lalu [ukuran total]. Baris di
+    luar jendela dibuang sebelum bincount, jadi matriks hanya selebar
+    ``context`` (bukan seluruh riwayat)."""
+    first = max(n_times - context, 0)
+    if first:
+        keep = time_codes >= first
+        product_codes, time_codes = product_codes[keep], time_codes[keep] - first
+        measures = [v[keep] for v in measures]
+    width = n_times - first
+    per_product = [_matrix(product_codes, n_products, time_codes, width, v) for v in measures]
+    totals = [m.sum(axis=0, keepdims=True) for m in per_product]
+    return np.vstack(per_product + totals)
+
+
+def _split(matrix, n_products):
+    """Kebalikan ``_batch``: ({ukuran: [produk × waktu]}, {ukuran: [waktu]})."""
+    k = len(MEASURES)
+    per_product = {m: matrix[i * n_products:(i + 1) * n_products] for i, m in enumerate(MEASURES)}
+    totals = {m: matrix[k * n_products + i] for i, m in enumerate(MEASURES)}
+    return per_product, totals
+
+
+def forecast_sales(df, days=FORECAST_DAYS, months=FORECAST_MONTHS, model=None):
+    """Proyeksi dari ``df`` berkolom ``Tanggal``, ``Nama Produk``, ``Jumlah``,
+    ``Total`` (baris transaksi, cube, atau rollup SQL)."""
+    model = model or get_model()
+    dates = df["Tanggal"].to_numpy()
+    codes, labels = _codes(df["Nama Produk"])
+    valid = (codes < len(labels)) & ~np.isnat(dates)
+    if not valid.any():
+        return _empty_forecast(model.name)
+    dates, codes = dates[valid], codes[valid]
+    measures = [df[m].to_numpy()[valid].astype("float64") for m in MEASURES]
+    n_products = len(labels)
+
+    # --- Harian: semua produk & ukuran dalam satu batch
+    day = dates.astype("datetime64[D]").astype("int64")
+    first_day, last_day = day.min(), day.max()
+    history = _batch(codes, n_products, day - first_day, int(last_day - first_day) + 1, measures, CONTEXT_DAYS)
+    per_product, totals = _split(model.predict(history, days, season=7), n_products)
+    daily = pd.DataFrame({"Tanggal": _days(last_day + 1, days), **totals})
+    history_daily = pd.DataFrame({"Tanggal": _days(last_day + 1 - history.shape[1], history.shape[1]),
+                                  **_split(history, n_products)[1]})
+    produk = pd.DataFrame({
+        "Nama Produk": labels, **{m: per_product[m].sum(axis=1) for m in MEASURES}
+    }).sort_values("Total", ascending=False, kind="stable", ignore_index=True)
+
+    # --- Bulanan: bulan terakhir yang belum lengkap tidak ikut jadi riwayat
+    month = dates.astype("datetime64[M]").astype("int64")
+    first_month, last_month = month.min(), month.max()
+    last_date = np.datetime64(int(last_day), "D")
+    if (last_date + 1).astype("datetime64[M]") == last_date.astype("datetime64[M]") and last_month > first_month:
+        keep = month < last_month
+        month, codes_m = month[keep], codes[keep]
+        measures_m = [v[keep] for v in measures]
+        last_month -= 1
+    else:
+        codes_m, measures_m = codes, measures
+    history = _batch(codes_m, n_products, month - first_month, int(last_month - first_month) + 1, measures_m, CONTEXT_MONTHS)
+    per_product, totals = _split(model.predict(history, months, season=12), n_products)
+    future_months = _months(last_month + 1, months)
+    monthly = pd.DataFrame({"Bulan": future_months, **totals})
+    history_monthly = pd.DataFrame({"Bulan": _months(last_month + 1 - history.shape[1], history.shape[1]),
+                                    **_split(history, n_products)[1]})
+    produk_monthly = pd.DataFrame({
+        "Bulan": np.tile(future_months, n_products),
+        "Nama Produk": np.repeat(labels, months),
+        **{m: per_product[m].ravel() for m in MEASURES},
+    })
+    return Forecast(
+        daily=daily, monthly=monthly, history_daily=history_daily, history_monthly=history_monthly,
+        produk=produk, produk_monthly=produk_monthly, model=model.name,
+    )
+
+
+def _days(start, count):
+    return (start + np.arange(count)).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def _months(start, count):
+    return (start + np.arange(count)).astype("datetime64[M]").astype(str)
+
+
+def _empty_forecast(model_name):
+    daily = pd.DataFrame({"Tanggal": pd.Series(dtype="datetime64[ns]"), "Jumlah": 0.0, "Total": 0.0})
+    monthly = pd.DataFrame({"Bulan": pd.Series(dtype=str), "Jumlah": 0.0, "Total": 0.0})
+    produk = pd.DataFrame({"Nama Produk": pd.Series(dtype=object), "Jumlah": 0.0, "Total": 0.0})
+    produk_monthly = pd.DataFrame({"Bulan": pd.Series(dtype=str), "Nama Produk": pd.Series(dtype=object),
+                                   "Jumlah": 0.0, "Total": 0.0})
+    return Forecast(daily, monthly, daily, monthly, produk, produk_monthly, model_name)
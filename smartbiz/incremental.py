@@ -0,0 +1,143 @@
+"""Tambah transaksi baru (delta) ke dataset yang sudah ada tanpa menghitung ulang dari nol.
+
+``RunningAggregates`` menyimpan agregat dataset pada grain label (total per
+produk/customer/kategori, seri harian & bulanan, jumlah per hari dalam
+minggu). Delta cukup diagregasi sendiri lalu dijumlahkan ke agregat lama,
+dan ``DashboardMetrics`` (termasuk Pareto) diturunkan ulang dari total yang
+sudah diperbarui. Cube hanya di-group ulang pada rentang tanggal delta.
+Biaya refresh harian mengikuti ukuran delta dan jumlah label, bukan
+panjang histori transaksi.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from smartbiz.cube import append_cube, build_cube
+from smartbiz.ingest import content_hash
+from smartbiz.metrics import COUNT_COLUMN, _group, _time_patterns, assemble_metrics, weekday_average
+from smartbiz.multi_file import concat_transactions, row_hashes
+
+
+def _label_index(labels, name):
+    return pd.Index(np.asarray(labels, dtype=object), dtype=object, name=name)
+
+
+def _add(a, b):
+    # Jumlahkan dua agregat berindeks label; hasil terurut label seperti compute_metrics
+    return pd.concat([a, b]).groupby(level=0, sort=True).sum()
+
+
+@dataclass
+class RunningAggregates:
+    total_omset: int
+    total_order: int
+    produk: pd.DataFrame      # index Nama Produk → Total, Jumlah
+    customer: pd.Series       # index Nama Customer → Total
+    kategori: pd.Series       # index Kategori → jumlah transaksi
+    daily: pd.Series          # index Tanggal → Jumlah
+    monthly: pd.Series        # index Bulan (YYYY-MM) → Jumlah
+    weekday_n: np.ndarray     # jumlah transaksi per hari dalam minggu, Senin dulu
+    weekday_qty: np.ndarray   # jumlah order per hari dalam minggu
+
+    @classmethod
+    def from_frame(cls, df):
+        """Agregat dari cube (kolom ``n``) atau baris transaksi."""
+        total = df["Total"].to_numpy()
+        jumlah = df["Jumlah"].to_numpy()
+        if COUNT_COLUMN in df.columns:
+            n = df[COUNT_COLUMN].to_numpy().astype("int64")
+        else:
+            n = np.ones(len(df), dtype="int64")
+
+        prod_names, _, (prod_total, prod_qty) = _group(df["Nama Produk"], n, total, jumlah)
+        cust_names, _, (cust_total,) = _group(df["Nama Customer"], n, total)
+        cat_names, cat_n, _ = _group(df["Kategori"], n)
+        daily, monthly, wd_n, wd_qty = _time_patterns(df["Tanggal"].to_numpy(), n, jumlah)
+        return cls(
+            total_omset=total.sum(),
+            total_order=int(n.sum()),
+            produk=pd.DataFrame({"Total": prod_total, "Jumlah": prod_qty}, index=_label_index(prod_names, "Nama Produk")),
+            customer=pd.Series(cust_total, index=_label_index(cust_names, "Nama Customer"), name="Total"),
+            kategori=pd.Series(cat_n, index=_label_index(cat_names, "Kategori"), name="Jumlah"),
+            daily=daily.set_index("Tanggal")["Jumlah"],
+            monthly=monthly.set_index("Bulan")["Jumlah"],
+            weekday_n=wd_n,
+            weekday_qty=wd_qty,
+        )
+
+    def add(self, other):
+        """Agregat gabungan ``self`` + ``other`` (objek baru)."""
+        return RunningAggregates(
+            total_omset=self.total_omset + other.total_omset,
+            total_order=self.total_order + other.total_order,
+            produk=_add(self.produk, other.produk),
+            customer=_add(self.customer, other.customer),
+            kategori=_add(self.kategori, other.kategori),
+            daily=_add(self.daily, other.daily),
+            monthly=_add(self.monthly, other.monthly),
+            weekday_n=self.weekday_n + other.weekday_n,
+            weekday_qty=self.weekday_qty + other.weekday_qty,
+        )
+
+    def to_metrics(self):
+        """``DashboardMetrics`` tanpa filter; Pareto diturunkan dari total terbaru."""
+        kategori = self.kategori.reset_index().sort_values(
+            "Jumlah", ascending=False, kind="stable", ignore_index=True
+        )
+        return assemble_metrics(
+            self.total_omset,
+            self.total_order,
+            self.produk.reset_index(),
+            self.customer.reset_index(),
+            kategori,
+            self.daily.reset_index(),
+            self.monthly.reset_index(),
+            weekday_average(self.weekday_n, self.weekday_qty),
+        )
+
+
+@dataclass
+class AppendResult:
+    key: str
+    df: pd.DataFrame
+    cube: pd.DataFrame
+    aggregates: RunningAggregates
+    added: int
+    duplicates: int
+
+
+def append_key(base_key, delta_key, drop_overlap=True):
+    return content_hash(f"append:{int(drop_overlap)}:{base_key}:{delta_key}".encode("utf-8"))
+
+
+def overlapping_rows(df, delta):
+    """Mask baris ``delta`` yang sudah ada persis di ``df``. Hanya baris ``df``
+    di rentang tanggal delta yang di-hash (``df`` terurut `Tanggal`)."""
+    lo, hi = delta["Tanggal"].min(), delta["Tanggal"].max()
+    if pd.isna(lo):
+        return np.zeros(len(delta), dtype=bool)
+    dates = df["Tanggal"].to_numpy()
+    start = np.searchsorted(dates, lo.to_datetime64(), side="left")
+    stop = np.searchsorted(dates, hi.to_datetime64(), side="right")
+    return np.isin(row_hashes(delta), row_hashes(df.iloc[start:stop]))
+
+
+def append_transactions(base_key, df, cube, aggregates, delta_key, delta, drop_overlap=True):
+    """Gabung ``delta`` (DataFrame ternormalisasi) ke dataset ``df`` beserta cube
+    dan agregatnya. Dengan ``drop_overlap``, baris delta yang sama persis dengan
+    baris lama dilewati (mis. file harian yang terunggah dua kali)."""
+    duplicates = overlapping_rows(df, delta)
+    if drop_overlap and duplicates.any():
+        delta = delta[~duplicates]
+    delta_cube = build_cube(delta)
+    return AppendResult(
+        key=append_key(base_key, delta_key, drop_overlap),
+        # Baris mentah disambung (salin memori); sort hanya bila delta menyisip ke tengah
+        df=concat_transactions([df, delta]),
+        cube=append_cube(cube, delta_cube),
+        # Agregat delta diambil dari cube delta, sama seperti metrik dashboard
+        aggregates=aggregates.add(RunningAggregates.from_frame(delta_cube)),
+        added=len(delta),
+        duplicates=int(duplicates.sum()),
+    )
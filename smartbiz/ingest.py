@@ -0,0 +1,286 @@
+"""Ingestion layer: file upload diparse sekali, lalu disimpan sebagai snapshot
+columnar (Parquet) di cache LRU yang dikunci dengan hash isi file.
+
+Cache memori bersifat global per proses: sesi yang membuka file yang sama
+memakai satu DataFrame yang sama (sesi hanya menyimpan key-nya), dibatasi
+anggaran memori total."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+from smartbiz.normalize import normalize_transactions
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = {"Tanggal", "Nama Customer", "Nama Produk", "Kategori", "Jumlah", "Harga", "Total"}
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SMARTBIZ_CACHE_DIR", os.path.join(tempfile.gettempdir(), "smartbiz-cache")
+)
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get("SMARTBIZ_CACHE_ENTRIES", "4"))
+DEFAULT_MEMORY_BYTES = int(os.environ.get("SMARTBIZ_CACHE_MEMORY_MB", "1024")) * 1024 * 1024
+DEFAULT_DISK_BYTES = int(os.environ.get("SMARTBIZ_CACHE_DISK_MB", "2048")) * 1024 * 1024
+# Jalur Arrow: CSV dibaca pembaca Arrow (multi-thread) dan tabel dashboard
+# memakai compute kernel Arrow di atas view zero-copy dari dataset bersama
+ARROW_ENABLED = os.environ.get("SMARTBIZ_ARROW", "0") == "1"
+# Backend SQL (smartbiz.sql_backend) aktif secara default bila env ini diset ("1");
+# didefinisikan di sini supaya halaman Home tidak perlu mengimpor backend SQL
+SQL_ENABLED_BY_DEFAULT = os.environ.get("SMARTBIZ_SQL_BACKEND", "0") == "1"
+# Naikkan setiap kali format snapshot (tipe kolom, urutan, dsb.) berubah
+SNAPSHOT_VERSION = 5
+
+
+class MissingColumnsError(ValueError):
+    """File berhasil dibaca tapi kolom wajib tidak lengkap."""
+
+    def __init__(self, missing):
+        self.missing = sorted(missing)
+        super().__init__(f"Kolom wajib tidak ditemukan: {', '.join(self.missing)}")
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def content_hash_stream(fileobj, block_size=8 * 1024 * 1024):
+    """Hash yang sama dengan ``content_hash`` tapi dibaca per blok, lalu posisi
+    file dikembalikan ke awal."""
+    digest = hashlib.blake2b(digest_size=16)
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def validate_columns(columns):
+    missing = REQUIRED_COLUMNS - set(columns)
+    if missing:
+        raise MissingColumnsError(missing)
+
+
+def read_csv_arrow(data):
+    """CSV → DataFrame lewat pembaca Arrow. Hasil setelah normalisasi sama
+    dengan ``pd.read_csv``; tanggal ISO langsung terbaca sebagai timestamp
+    (unit disamakan: mikrodetik)."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    table = pacsv.read_csv(
+        pa.BufferReader(data), convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date(field.type) or (pa.types.is_timestamp(field.type) and field.type.tz is None):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp("us")))
+    # Buffer Arrow dilepas per kolom selama konversi: puncak memori tidak 2x
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def arrow_table(df):
+    """View Arrow zero-copy dari DataFrame hasil normalisasi: kolom kategori
+    jadi dictionary (kode & label dipakai bersama), numerik & tanggal berbagi
+    buffer numpy. Satu chunk per kolom (dipakai ``ArrowRows``)."""
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+
+
+def parse_transactions(data, filename, sheet_name=0):
+    if filename.lower().endswith(".csv"):
+        df = read_csv_arrow(data) if ARROW_ENABLED else pd.read_csv(BytesIO(data))
+    else:
+        from smartbiz.excel import read_excel_sheet
+        df = read_excel_sheet(data, sheet_name)
+    validate_columns(df.columns)
+    return df
+
+
+class DatasetCache:
+    """Cache dua tingkat: DataFrame di memori (LRU, dibatasi jumlah entry dan
+    total byte) dan snapshot Parquet di disk (LRU by bytes, urutan akses
+    dicatat lewat mtime).
+
+    ``get`` mengembalikan view (``copy(deep=False)``): tanpa salin data, dan
+    karena copy-on-write pandas, perubahan di satu sesi tidak pernah
+    mengubah DataFrame bersama.
+
+    Dengan ``SMARTBIZ_ARROW=1`` tiap entry juga menyimpan tabel Arrow dataset
+    (``get_table``): tabel yang sama dengan yang ditulis ke/dibaca dari
+    snapshot Parquet, berbagi buffer dengan DataFrame-nya."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes=DEFAULT_DISK_BYTES, max_memory_bytes=DEFAULT_MEMORY_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()  # key → (df, bytes, tabel Arrow atau None)
+        self._memory_bytes = 0
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.v{SNAPSHOT_VERSION}.parquet")
+
+    def get(self, key, memory=True):
+        """DataFrame untuk ``key`` atau None. ``memory=False``: snapshot dari
+        disk tidak ikut disimpan di cache memori (mis. di worker pool)."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._memory[key][0].copy(deep=False)
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            self._count("misses")
+            return None
+        try:
+            df, table = self._read_snapshot(path)
+            os.utime(path)
+        except Exception:
+            logger.warning("Snapshot cache rusak, dihapus: %s", path, exc_info=True)
+            self._remove(path)
+            self._count("misses")
+            return None
+        self._count("disk_hits")
+        return self._remember(key, df, table) if memory else df
+
+    def get_table(self, key):
+        """Tabel Arrow untuk ``key`` (jalur ``SMARTBIZ_ARROW``) atau None. Tabel
+        dibuat sekali saat dataset masuk cache, tidak dibangun ulang per sesi."""
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            if self.get(key) is None:
+                return None
+            with self._lock:
+                entry = self._memory.get(key)
+            if entry is None:
+                return None
+        return entry[2]
+
+    def put(self, key, df, memory=True):
+        table = arrow_table(df) if ARROW_ENABLED else None
+        if memory:
+            df = self._remember(key, df, table)
+        try:
+            self._write_snapshot(key, df, table)
+        except Exception:
+            # Cache disk hanya optimasi; kalau gagal cukup pakai cache memori
+            logger.warning("Gagal menulis snapshot Parquet untuk %s", key, exc_info=True)
+        return df
+
+    def stats(self):
+        """Hit/miss/eviction sejak proses mulai dan memori yang sedang dipakai."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "max_bytes": self.max_memory_bytes,
+            }
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _remember(self, key, df, table=None):
+        # Tabel Arrow berbagi buffer dengan df, jadi tidak dihitung terpisah
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            self._memory[key] = (df, size, table)
+            self._memory_bytes += size
+            # Dataset yang paling lama tidak dibuka sesi mana pun dibuang dulu;
+            # yang baru masuk selalu disimpan walau sendirian melebihi anggaran
+            while len(self._memory) > 1 and (
+                len(self._memory) > self.max_entries or self._memory_bytes > self.max_memory_bytes
+            ):
+                _, (_, evicted, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+                self._stats["evictions"] += 1
+        return df.copy(deep=False)
+
+    @staticmethod
+    def _read_snapshot(path):
+        """(df, tabel Arrow atau None). Jalur Arrow: snapshot dibaca sebagai
+        tabel, lalu DataFrame dibuat darinya tanpa salin kolom numerik."""
+        if not ARROW_ENABLED:
+            return pd.read_parquet(path), None
+        import pyarrow.parquet as pq
+        table = pq.read_table(path).combine_chunks()
+        return table.to_pandas(split_blocks=True), table
+
+    def _write_snapshot(self, key, df, table=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        if table is None:
+            df.to_parquet(tmp_path, index=False)
+        else:
+            import pyarrow.parquet as pq
+            # Metadata & satu row group seperti ``to_parquet``: dibaca ulang jadi
+            # satu chunk per kolom dan ``df.attrs`` (laporan memori/kualitas) ikut
+            metadata = {**table.schema.metadata, b"PANDAS_ATTRS": json.dumps(df.attrs).encode("utf-8")}
+            pq.write_table(table.replace_schema_metadata(metadata), tmp_path, row_group_size=max(table.num_rows, 1))
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = DatasetCache()
+        return _default_cache
+
+
+def load_transactions(data, filename, cache=None, memory=True):
+    """Kembalikan (key, df). Upload/rerun dengan isi file yang sama hanya
+    membayar biaya hashing; parsing, validasi kolom dan normalisasi tipe
+    hanya terjadi sekali. ``memory=False``: hanya snapshot disk yang dipakai,
+    cache memori proses ini tidak diisi."""
+    cache = cache or get_default_cache()
+    key = content_hash(data)
+    df = cache.get(key, memory=memory)
+    if df is None:
+        df = normalize_transactions(parse_transactions(data, filename))
+        df = cache.put(key, df, memory=memory)
+    return key, df
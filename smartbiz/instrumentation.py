@@ -0,0 +1,180 @@
+"""Instrumentasi tahap-tahap satu rerun: waktu, peak memori dan jumlah baris.
+
+Setiap rerun halaman punya satu ``RerunRecorder``; kode app membungkus
+tahap-tahapnya dengan ``recorder.stage(...)``. Rerun fragment setelah
+rerun halaman selesai mendapat recorder sendiri (``fragment_rerun``) yang
+merujuk rerun halamannya. Hasilnya ditampilkan di panel debug sidebar dan
+dikirim sebagai log JSON (satu baris per rerun) ke logger ``smartbiz.perf``. Peak memori memakai ``tracemalloc`` sehingga
+hanya aktif bila diminta (lebih lambat). Mode profil membungkus satu rerun
+dengan cProfile dan menyimpan hasilnya sebagai file ``.prof``.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+from smartbiz.ingest import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger("smartbiz.perf")
+
+DEBUG_ENABLED = os.environ.get("SMARTBIZ_DEBUG") == "1"
+TRACE_MEMORY = os.environ.get("SMARTBIZ_TRACE_MEMORY") == "1"
+PROFILE_DIR = os.environ.get("SMARTBIZ_PROFILE_DIR", os.path.join(DEFAULT_CACHE_DIR, "profiles"))
+PROFILE_TOP = 25
+# Batas tahap yang disimpan per recorder (yang paling lama dibuang)
+MAX_RECORDS = 200
+
+
+def configure_log(target=os.environ.get("SMARTBIZ_PERF_LOG")):
+    """Arahkan log JSON ke file (atau ``-`` untuk stderr). Tanpa target, log
+    mengikuti konfigurasi logging aplikasi seperti logger lain."""
+    if not target or logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+configure_log()
+
+
+@dataclass
+class StageRecord:
+    name: str
+    seconds: float = 0.0
+    rows: int = None
+    peak_bytes: int = None
+
+
+class _MemoryFrame:
+    def __init__(self, base):
+        self.base = base
+        self.peak = base
+
+
+class RerunRecorder:
+    """Catatan tahap untuk satu rerun halaman ``page``, atau satu rerun
+    fragment bila ``parent_id`` (rerun halaman asalnya) diisi."""
+
+    def __init__(self, page, trace_memory=TRACE_MEMORY, parent_id=None):
+        self.page = page
+        self.rerun_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.started = time.time()
+        self.trace_memory = trace_memory
+        self.records = deque(maxlen=MAX_RECORDS)
+        self.finished = False
+        self._memory_stack = []
+        self._owns_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Ukur satu tahap. Jumlah baris bisa diisi belakangan lewat
+        ``record.rows`` bila baru diketahui di dalam blok."""
+        record = StageRecord(name, rows=rows)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._enter_memory()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if tracing:
+                record.peak_bytes = self._exit_memory()
+            self.records.append(record)
+
+    def fragment_rerun(self):
+        """Recorder baru untuk satu rerun fragment, dipakai setelah rerun
+        halaman ini selesai; tahapnya tidak ikut ditumpuk ke rerun ini."""
+        return RerunRecorder(self.page, self.trace_memory, parent_id=self.parent_id or self.rerun_id)
+
+    def _enter_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_stack:
+            parent = self._memory_stack[-1]
+            parent.peak = max(parent.peak, peak)
+        tracemalloc.reset_peak()
+        self._memory_stack.append(_MemoryFrame(current))
+
+    def _exit_memory(self):
+        frame = self._memory_stack.pop()
+        peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        if self._memory_stack:
+            # Tahap bersarang: peak anak juga peak induknya
+            self._memory_stack[-1].peak = max(self._memory_stack[-1].peak, peak)
+        return peak - frame.base
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc):
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self.finished = True
+        self._log(self.records, event="fragment" if self.parent_id else "rerun")
+        return False
+
+    @property
+    def total_seconds(self):
+        return sum(record.seconds for record in self.records)
+
+    def _log(self, records, event):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(json.dumps({
+            "event": event,
+            "rerun_id": self.rerun_id,
+            "parent_rerun_id": self.parent_id,
+            "page": self.page,
+            "timestamp": round(self.started, 3),
+            "stages": [asdict(record) for record in records],
+        }, default=str))
+
+    def to_frame(self):
+        """Tabel tahap untuk panel debug."""
+        return pd.DataFrame({
+            "Tahap": [record.name for record in self.records],
+            "Detik": [record.seconds for record in self.records],
+            "Baris": pd.array([record.rows for record in self.records], dtype="Int64"),
+            "Peak MiB": [
+                record.peak_bytes / 1024 ** 2 if record.peak_bytes is not None else None for record in self.records
+            ],
+        })
+
+
+@contextmanager
+def profiling(label, profile_dir=PROFILE_DIR):
+    """Profil blok dengan cProfile. Dict yang di-yield diisi saat blok selesai
+    (juga bila dihentikan exception, mis. ``st.rerun``): ``path`` file
+    ``.prof`` dan ``summary`` fungsi dengan waktu kumulatif terbesar."""
+    result = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        result["path"] = os.path.join(profile_dir, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(result["path"])
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        result["summary"] = summary.getvalue()
@@ -0,0 +1,223 @@
+"""Mesin agregasi dashboard: semua metrik dihitung dari satu lintasan data.
+
+Semua agregat (produk, customer, kategori, harian, bulanan, hari dalam
+minggu, Pareto) dihitung dengan ``np.bincount`` di atas kode kategori dan
+kode tanggal integer, jadi tidak ada groupby berulang atau kolom string
+per baris.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+PARETO_THRESHOLD = 0.8
+# Kolom opsional berisi jumlah transaksi per baris (dipakai data pra-agregasi)
+COUNT_COLUMN = "n"
+
+
+@dataclass
+class ParetoResult:
+    table: pd.DataFrame      # kolom: <nama>, Total, Persen
+    count: int
+    grand_total: float
+
+
+@dataclass
+class DashboardMetrics:
+    total_omset: float
+    total_order: int
+    total_customer: int
+    aov: float
+    unique_products: int
+    produk: pd.DataFrame     # Nama Produk, Total, Jumlah (urut nama)
+    customer: pd.DataFrame   # Nama Customer, Total (urut nama)
+    kategori: pd.DataFrame   # Kategori, Jumlah = jumlah transaksi (urut terbanyak)
+    daily: pd.DataFrame      # Tanggal, Jumlah
+    monthly: pd.DataFrame    # Bulan (YYYY-MM), Jumlah
+    weekday: pd.DataFrame    # Hari, Jumlah = rata-rata order per transaksi
+    pareto_produk: ParetoResult
+    pareto_customer: ParetoResult
+
+    @property
+    def empty(self):
+        return self.total_order == 0
+
+    def top_products(self, by, n=None):
+        top = self.produk.sort_values(by, ascending=False, kind="stable")
+        return top if n is None else top.head(n)
+
+    def top_customers(self, n=None):
+        top = self.customer.sort_values("Total", ascending=False, kind="stable")
+        return top if n is None else top.head(n)
+
+    @property
+    def bulan_tertinggi(self):
+        if self.monthly.empty:
+            return None
+        return self.monthly.loc[self.monthly["Jumlah"].idxmax(), "Bulan"]
+
+    @property
+    def top_kategori(self):
+        return None if self.kategori.empty else self.kategori["Kategori"].iloc[0]
+
+    def busiest_day(self):
+        """(nama hari, rata-rata order) untuk hari tersibuk, atau (None, 0)."""
+        valid = self.weekday.dropna(subset=["Jumlah"])
+        if valid.empty:
+            return None, 0
+        row = valid.loc[valid["Jumlah"].idxmax()]
+        return row["Hari"], row["Jumlah"]
+
+    def quietest_day(self):
+        valid = self.weekday.dropna(subset=["Jumlah"])
+        if valid.empty:
+            return None
+        return valid.loc[valid["Jumlah"].idxmin(), "Hari"]
+
+    @property
+    def avg_weekday_order(self):
+        return self.weekday["Jumlah"].mean() if self.weekday["Jumlah"].notna().any() else 0
+
+
+def _codes(series):
+    """Kode integer + label; nilai kosong dipetakan ke bucket ekstra di akhir."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, labels = series.cat.codes.to_numpy().astype("int64"), series.cat.categories
+    else:
+        codes, labels = pd.factorize(series, sort=True)
+    codes = np.where(codes < 0, len(labels), codes)
+    return codes, np.asarray(labels)
+
+
+def _group(series, n, *values):
+    """Satu lintasan bincount per kunci: (label, jumlah transaksi, [jumlah nilai])."""
+    codes, labels = _codes(series)
+    size = len(labels) + 1
+    counts = np.bincount(codes, weights=n, minlength=size)[:-1]
+    seen = counts > 0
+    sums = [_sum_by(codes, v, size)[:-1][seen] for v in values]
+    return labels[seen], counts[seen].astype("int64"), sums
+
+
+def _sum_by(codes, values, size):
+    sums = np.bincount(codes, weights=values, minlength=size)
+    if np.issubdtype(values.dtype, np.integer):
+        sums = sums.round().astype("int64")
+    return sums
+
+
+def _pareto(names, totals, label, threshold=PARETO_THRESHOLD):
+    order = np.argsort(-totals, kind="stable")
+    names, totals = names[order], totals[order]
+    grand_total = totals.sum()
+    cum_pct = totals.cumsum() / grand_total if grand_total else np.zeros(len(totals))
+    keep = cum_pct <= threshold
+    persen = totals[keep] / grand_total * 100 if grand_total else np.zeros(int(keep.sum()))
+    table = pd.DataFrame({label: names[keep], "Total": totals[keep], "Persen": persen})
+    return ParetoResult(table=table, count=len(table), grand_total=grand_total)
+
+
+def _time_patterns(dates, n, jumlah):
+    """Order harian, bulanan (YYYY-MM) serta jumlah transaksi & order per hari
+    dalam minggu (Senin dulu); tanggal kosong (NaT) tidak ikut dihitung."""
+    has_date = ~np.isnat(dates)
+    if not has_date.all():
+        dates, n_t, jumlah_t = dates[has_date], n[has_date], jumlah[has_date]
+    else:
+        n_t, jumlah_t = n, jumlah
+    days = dates.astype("datetime64[D]").astype("int64")
+    if len(days):
+        day_offset = days - days.min()
+        day_n = np.bincount(day_offset, weights=n_t)
+        day_qty = _sum_by(day_offset, jumlah_t, len(day_n))
+        day_seen = day_n > 0
+        daily = pd.DataFrame({
+            "Tanggal": (np.flatnonzero(day_seen) + days.min()).astype("datetime64[D]").astype("datetime64[ns]"),
+            "Jumlah": day_qty[day_seen],
+        })
+
+        months = dates.astype("datetime64[M]").astype("int64")
+        month_offset = months - months.min()
+        month_n = np.bincount(month_offset, weights=n_t)
+        month_qty = _sum_by(month_offset, jumlah_t, len(month_n))
+        month_seen = month_n > 0
+        month_labels = (np.flatnonzero(month_seen) + months.min()).astype("datetime64[M]").astype(str)
+        monthly = pd.DataFrame({"Bulan": month_labels, "Jumlah": month_qty[month_seen]})
+
+        # 1970-01-01 adalah hari Kamis → (hari + 3) % 7 memberi Senin = 0
+        weekday_codes = (days + 3) % 7
+        wd_n = np.bincount(weekday_codes, weights=n_t, minlength=7)
+        wd_qty = np.bincount(weekday_codes, weights=jumlah_t, minlength=7)
+    else:
+        daily = pd.DataFrame({"Tanggal": pd.Series(dtype="datetime64[ns]"), "Jumlah": pd.Series(dtype="int64")})
+        monthly = pd.DataFrame({"Bulan": pd.Series(dtype=str), "Jumlah": pd.Series(dtype="int64")})
+        wd_n, wd_qty = np.zeros(7), np.zeros(7)
+    return daily, monthly, wd_n, wd_qty
+
+
+def weekday_average(wd_n, wd_qty):
+    """Rata-rata order per transaksi tiap hari dalam minggu (NaN bila kosong)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(wd_n > 0, wd_qty / wd_n, np.nan)
+
+
+def compute_metrics(df):
+    """Hitung seluruh metrik dashboard dari ``df`` (baris transaksi atau hasil
+    pra-agregasi dengan kolom ``n``)."""
+    total = df["Total"].to_numpy()
+    jumlah = df["Jumlah"].to_numpy()
+    if COUNT_COLUMN in df.columns:
+        n = df[COUNT_COLUMN].to_numpy().astype("int64")
+    else:
+        n = np.ones(len(df), dtype="int64")
+    total_order = int(n.sum())
+
+    # --- Produk, customer, kategori (kode kategori → bincount)
+    prod_names, _, (prod_total, prod_qty) = _group(df["Nama Produk"], n, total, jumlah)
+    produk = pd.DataFrame({"Nama Produk": prod_names, "Total": prod_total, "Jumlah": prod_qty})
+
+    cust_names, _, (cust_total,) = _group(df["Nama Customer"], n, total)
+    customer = pd.DataFrame({"Nama Customer": cust_names, "Total": cust_total})
+
+    cat_names, cat_n, _ = _group(df["Kategori"], n)
+    kategori = pd.DataFrame({"Kategori": cat_names, "Jumlah": cat_n}).sort_values(
+        "Jumlah", ascending=False, kind="stable", ignore_index=True
+    )
+
+    # --- Pola waktu (kode hari/bulan integer, bukan string per baris)
+    daily, monthly, wd_n, wd_qty = _time_patterns(df["Tanggal"].to_numpy(), n, jumlah)
+
+    return assemble_metrics(
+        total.sum(), total_order, produk, customer, kategori, daily, monthly, weekday_average(wd_n, wd_qty)
+    )
+
+
+def assemble_metrics(total_omset, total_order, produk, customer, kategori, daily, monthly, weekday_avg):
+    """Rakit ``DashboardMetrics`` dari hasil agregasi (dipakai juga oleh
+    backend SQL). ``weekday_avg``: 7 nilai rata-rata order, Senin dulu."""
+    return DashboardMetrics(
+        total_omset=total_omset,
+        total_order=total_order,
+        total_customer=len(customer),
+        aov=total_omset / total_order if total_order else 0,
+        unique_products=len(produk),
+        produk=produk,
+        customer=customer,
+        kategori=kategori,
+        daily=daily,
+        monthly=monthly,
+        weekday=pd.DataFrame({"Hari": WEEKDAY_NAMES, "Jumlah": weekday_avg}),
+        pareto_produk=_pareto(produk["Nama Produk"].to_numpy(), produk["Total"].to_numpy(), "Nama Produk"),
+        pareto_customer=_pareto(customer["Nama Customer"].to_numpy(), customer["Total"].to_numpy(), "Nama Customer"),
+    )
+
+
+def pareto_display(pareto):
+    """Versi tabel Pareto untuk ditampilkan: Omset dibulatkan, persen 1 desimal."""
+    label = pareto.table.columns[0]
+    return pd.DataFrame({
+        label: pareto.table[label],
+        "Omset": pareto.table["Total"].round(0).astype(int),
+        "%": pareto.table["Persen"].round(1),
+    })
@@ -0,0 +1,164 @@
+"""Upload beberapa file sekaligus (mis. satu file per bulan/outlet).
+
+Setiap file diparse, divalidasi dan dinormalisasi di process pool secara
+paralel, lalu digabung jadi satu dataset bertipe ringkas yang terurut
+`Tanggal`. Baris yang sama persis di lebih dari satu file (ekspor yang
+tumpang tindih) dideteksi lewat hash per baris. Kolom tambahan di luar
+kolom wajib tetap dipertahankan (gabungan kolom semua file; sel dari file
+yang tidak punya kolom tersebut dibiarkan kosong).
+"""
+import logging
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from smartbiz.ingest import MissingColumnsError, content_hash, get_default_cache, load_transactions
+from smartbiz.normalize import NAME_COLUMNS, NUMERIC_COLUMNS, concat_numeric, memory_usage
+from smartbiz.quality import QualityReport
+from smartbiz.workers import get_pool, reset_pool
+
+logger = logging.getLogger(__name__)
+
+
+class FileColumnsError(MissingColumnsError):
+    """Kolom wajib tidak lengkap pada salah satu file upload."""
+
+    def __init__(self, filename, missing):
+        super().__init__(missing)
+        self.filename = filename
+        self.args = (f"{filename}: {self.args[0]}",)
+
+    def __reduce__(self):
+        # Dikirim balik dari worker lewat pickle
+        return FileColumnsError, (self.filename, self.missing)
+
+
+@dataclass
+class MergeReport:
+    rows_per_file: dict = field(default_factory=dict)
+    # Baris kembar di dalam satu file tetap dipertahankan (bisa transaksi sah)
+    duplicates_within: int = 0
+    # Baris yang sudah ada di file sebelumnya; dibuang bila ``drop_overlap``
+    duplicates_across: int = 0
+    dropped: int = 0
+
+
+def _load_one(data, filename):
+    # Dijalankan di worker; cache snapshot di disk ikut dipakai lintas proses.
+    # Cache memori worker tidak diisi: proses induk hanya butuh hasil pickle,
+    # dan pool bersama hidup lama sehingga memori itu tidak pernah dilepas
+    try:
+        return load_transactions(data, filename, memory=False)
+    except MissingColumnsError as e:
+        raise FileColumnsError(filename, e.missing) from None
+
+
+def row_hashes(df):
+    """Hash 64-bit per baris. Kolom dinormalisasi dulu supaya file dengan tipe
+    berbeda (mis. `Harga` int vs float) tetap menghasilkan hash yang sama."""
+    hashed = pd.DataFrame({"Tanggal": df["Tanggal"].astype("datetime64[us]")})
+    for col in NAME_COLUMNS:
+        hashed[col] = df[col]
+    for col in NUMERIC_COLUMNS:
+        hashed[col] = df[col].astype("float64")
+    return pd.util.hash_pandas_object(hashed, index=False).to_numpy()
+
+
+def _extra_columns(frames):
+    # Kolom di luar kolom wajib, urut kemunculan pertama di file-file upload
+    required = {"Tanggal", *NAME_COLUMNS, *NUMERIC_COLUMNS}
+    return list(dict.fromkeys(col for df in frames for col in df.columns if col not in required))
+
+
+def concat_transactions(frames):
+    """Sambung beberapa DataFrame ternormalisasi (masing-masing terurut
+    `Tanggal`) jadi satu dataset bertipe ringkas yang terurut `Tanggal`."""
+    columns = {"Tanggal": pd.concat([df["Tanggal"].astype("datetime64[us]") for df in frames], ignore_index=True)}
+    for col in NAME_COLUMNS:
+        # Gabung kategori per file tanpa kembali ke string
+        columns[col] = pd.Series(union_categoricals([df[col] for df in frames], sort_categories=True, ignore_order=True))
+    for col in NUMERIC_COLUMNS:
+        columns[col] = concat_numeric([df[col] for df in frames])
+    for col in _extra_columns(frames):
+        columns[col] = pd.concat(
+            [df[col] if col in df.columns else pd.Series(np.nan, index=df.index) for df in frames],
+            ignore_index=True,
+        )
+    combined = pd.DataFrame(columns)
+
+    dates = combined["Tanggal"].to_numpy()
+    if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+        # Tiap bagian sudah terurut; sort stabil atas run terurut ini murah
+        order = np.argsort(dates, kind="stable")
+        combined = combined.iloc[order].reset_index(drop=True)
+    return combined
+
+
+def combine_frames(frames, drop_overlap=True):
+    """Gabungkan DataFrame ternormalisasi (urutan file dipertahankan) jadi
+    satu dataset terurut `Tanggal`. Kembalikan (df, MergeReport)."""
+    report = MergeReport()
+    quality = QualityReport()
+    seen = np.empty(0, dtype="uint64")
+    kept = []
+    for name, df in frames:
+        quality.merge(QualityReport.from_dict(df.attrs.get("quality_report")), source=name)
+        hashes = row_hashes(df)
+        report.rows_per_file[name] = len(df)
+        report.duplicates_within += int(pd.Series(hashes).duplicated().sum())
+        overlap = np.isin(hashes, seen)
+        report.duplicates_across += int(overlap.sum())
+        if drop_overlap and overlap.any():
+            df = df[~overlap]
+            report.dropped += int(overlap.sum())
+        seen = np.union1d(seen, hashes)
+        kept.append(df)
+
+    before = sum(df.attrs.get("memory_report", {}).get("before", memory_usage(df)) for _, df in frames)
+    combined = concat_transactions(kept)
+    combined.attrs["memory_report"] = {"before": before, "after": memory_usage(combined)}
+    combined.attrs["quality_report"] = asdict(quality)
+    return combined, report
+
+
+def load_many(files, drop_overlap=True, cache=None, progress=None):
+    """Muat beberapa file [(nama, bytes)] secara paralel. Kembalikan
+    (key, df, MergeReport); key dataset gabungan diturunkan dari hash tiap
+    file, jadi upload ulang file yang sama langsung memakai cache.
+    ``progress`` dipanggil dengan (file selesai, total file)."""
+    cache = cache or get_default_cache()
+    file_keys = [content_hash(data) for _, data in files]
+    key = content_hash(f"multi:{int(drop_overlap)}:{','.join(file_keys)}".encode("utf-8"))
+    df = cache.get(key)
+    if df is not None:
+        return key, df, MergeReport(**df.attrs.get("merge_report", {}))
+
+    futures = {}
+    frames = [None] * len(files)
+    try:
+        pool = get_pool()
+        for i, (name, data) in enumerate(files):
+            futures[pool.submit(_load_one, data, name)] = i
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            frames[i] = (files[i][0], future.result()[1])
+            if progress:
+                progress(done, len(files))
+    except BrokenProcessPool:
+        # Pool bersama dibuang supaya upload berikutnya memakai pool baru
+        logger.warning("Process pool parsing file rusak, dibuat ulang pada permintaan berikutnya", exc_info=True)
+        reset_pool()
+        raise
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    df, report = combine_frames(frames, drop_overlap)
+    df.attrs["merge_report"] = asdict(report)
+    df = cache.put(key, df)
+    return key, df, report
@@ -0,0 +1,63 @@
+"""Normalisasi sekali jalan saat upload: tipe data ringkas + urut tanggal."""
+from dataclasses import asdict
+
+import pandas as pd
+
+from smartbiz.quality import NAME_COLUMNS, clean_transactions
+
+NUMERIC_COLUMNS = ["Jumlah", "Harga", "Total"]
+
+
+def memory_usage(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def downcast_numeric(series):
+    series = pd.to_numeric(series)
+    if pd.api.types.is_float_dtype(series) and series.notna().all() and (series % 1 == 0).all():
+        # Angka bulat yang terbaca sebagai float (mis. dari Excel) aman dijadikan integer
+        series = series.astype("int64")
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    # Float dibiarkan float64: float32 tidak cukup presisi untuk nominal rupiah
+    return series
+
+
+def concat_numeric(parts):
+    """Sambung kolom numerik yang masing-masing sudah di-downcast. Bila semuanya
+    integer, tipe hasil promosi numpy sudah minimal, jadi nilai tidak perlu
+    di-scan ulang."""
+    combined = pd.concat(parts, ignore_index=True)
+    if all(pd.api.types.is_integer_dtype(part) for part in parts):
+        return combined
+    return downcast_numeric(combined)
+
+
+def normalize_transactions(df):
+    """Bersihkan data (lihat ``smartbiz.quality``), urutkan sekali, ubah kolom
+    nama jadi `category` dan perkecil kolom numerik. Laporan memori dan
+    kualitas data disimpan di ``df.attrs``."""
+    before = memory_usage(df)
+    df, quality = clean_transactions(df)
+
+    out = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        if col == "Tanggal":
+            out[col] = pd.to_datetime(df[col])
+        elif col in NAME_COLUMNS:
+            out[col] = df[col].astype("category")
+        elif col in NUMERIC_COLUMNS:
+            out[col] = downcast_numeric(df[col])
+        else:
+            out[col] = df[col]
+
+    out.sort_values("Tanggal", inplace=True, kind="stable", ignore_index=True)
+    out.attrs["memory_report"] = {"before": before, "after": memory_usage(out)}
+    out.attrs["quality_report"] = asdict(quality)
+    return out
+
+
+def format_memory_report(report):
+    before, after = report["before"], report["after"]
+    ratio = before / after if after else 0
+    return f"{before / 1024 ** 2:,.2f} MB → {after / 1024 ** 2:,.2f} MB ({ratio:.1f}x lebih hemat)"
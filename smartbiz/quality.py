@@ -0,0 +1,155 @@
+"""Pemeriksaan kualitas data sekali jalan saat upload.
+
+Semua pengecekan berupa operasi vektor atas seluruh kolom:
+
+- `Tanggal` kosong atau tidak bisa dibaca sebagai tanggal → baris dibuang
+- `Jumlah` / `Harga` / `Total` kosong → baris dibuang
+- `Jumlah` / `Harga` / `Total` yang terisi tapi bukan angka → baris dibuang
+- `Jumlah` negatif → baris dibuang
+- `Total` ≠ `Jumlah × Harga` → hanya ditandai; `Total` asli tetap dipakai
+  (selisih bisa berupa diskon atau ongkir yang sah)
+- `Nama Customer` / `Nama Produk` / `Kategori` kosong → hanya ditandai;
+  baris tetap ikut omset & jumlah order, tapi tidak punya nama di tabel
+  per produk/customer/kategori
+
+Hasilnya dataset bersih (tipe `Tanggal` dan kolom numerik sudah benar)
+plus ``QualityReport`` yang ikut disimpan di snapshot cache, sehingga
+parsing dan validasi ini tidak pernah diulang di dashboard.
+"""
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+import pandas as pd
+
+QUANTITY_COLUMNS = ["Jumlah", "Harga", "Total"]
+NAME_COLUMNS = ["Nama Customer", "Nama Produk", "Kategori"]
+# Selisih Total di bawah ini dianggap pembulatan, bukan salah input
+TOTAL_TOLERANCE = 0.5
+MAX_EXAMPLES = 5
+# Jenis masalah → (label, tindakan pada baris tersebut)
+ISSUES = {
+    "missing_dates": ("Tanggal kosong", "dibuang"),
+    "invalid_dates": ("Tanggal tidak valid", "dibuang"),
+    "missing_numbers": ("Jumlah/Harga/Total kosong", "dibuang"),
+    "invalid_numbers": ("Jumlah/Harga/Total bukan angka", "dibuang"),
+    "negative_quantity": ("Jumlah negatif", "dibuang"),
+    "total_mismatch": ("Total ≠ Jumlah × Harga", "ditandai, Total asli dipakai"),
+    "missing_names": ("Nama Customer/Produk/Kategori kosong", "ditandai"),
+}
+
+
+@dataclass
+class QualityReport:
+    rows: int = 0
+    missing_dates: int = 0
+    invalid_dates: int = 0
+    missing_numbers: int = 0
+    invalid_numbers: int = 0
+    negative_quantity: int = 0
+    total_mismatch: int = 0
+    missing_names: int = 0
+    dropped: int = 0
+    # Nomor baris data (1 = baris pertama setelah header) contoh per masalah
+    examples: dict = field(default_factory=dict)
+
+    @property
+    def has_issues(self):
+        return any(getattr(self, issue) for issue in ISSUES)
+
+    def issues(self):
+        """[(label, tindakan, jumlah baris, contoh nomor baris)] untuk masalah yang ditemukan."""
+        return [
+            (label, action, getattr(self, issue), self.examples.get(issue, []))
+            for issue, (label, action) in ISSUES.items() if getattr(self, issue)
+        ]
+
+    def merge(self, other, row_offset=0, source=None):
+        """Gabungkan laporan chunk/file berikutnya. Nomor baris contoh di
+        ``other`` digeser ``row_offset``; dengan ``source`` (nama file)
+        contohnya ditulis sebagai "nama file:baris"."""
+        for f in fields(self):
+            if f.name != "examples":
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        for issue, rows in other.examples.items():
+            kept = self.examples.setdefault(issue, [])
+            for row in rows[:MAX_EXAMPLES - len(kept)]:
+                kept.append(f"{source}:{row}" if source else row + row_offset)
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data) if data else cls()
+
+
+def _parse_dates(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    # Format ditebak dari baris pertama (cepat); baris yang gagal dicoba lagi
+    # satu per satu dengan format campuran sebelum dianggap tidak valid
+    dates = pd.to_datetime(values, errors="coerce")
+    retry = dates.isna() & values.notna()
+    if retry.any():
+        dates = dates.copy()
+        dates[retry] = pd.to_datetime(values[retry], errors="coerce", format="mixed").astype(dates.dtype)
+    return dates
+
+
+def _examples(mask):
+    return (np.flatnonzero(mask)[:MAX_EXAMPLES] + 1).tolist()
+
+
+def clean_transactions(df):
+    """Kembalikan (df bersih, QualityReport). ``Tanggal`` jadi datetime dan
+    kolom numerik jadi angka; kolom lain tidak disentuh."""
+    report = QualityReport(rows=len(df))
+    out = df.copy(deep=False)
+
+    out["Tanggal"] = _parse_dates(df["Tanggal"])
+    # Tanggal kosong juga dibuang: tanpa tanggal baris tidak masuk cube/metrik,
+    # jadi tabel baris pun tidak boleh memuatnya
+    no_date = out["Tanggal"].isna().to_numpy()
+    missing_date = no_date & df["Tanggal"].isna().to_numpy()
+    bad_date = no_date & ~missing_date
+
+    missing_number = np.zeros(len(df), dtype=bool)
+    bad_number = np.zeros(len(df), dtype=bool)
+    for col in QUANTITY_COLUMNS:
+        out[col] = pd.to_numeric(df[col], errors="coerce")
+        blank = df[col].isna().to_numpy()
+        missing_number |= blank
+        bad_number |= out[col].isna().to_numpy() & ~blank
+    missing_name = np.zeros(len(df), dtype=bool)
+    for col in NAME_COLUMNS:
+        missing_name |= df[col].isna().to_numpy()
+
+    jumlah = out["Jumlah"].to_numpy(dtype="float64")
+    harga = out["Harga"].to_numpy(dtype="float64")
+    total = out["Total"].to_numpy(dtype="float64")
+    with np.errstate(invalid="ignore"):
+        negative = jumlah < 0
+        expected = jumlah * harga
+        mismatch = np.abs(total - expected) > TOTAL_TOLERANCE
+
+    drop = no_date | missing_number | bad_number | negative
+    mismatch &= ~drop
+    missing_name &= ~drop
+    for issue, mask in [("missing_dates", missing_date), ("invalid_dates", bad_date),
+                        ("missing_numbers", missing_number), ("invalid_numbers", bad_number),
+                        ("negative_quantity", negative), ("total_mismatch", mismatch), ("missing_names", missing_name)]:
+        count = int(mask.sum())
+        setattr(report, issue, count)
+        if count:
+            report.examples[issue] = _examples(mask)
+
+    if drop.any():
+        report.dropped = int(drop.sum())
+        out = out[~drop].reset_index(drop=True)
+    return out, report
+
+
+def format_quality_report(report):
+    """Ringkasan satu baris untuk caption upload."""
+    if not report.has_issues:
+        return f"{report.rows:,} baris lolos pemeriksaan kualitas data"
+    parts = [f"{label}: {count:,} ({action})" for label, action, count, _ in report.issues()]
+    return "; ".join(parts)
@@ -0,0 +1,189 @@
+"""Renderer laporan HTML "Business Summary Report".
+
+Template (``templates/report.html``) dibaca dan dikompilasi sekali saat
+modul di-import. Isi tabel Pareto dirender per kolom (format angka dan
+escape HTML berjalan sebagai kernel pyarrow.compute), lalu hasilnya dikirim
+per chunk sehingga file unduhan bisa ditulis bertahap tanpa membangun
+satu string raksasa.
+"""
+import html
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from string import Template
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from smartbiz.assets import TEMPLATE_DIR
+from smartbiz.chart_images import chart_tag
+
+CHUNK_ROWS = 20_000
+# Preview di halaman dibatasi; file unduhan selalu berisi semua baris
+PREVIEW_ROWS = 500
+
+_ROWS_SLOT = re.compile(r"\$(\w+_rows)")
+
+
+def _compile_template(name):
+    """Potong template di slot ``$<nama>_rows`` menjadi daftar bagian:
+    ("text", Template) untuk teks statis dan ("rows", nama) untuk isi tabel."""
+    with open(os.path.join(TEMPLATE_DIR, name), encoding="utf-8") as f:
+        pieces = _ROWS_SLOT.split(f.read())
+    parts = []
+    for i, piece in enumerate(pieces):
+        parts.append(("rows", piece) if i % 2 else ("text", Template(piece)))
+    return parts
+
+
+REPORT_TEMPLATE = _compile_template("report.html")
+
+
+# ---------- FORMAT VEKTORISASI ---------- #
+# Semua format berjalan sebagai kernel pyarrow.compute di atas satu kolom
+# sekaligus; tidak ada loop Python per baris.
+_HTML_ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+
+
+def escape_html(values):
+    """Setara ``html.escape`` per elemen. Kolom kategori cukup di-escape di
+    level label, lalu di-expand lewat kode."""
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        labels = escape_html(values.cat.categories.astype(str))
+        # Kode -1 (nilai kosong) ditulis "nan" seperti f-string biasa
+        labels = pa.concat_arrays([labels, pa.array(["nan"])])
+        codes = values.cat.codes.to_numpy().astype("int64")
+        return labels.take(pa.array(np.where(codes < 0, len(labels) - 1, codes)))
+    text = pa.array(pd.Series(values).astype(str).to_numpy(dtype=object), type=pa.string())
+    for char, entity in _HTML_ENTITIES:
+        text = pc.replace_substring(text, char, entity)
+    return text
+
+
+def format_thousands(values):
+    """Setara ``f"{v:,.0f}"`` per elemen: digit dipotong per 3 dari kanan
+    lalu disambung dengan koma."""
+    ints = np.rint(np.asarray(values, dtype="float64")).astype("int64")
+    digits = pc.cast(pa.array(np.abs(ints)), pa.string())
+    text = pc.utf8_slice_codeunits(digits, -3)
+    n_groups = -(-len(str(int(np.abs(ints).max()))) // 3) if len(ints) else 0
+    for k in range(1, n_groups):
+        group = pc.utf8_slice_codeunits(digits, -3 * (k + 1), -3 * k)
+        text = pc.binary_join_element_wise(group, text, ",")
+    # Baris dengan grup lebih sedikit menyisakan koma di depan
+    text = pc.utf8_ltrim(text, ",")
+    return pc.if_else(pa.array(ints < 0), pc.binary_join_element_wise("-", text, ""), text)
+
+
+def format_fixed1(values):
+    """Setara ``f"{v:.1f}"`` per elemen."""
+    tenths = np.rint(np.asarray(values, dtype="float64") * 10).astype("int64")
+    whole = pc.cast(pa.array(np.abs(tenths) // 10), pa.string())
+    frac = pc.cast(pa.array(np.abs(tenths) % 10), pa.string())
+    text = pc.binary_join_element_wise(whole, frac, ".")
+    return pc.if_else(pa.array(tenths < 0), pc.binary_join_element_wise("-", text, ""), text)
+
+
+def render_table_rows(table):
+    """Render baris ``<tr>`` tabel Pareto (kolom: nama, Total, Persen)."""
+    if table.empty:
+        return ""
+    rows = pc.binary_join_element_wise(
+        "<tr><td>", escape_html(table.iloc[:, 0]),
+        "</td><td>Rp ", format_thousands(table["Total"]),
+        "</td><td>", format_fixed1(table["Persen"]), "%</td></tr>",
+        "",
+    )
+    # Gabung seluruh baris jadi satu string di sisi Arrow
+    joined = pa.ListArray.from_arrays(pa.array([0, len(rows)], pa.int32()), rows)
+    return pc.binary_join(joined, "")[0].as_py()
+
+
+def iter_table_rows(table, max_rows=None, chunk_rows=CHUNK_ROWS):
+    shown = table if max_rows is None else table.iloc[:max_rows]
+    for start in range(0, len(shown), chunk_rows):
+        yield render_table_rows(shown.iloc[start:start + chunk_rows])
+    hidden = len(table) - len(shown)
+    if hidden > 0:
+        yield f'<tr><td colspan="3"><i>… {hidden:,} baris lainnya ada di file unduhan</i></td></tr>'
+
+
+# ---------- LAPORAN ---------- #
+def report_context(info, metrics, start_date, end_date):
+    top_produk = metrics.top_products("Total", 1)["Nama Produk"].tolist()
+    hari_terbanyak, hari_tersibuk_value = metrics.busiest_day()
+    context = {
+        "nama": info['nama'],
+        "jenis": info['jenis'],
+        "tahun": info['tahun'],
+        "usia": datetime.now().year - int(info['tahun']),
+        "start_date": start_date.date(),
+        "end_date": end_date.date(),
+        "total_transaksi": metrics.total_order,
+        "total_omset": f"{metrics.total_omset:,.0f}",
+        "avg_order": f"{metrics.aov:,.0f}",
+        "total_customer": metrics.total_customer,
+        "produk_terlaris": top_produk[0] if top_produk else "-",
+        "top_produk_jumlah": ', '.join(metrics.top_products("Jumlah", 3)["Nama Produk"].tolist()) or "-",
+        "bulan_tertinggi": metrics.bulan_tertinggi or "-",
+        "hari_terbanyak": hari_terbanyak or "-",
+        "hari_tersibuk_value": f"{hari_tersibuk_value:.1f}",
+        "hari_tersepi": metrics.quietest_day() or "-",
+    }
+    return {name: html.escape(str(value)) for name, value in context.items()}
+
+
+def chart_section(images):
+    """Section grafik dari {nama: png atau HTML interaktif}; kosong bila tidak ada grafik."""
+    if not images:
+        return ""
+    tags = "\n".join(f"        {chart_tag(chart)}" for chart in images.values())
+    return f'<div class="section">\n        <h2>📈 Grafik Dashboard</h2>\n{tags}\n    </div>\n'
+
+
+def iter_html(context, tables, max_rows=None, chunk_rows=CHUNK_ROWS, template=REPORT_TEMPLATE):
+    for kind, part in template:
+        if kind == "text":
+            yield part.substitute(context)
+        else:
+            yield from iter_table_rows(tables[part], max_rows, chunk_rows)
+
+
+def iter_report(info, metrics, start_date, end_date, max_rows=None, chunk_rows=CHUNK_ROWS, images=None):
+    context = report_context(info, metrics, start_date, end_date)
+    # HTML grafik tidak di-escape: dibangun sendiri dari PNG base64 / Plotly
+    context["charts"] = chart_section(images)
+    tables = {
+        "produk_rows": metrics.pareto_produk.table,
+        "customer_rows": metrics.pareto_customer.table,
+    }
+    return iter_html(context, tables, max_rows, chunk_rows)
+
+
+def render_report(info, metrics, start_date, end_date, max_rows=None, images=None):
+    return "".join(iter_report(info, metrics, start_date, end_date, max_rows, images=images))
+
+
+def export_report(info, metrics, start_date, end_date, images=None):
+    """Tulis laporan lengkap per chunk ke file sementara (pola sama dengan
+    ``table_view.export_csv``)."""
+    out = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+    for chunk in iter_report(info, metrics, start_date, end_date, images=images):
+        out.write(chunk.encode("utf-8"))
+    out.seek(0)
+    return out
+
+
+def save_report(path, info, metrics, start_date, end_date, images=None):
+    """Tulis laporan lengkap per chunk ke ``path``; file baru muncul utuh
+    (ditulis ke file sementara lalu di-rename)."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for chunk in iter_report(info, metrics, start_date, end_date, images=images):
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
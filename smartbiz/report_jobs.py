@@ -0,0 +1,116 @@
+"""Pembuatan laporan HTML di background thread.
+
+Job dikunci dengan hash (dataset, filter, info usaha). Klik ulang dengan
+input yang sama — setelah rerun, atau dari sesi lain — memakai job yang
+sedang berjalan atau artefak yang sudah jadi, tanpa merender ulang. File
+laporan lengkap ditulis ke disk; preview (dibatasi ``PREVIEW_ROWS`` baris)
+disimpan di memori. Pola job sama dengan konversi Excel di
+``smartbiz.excel``.
+
+Tombol unduh yang sudah dirender membaca file laporan saat diklik, jadi job
+(dan filenya) baru dibuang setelah ``REPORT_TTL_SECONDS`` tidak diminta
+sesi mana pun, walaupun jumlahnya sudah melebihi ``MAX_REPORTS``.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from smartbiz.chart_images import is_interactive, render_figures
+from smartbiz.ingest import DEFAULT_CACHE_DIR, content_hash
+from smartbiz.report import PREVIEW_ROWS, render_report, save_report
+
+REPORT_DIR = os.path.join(DEFAULT_CACHE_DIR, "reports")
+MAX_REPORTS = int(os.environ.get("SMARTBIZ_REPORT_CACHE_ENTRIES", "32"))
+REPORT_TTL_SECONDS = int(os.environ.get("SMARTBIZ_REPORT_TTL_SECONDS", "3600"))
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="smartbiz-report")
+_jobs = OrderedDict()  # key → ReportJob (berjalan maupun selesai), urutan LRU
+_jobs_lock = threading.Lock()
+
+
+@dataclass
+class ReportArtifact:
+    path: str
+    preview_html: str
+    charts: int
+    interactive_charts: int = 0  # grafik HTML Plotly (tanpa PNG)
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def report_key(dataset_key, filter_args, info):
+    parts = [dataset_key, repr(filter_args), repr(sorted(info.items()))]
+    return content_hash(":".join(parts).encode("utf-8"))
+
+
+class ReportJob:
+    def __init__(self, key, info, metrics, figures, start_date, end_date):
+        self.key = key
+        self.progress = 0.0
+        self.stage = "Menunggu antrean"
+        self.last_used = time.monotonic()
+        self._future = _executor.submit(self._run, info, metrics, figures, start_date, end_date)
+
+    def _run(self, info, metrics, figures, start_date, end_date):
+        self.progress, self.stage = 0.05, "Merender grafik"
+        images = render_figures(figures)
+        self.progress, self.stage = 0.6, "Menulis laporan lengkap"
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        path = save_report(os.path.join(REPORT_DIR, f"{self.key}.html"), info, metrics, start_date, end_date, images)
+        self.progress, self.stage = 0.9, "Menyiapkan preview"
+        preview_html = render_report(info, metrics, start_date, end_date, max_rows=PREVIEW_ROWS, images=images)
+        self.progress, self.stage = 1.0, "Selesai"
+        interactive = sum(is_interactive(chart) for chart in images.values())
+        return ReportArtifact(path, preview_html, len(images), interactive)
+
+    def done(self):
+        return self._future.done()
+
+    def failed(self):
+        return self.done() and self._future.exception() is not None
+
+    def result(self, timeout=None):
+        return self._future.result(timeout)
+
+
+def find_report(key):
+    """Job untuk ``key`` (berjalan atau selesai), atau None."""
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None:
+            _jobs.move_to_end(key)
+            job.last_used = time.monotonic()
+        return job
+
+
+def submit_report(key, info, metrics, figures, start_date, end_date):
+    """Kembalikan job laporan untuk ``key``; job baru hanya dibuat bila belum
+    ada atau yang lama gagal."""
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None or job.failed():
+            job = ReportJob(key, info, metrics, figures, start_date, end_date)
+            _jobs[key] = job
+        _jobs.move_to_end(key)
+        job.last_used = time.monotonic()
+        _evict()
+    return job
+
+
+def _evict():
+    # Hanya job yang sudah selesai dan tidak diminta selama REPORT_TTL_SECONDS
+    # yang dibuang (beserta file laporannya), yang paling lama dulu
+    expired = time.monotonic() - REPORT_TTL_SECONDS
+    idle = [k for k, job in _jobs.items() if job.done() and job.last_used < expired]
+    for key in idle[:max(len(_jobs) - MAX_REPORTS, 0)]:
+        job = _jobs.pop(key)
+        if not job.failed():
+            try:
+                os.remove(job.result().path)
+            except FileNotFoundError:
+                pass
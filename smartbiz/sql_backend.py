@@ -0,0 +1,315 @@
+"""Backend opsional: transaksi disimpan di database SQLite lokal.
+
+Dataset yang sudah diimpor tetap ada setelah aplikasi restart (tidak perlu
+upload ulang). Filter dan agregasi dashboard dijalankan sebagai query SQL
+ber-index (``Tanggal``, ``Kategori``, ``Nama Customer``), jadi memori per
+sesi hanya sebesar hasil query.
+
+Skema: ``datasets`` (satu baris per dataset), ``transactions`` (baris asli,
+untuk tabel Data Penjualan) dengan ``tanggal`` = mikrodetik sejak epoch dan
+``hari`` = hari sejak epoch, serta ``rollup``: versi SQL dari cube
+(``smartbiz.cube``) pada grain hari × produk × kategori × customer yang
+dibangun sekali saat impor. Semua query metrik berjalan di atas ``rollup``.
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from smartbiz.ingest import DEFAULT_CACHE_DIR
+from smartbiz.metrics import assemble_metrics
+from smartbiz.normalize import NUMERIC_COLUMNS, downcast_numeric
+
+DB_PATH = os.environ.get("SMARTBIZ_SQL_DB", os.path.join(DEFAULT_CACHE_DIR, "smartbiz.sqlite"))
+INSERT_CHUNK_ROWS = 100_000
+US_PER_DAY = 86_400_000_000
+
+# Nama kolom dataset → kolom SQL
+COLUMNS = {
+    "Tanggal": "tanggal",
+    "Nama Customer": "customer",
+    "Nama Produk": "produk",
+    "Kategori": "kategori",
+    "Jumlah": "jumlah",
+    "Harga": "harga",
+    "Total": "total",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT,
+    rows INTEGER,
+    created_at TEXT
+);
+-- Kolom numerik sengaja tanpa tipe: nilai int/float disimpan apa adanya
+CREATE TABLE IF NOT EXISTS transactions (
+    dataset_id INTEGER NOT NULL,
+    tanggal INTEGER,
+    hari INTEGER,
+    customer TEXT,
+    produk TEXT,
+    kategori TEXT,
+    jumlah,
+    harga,
+    total
+);
+CREATE INDEX IF NOT EXISTS idx_tx_hari ON transactions (dataset_id, hari);
+CREATE INDEX IF NOT EXISTS idx_tx_kategori ON transactions (dataset_id, kategori, hari);
+CREATE INDEX IF NOT EXISTS idx_tx_customer ON transactions (dataset_id, customer, hari);
+CREATE TABLE IF NOT EXISTS rollup (
+    dataset_id INTEGER NOT NULL,
+    hari INTEGER,
+    produk TEXT,
+    kategori TEXT,
+    customer TEXT,
+    jumlah,
+    total,
+    n INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_rollup_hari ON rollup (dataset_id, hari);
+CREATE INDEX IF NOT EXISTS idx_rollup_kategori ON rollup (dataset_id, kategori, hari);
+CREATE INDEX IF NOT EXISTS idx_rollup_customer ON rollup (dataset_id, customer, hari);
+"""
+
+
+# Path database yang skemanya sudah dibuat di proses ini
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def _ensure_schema(conn, path):
+    # Mode WAL tersimpan di file database dan DDL memakai IF NOT EXISTS, jadi
+    # cukup sekali per path per proses, bukan di setiap koneksi/query
+    path = os.path.abspath(path)
+    with _init_lock:
+        if path in _initialized:
+            return
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _initialized.add(path)
+
+
+@contextmanager
+def connect(path=DB_PATH):
+    """Koneksi baru per pemakaian (Streamlit menjalankan tiap sesi di thread
+    sendiri); commit bila sukses, rollback bila error, lalu ditutup."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        _ensure_schema(conn, path)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def list_datasets(path=DB_PATH):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["key", "name", "rows", "created_at"])
+    with connect(path) as conn:
+        return pd.read_sql_query("SELECT key, name, rows, created_at FROM datasets ORDER BY created_at DESC", conn)
+
+
+def _column_values(series):
+    """Nilai kolom sebagai list Python (NaN/NaT → None) untuk ``executemany``."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy().astype("datetime64[us]").astype("int64")
+        return [None if missing else int(v) for v, missing in zip(values, series.isna().to_numpy())]
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _chunk_rows(chunk):
+    tanggal = _column_values(chunk["Tanggal"])
+    hari = [None if t is None else t // US_PER_DAY for t in tanggal]
+    columns = [tanggal, hari] + [_column_values(chunk[col]) for col in list(COLUMNS)[1:]]
+    return zip(*columns)
+
+
+class SqlDataset:
+    """Satu dataset di database SQLite, diidentifikasi dengan hash isi file."""
+
+    def __init__(self, key, path=DB_PATH):
+        self.key = key
+        self.path = path
+
+    def _id(self, conn):
+        row = conn.execute("SELECT id FROM datasets WHERE key = ?", (self.key,)).fetchone()
+        return None if row is None else row[0]
+
+    def exists(self):
+        if not os.path.exists(self.path):
+            return False
+        with connect(self.path) as conn:
+            return self._id(conn) is not None
+
+    def import_chunks(self, chunks, name=None):
+        """Impor DataFrame per chunk dalam satu transaksi; dataset yang sudah
+        ada tidak diimpor ulang."""
+        with connect(self.path) as conn:
+            # Kunci tulis sejak awal: dua sesi yang mengimpor file sama tidak dobel
+            conn.execute("BEGIN IMMEDIATE")
+            if self._id(conn) is not None:
+                return self
+            cur = conn.execute(
+                "INSERT INTO datasets (key, name, rows, created_at) VALUES (?, ?, 0, ?)",
+                (self.key, name, datetime.now().isoformat(timespec="seconds")),
+            )
+            dataset_id, total_rows = cur.lastrowid, 0
+            for chunk in chunks:
+                conn.executemany(
+                    "INSERT INTO transactions (dataset_id, tanggal, hari, customer, produk, kategori, jumlah, harga, total) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((dataset_id, *row) for row in _chunk_rows(chunk)),
+                )
+                total_rows += len(chunk)
+            conn.execute(
+                "INSERT INTO rollup (dataset_id, hari, produk, kategori, customer, jumlah, total, n) "
+                "SELECT dataset_id, hari, produk, kategori, customer, SUM(jumlah), SUM(total), COUNT(*) "
+                "FROM transactions WHERE dataset_id = ? GROUP BY hari, produk, kategori, customer",
+                (dataset_id,),
+            )
+            conn.execute("UPDATE datasets SET rows = ? WHERE id = ?", (total_rows, dataset_id))
+        return self
+
+    def import_frame(self, df, name=None):
+        return self.import_chunks(
+            (df.iloc[start:start + INSERT_CHUNK_ROWS] for start in range(0, len(df), INSERT_CHUNK_ROWS)), name
+        )
+
+    def remove(self):
+        with connect(self.path) as conn:
+            dataset_id = self._id(conn)
+            if dataset_id is not None:
+                conn.execute("DELETE FROM transactions WHERE dataset_id = ?", (dataset_id,))
+                conn.execute("DELETE FROM rollup WHERE dataset_id = ?", (dataset_id,))
+                conn.execute("DELETE FROM datasets WHERE id = ?", (dataset_id,))
+
+    # ---------- QUERY ---------- #
+    def where(self, conn, start_date=None, end_date=None, kategori=None, customers=None):
+        """Klausa WHERE + parameter untuk state filter dashboard (semantik sama
+        dengan ``FilterIndex.positions``); berlaku untuk ``transactions``
+        maupun ``rollup``."""
+        clauses, params = ["dataset_id = ?"], [self._id(conn)]
+        if start_date is not None and end_date is not None:
+            clauses.append("hari BETWEEN ? AND ?")
+            params += [_epoch_day(start_date), _epoch_day(end_date)]
+        if kategori is not None:
+            # json_each: daftar nilai sebanyak apa pun cukup satu parameter
+            clauses.append("kategori IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(kategori)))
+        if customers:
+            clauses.append("customer IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(customers)))
+        return " AND ".join(clauses), params
+
+    def date_bounds(self):
+        with connect(self.path) as conn:
+            lo, hi = conn.execute(
+                "SELECT MIN(hari), MAX(hari) FROM rollup WHERE dataset_id = ?", (self._id(conn),)
+            ).fetchone()
+        if lo is None:
+            return None, None
+        return pd.Timestamp(lo, unit="D"), pd.Timestamp(hi, unit="D")
+
+    def labels(self, column):
+        col = COLUMNS[column]
+        with connect(self.path) as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {col} FROM rollup WHERE dataset_id = ? AND {col} IS NOT NULL ORDER BY {col}",
+                (self._id(conn),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def metrics(self, start_date=None, end_date=None, kategori=None, customers=None):
+        """``DashboardMetrics`` dari query agregat; hanya hasil group-by yang
+        dibaca ke memori."""
+        with connect(self.path) as conn:
+            where, params = self.where(conn, start_date, end_date, kategori, customers)
+
+            def query(sql):
+                return pd.read_sql_query(sql.format(where=where), conn, params=params)
+
+            totals = conn.execute(f"SELECT COALESCE(SUM(total), 0), COALESCE(SUM(n), 0) FROM rollup WHERE {where}", params).fetchone()
+            produk = query(
+                'SELECT produk AS "Nama Produk", SUM(total) AS Total, SUM(jumlah) AS Jumlah FROM rollup '
+                "WHERE {where} AND produk IS NOT NULL GROUP BY produk ORDER BY produk"
+            )
+            customer = query(
+                'SELECT customer AS "Nama Customer", SUM(total) AS Total FROM rollup '
+                "WHERE {where} AND customer IS NOT NULL GROUP BY customer ORDER BY customer"
+            )
+            kategori_df = query(
+                "SELECT kategori AS Kategori, SUM(n) AS Jumlah FROM rollup "
+                "WHERE {where} AND kategori IS NOT NULL GROUP BY kategori ORDER BY Jumlah DESC, kategori"
+            )
+            daily = query(
+                "SELECT hari, SUM(jumlah) AS Jumlah FROM rollup "
+                "WHERE {where} AND hari IS NOT NULL GROUP BY hari ORDER BY hari"
+            )
+            monthly = query(
+                "SELECT strftime('%Y-%m', hari * 86400, 'unixepoch') AS Bulan, SUM(jumlah) AS Jumlah FROM rollup "
+                "WHERE {where} AND hari IS NOT NULL GROUP BY Bulan ORDER BY Bulan"
+            )
+            # Modulo SQLite bisa negatif untuk tanggal sebelum 1970, jadi dinormalkan
+            weekday = query(
+                "SELECT ((hari + 3) % 7 + 7) % 7 AS wd, SUM(jumlah) AS qty, SUM(n) AS n FROM rollup "
+                "WHERE {where} AND hari IS NOT NULL GROUP BY wd"
+            )
+
+        daily = pd.DataFrame({
+            "Tanggal": daily["hari"].to_numpy().astype("datetime64[D]").astype("datetime64[ns]"),
+            "Jumlah": daily["Jumlah"].to_numpy(),
+        })
+        weekday_avg = np.full(7, np.nan)
+        weekday_avg[weekday["wd"].to_numpy()] = weekday["qty"].to_numpy() / weekday["n"].to_numpy()
+        return assemble_metrics(totals[0], int(totals[1]), produk, customer, kategori_df, daily, monthly, weekday_avg)
+
+    def daily_rollup(self, column, start_date=None, end_date=None, kategori=None, customers=None):
+        """Jumlah, omset & jumlah transaksi per (hari, ``column``), mis. input
+        analitik customer (``Nama Customer``) atau proyeksi (``Nama Produk``)."""
+        col = COLUMNS[column]
+        with connect(self.path) as conn:
+            where, params = self.where(conn, start_date, end_date, kategori, customers)
+            rollup = pd.read_sql_query(
+                f'SELECT hari, {col} AS "{column}", SUM(jumlah) AS Jumlah, SUM(total) AS Total, SUM(n) AS n '
+                f"FROM rollup WHERE {where} AND hari IS NOT NULL GROUP BY hari, {col} ORDER BY hari",
+                conn, params=params,
+            )
+        rollup.insert(0, "Tanggal", rollup.pop("hari").to_numpy().astype("datetime64[D]").astype("datetime64[ns]"))
+        return rollup
+
+    @staticmethod
+    def read_rows(conn, sql, params):
+        """Baca baris transaksi (kolom seperti dataset asli) dari query
+        ``SELECT`` atas kolom ``COLUMNS``."""
+        return _to_rows(conn.execute(sql, params).fetchall())
+
+    @staticmethod
+    def iter_rows(conn, sql, params, chunk_rows):
+        cursor = conn.execute(sql, params)
+        while True:
+            records = cursor.fetchmany(chunk_rows)
+            if not records:
+                return
+            yield _to_rows(records)
+
+
+def _to_rows(records):
+    raw = pd.DataFrame.from_records(records, columns=list(COLUMNS.values()))
+    rows = pd.DataFrame({"Tanggal": pd.to_datetime(raw["tanggal"], unit="us")})
+    for column, col in list(COLUMNS.items())[1:]:
+        rows[column] = raw[col]
+    for column in NUMERIC_COLUMNS:
+        rows[column] = downcast_numeric(rows[column])
+    return rows
+
+
+def _epoch_day(value):
+    return int(pd.Timestamp(value).normalize().value // 86_400_000_000_000)
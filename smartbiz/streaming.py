@@ -0,0 +1,167 @@
+"""Ingestion streaming untuk file CSV yang lebih besar dari memori.
+
+CSV dibaca per chunk, kolom wajib divalidasi per chunk, baris ditulis ke
+store Parquet di disk dan cube agregat dibangun bertahap selama membaca.
+Yang tinggal di memori hanya cube (ukurannya mengikuti kombinasi unik
+hari × produk × kategori × customer), bukan seluruh transaksi.
+"""
+import json
+import os
+import shutil
+from dataclasses import asdict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from smartbiz.cube import build_cube, merge_cubes
+from smartbiz.ingest import DEFAULT_CACHE_DIR, SNAPSHOT_VERSION, validate_columns
+from smartbiz.normalize import NAME_COLUMNS, NUMERIC_COLUMNS, downcast_numeric
+from smartbiz.quality import QualityReport, clean_transactions
+
+STORE_DIR = os.environ.get("SMARTBIZ_STORE_DIR", os.path.join(DEFAULT_CACHE_DIR, "stores"))
+DEFAULT_CHUNKSIZE = 250_000
+# Cube parsial digabung begitu totalnya melewati batas ini, supaya memori tetap terbatas
+MERGE_EVERY_ROWS = 2_000_000
+# File di atas ukuran ini otomatis disarankan memakai mode streaming
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+
+STORE_SCHEMA = pa.schema(
+    [("Tanggal", pa.timestamp("us"))]
+    + [(col, pa.string()) for col in ["Nama Customer", "Nama Produk", "Kategori"]]
+    # Disimpan float64 agar chunk berisi sel kosong tetap cocok dengan skema;
+    # saat dibaca kembali kolom bulat di-downcast lagi ke integer
+    + [(col, pa.float64()) for col in ["Jumlah", "Harga", "Total"]]
+)
+
+
+class TransactionStore:
+    """Store on-disk per dataset: ``rows.parquet`` (transaksi), ``cube.parquet``
+    dan ``quality.json`` (laporan kualitas data)."""
+
+    def __init__(self, key, root=STORE_DIR):
+        self.key = key
+        # Versi snapshot ikut di path: aturan kualitas data berubah → store lama tidak dipakai
+        self.path = os.path.join(root, f"{key}.v{SNAPSHOT_VERSION}")
+        self.rows_path = os.path.join(self.path, "rows.parquet")
+        self.cube_path = os.path.join(self.path, "cube.parquet")
+        self.quality_path = os.path.join(self.path, "quality.json")
+
+    def exists(self):
+        return os.path.exists(self.cube_path) and os.path.exists(self.rows_path)
+
+    def load_cube(self):
+        return pd.read_parquet(self.cube_path)
+
+    @property
+    def quality_report(self):
+        try:
+            with open(self.quality_path, encoding="utf-8") as f:
+                return QualityReport.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    @property
+    def num_rows(self):
+        return pq.ParquetFile(self.rows_path).metadata.num_rows
+
+    @staticmethod
+    def filter_expression(start_date=None, end_date=None, kategori=None, customers=None):
+        expr = None
+        if start_date is not None and end_date is not None:
+            start = pd.Timestamp(start_date).normalize()
+            end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+            expr = (ds.field("Tanggal") >= pa.scalar(start, pa.timestamp("us"))) & (
+                ds.field("Tanggal") < pa.scalar(end, pa.timestamp("us"))
+            )
+        if kategori is not None:
+            cond = ds.field("Kategori").isin(list(kategori))
+            expr = cond if expr is None else expr & cond
+        if customers:
+            cond = ds.field("Nama Customer").isin(list(customers))
+            expr = cond if expr is None else expr & cond
+        return expr
+
+    def dataset(self):
+        return ds.dataset(self.rows_path, format="parquet")
+
+    def scan_rows(self, start_date=None, end_date=None, kategori=None, customers=None, limit=None):
+        """Baca baris yang lolos filter langsung dari Parquet (predicate pushdown);
+        dengan ``limit`` pembacaan berhenti begitu cukup baris terkumpul."""
+        expr = self.filter_expression(start_date, end_date, kategori, customers)
+        dataset = self.dataset()
+        if limit is None:
+            table = dataset.to_table(filter=expr)
+        else:
+            table = dataset.head(limit, filter=expr)
+        return table_to_rows(table)
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def table_to_rows(table):
+    rows = table.to_pandas()
+    for col in NUMERIC_COLUMNS:
+        rows[col] = downcast_numeric(rows[col])
+    return rows
+
+
+def _prepare_chunk(chunk):
+    validate_columns(chunk.columns)
+    chunk, quality = clean_transactions(chunk)
+    out = pd.DataFrame({"Tanggal": chunk["Tanggal"].astype("datetime64[us]")})
+    for col in NAME_COLUMNS:
+        out[col] = chunk[col].astype("string")
+    for col in NUMERIC_COLUMNS:
+        out[col] = chunk[col].astype("float64")
+    out.sort_values("Tanggal", inplace=True, kind="stable", ignore_index=True)
+    return out[STORE_SCHEMA.names], quality
+
+
+def ingest_csv_stream(source, key, total_bytes=None, chunksize=DEFAULT_CHUNKSIZE, progress=None, root=STORE_DIR):
+    """Stream CSV (path atau file-like) ke ``TransactionStore``. ``progress``
+    dipanggil dengan (fraksi 0..1, jumlah baris terbaca) setelah tiap chunk."""
+    store = TransactionStore(key, root)
+    if store.exists():
+        if progress:
+            progress(1.0, store.num_rows)
+        return store
+
+    os.makedirs(store.path, exist_ok=True)
+    tmp_rows = store.rows_path + ".tmp"
+    parts, pending_rows, rows_read = [], 0, 0
+    quality = QualityReport()
+    try:
+        with pq.ParquetWriter(tmp_rows, STORE_SCHEMA) as writer:
+            for chunk in pd.read_csv(source, chunksize=chunksize):
+                prepared, chunk_quality = _prepare_chunk(chunk)
+                quality.merge(chunk_quality, row_offset=rows_read)
+                writer.write_table(pa.Table.from_pandas(prepared, schema=STORE_SCHEMA, preserve_index=False))
+
+                part = build_cube(prepared)
+                parts.append(part)
+                pending_rows += len(part)
+                if pending_rows > MERGE_EVERY_ROWS:
+                    parts = [merge_cubes(parts)]
+                    pending_rows = len(parts[0])
+
+                rows_read += len(chunk)
+                if progress:
+                    fraction = source.tell() / total_bytes if total_bytes and hasattr(source, "tell") else 0
+                    progress(min(fraction, 1.0), rows_read)
+
+        cube = merge_cubes(parts)
+        cube.to_parquet(store.cube_path + ".tmp", index=False)
+        with open(store.quality_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(quality), f)
+        os.replace(tmp_rows, store.rows_path)
+        os.replace(store.cube_path + ".tmp", store.cube_path)
+    except BaseException:
+        store.remove()
+        raise
+
+    if progress:
+        progress(1.0, rows_read)
+    return store
@@ -0,0 +1,406 @@
+"""Tabel "Data Penjualan" berhalaman: pencarian, sort dan paging di sisi server.
+
+Hanya baris pada halaman yang terlihat yang dikirim ke browser. Sumber
+baris yang didukung: ``FrameRows`` (dataset di memori, memakai posisi dari
+``FilterIndex``), ``ArrowRows`` (dataset yang sama sebagai tabel Arrow
+zero-copy, filter & cari lewat compute kernel Arrow), ``StoreRows`` (store
+Parquet mode streaming) dan ``SqlRows`` (backend SQLite; sort & paging
+lewat ``ORDER BY ... LIMIT``).
+"""
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from smartbiz.filters import date_slice
+from smartbiz.ingest import arrow_table  # noqa: F401  (dipakai bersama ArrowRows)
+from smartbiz.sql_backend import COLUMNS, connect
+from smartbiz.streaming import table_to_rows
+
+SEARCH_COLUMNS = ["Nama Customer", "Nama Produk", "Kategori"]
+SORT_COLUMNS = ["Tanggal", "Nama Customer", "Nama Produk", "Kategori", "Jumlah", "Harga", "Total"]
+EXPORT_CHUNK_ROWS = 100_000
+# Kolom bantu (urutan baris di store) untuk memecah nilai seri saat sort
+ROW_NUMBER = "__row"
+# Kolom bantu penanda nilai kosong: kosong dianggap nilai terkecil (seperti FrameRows)
+IS_NULL = "__null"
+
+
+def page_count(total_rows, page_size):
+    return max(1, -(-total_rows // page_size))
+
+
+def _page_bounds(page, page_size, total_rows):
+    start = min(page * page_size, total_rows)
+    return start, min(start + page_size, total_rows)
+
+
+def _page_order(keys, start, stop):
+    """Urutan baris ``start:stop`` menurut ``keys``; baris seri tetap urut posisi."""
+    candidates = np.arange(len(keys))
+    if 0 < stop < len(keys):
+        # Top-k parsial (O(n)) lalu urutkan hanya kandidatnya. Semua baris yang
+        # seri dengan kunci ke-k ikut, supaya urutan seri tetap urut posisi
+        kth = np.partition(keys, stop - 1)[stop - 1]
+        if not (keys.dtype.kind == "f" and np.isnan(kth)):
+            candidates = np.flatnonzero(keys <= kth)
+    return candidates[np.lexsort((candidates, keys[candidates]))][start:stop]
+
+
+class FrameRows:
+    """Baris hasil filter dari DataFrame di memori (terurut `Tanggal`)."""
+
+    def __init__(self, df, positions):
+        self.df = df
+        # ``slice`` dibiarkan apa adanya; array posisi hanya dibuat bila perlu
+        self._positions = positions
+
+    @property
+    def positions(self):
+        if isinstance(self._positions, slice):
+            self._positions = np.arange(self._positions.start, self._positions.stop)
+        return self._positions
+
+    def __len__(self):
+        if isinstance(self._positions, slice):
+            return self._positions.stop - self._positions.start
+        return len(self._positions)
+
+    def search(self, query):
+        """Cocokkan teks ke kategori (bukan per baris), lalu saring lewat kode."""
+        query = query.strip()
+        if not query:
+            return self
+        keep = np.zeros(len(self.positions), dtype=bool)
+        for col in SEARCH_COLUMNS:
+            series = self.df[col]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype("category")
+            hits = series.cat.categories.str.contains(query, case=False, regex=False)
+            lookup = np.append(np.asarray(hits, dtype=bool), False)  # kode -1 → False
+            keep |= lookup[series.cat.codes.to_numpy()[self.positions]]
+        return FrameRows(self.df, self.positions[keep])
+
+    def _sort_keys(self, sort_by, ascending):
+        """Kunci sort numerik untuk baris terpilih; descending = kunci dinegasikan."""
+        series = self.df[sort_by]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            keys = series.cat.codes.to_numpy()[self.positions].astype("int64")
+        elif pd.api.types.is_numeric_dtype(series):
+            keys = series.to_numpy()[self.positions]
+            keys = keys.astype("float64") if keys.dtype.kind == "f" else keys.astype("int64")
+        else:
+            keys = pd.factorize(series.iloc[self.positions], sort=True)[0].astype("int64")
+        return keys if ascending else -keys
+
+    def page(self, page, page_size, sort_by="Tanggal", ascending=True):
+        start, stop = _page_bounds(page, page_size, len(self))
+        if sort_by == "Tanggal":
+            # Data sudah terurut tanggal: cukup potong dari depan/belakang
+            if not ascending:
+                start, stop = len(self) - stop, len(self) - start
+            if isinstance(self._positions, slice):
+                offset = self._positions.start
+                chosen = slice(offset + start, offset + stop)
+            else:
+                chosen = self._positions[start:stop]
+            page_rows = self.df.iloc[chosen]
+            return page_rows if ascending else page_rows.iloc[::-1]
+
+        keys = self._sort_keys(sort_by, ascending)
+        return self.df.iloc[self.positions[_page_order(keys, start, stop)]]
+
+    def iter_chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        if isinstance(self._positions, slice):
+            offset = self._positions.start
+            for start in range(0, len(self), chunk_rows):
+                yield self.df.iloc[offset + start:offset + min(start + chunk_rows, len(self))]
+            return
+        for start in range(0, len(self._positions), chunk_rows):
+            yield self.df.iloc[self._positions[start:start + chunk_rows]]
+
+
+def _label_mask(column, predicate, selection=None):
+    """Mask baris dari ``predicate`` atas label, hanya untuk baris ``selection``
+    bila diberikan. Kolom dictionary cukup dicek per label unik lalu dipetakan
+    lewat index-nya; null → False."""
+    chunks = []
+    for chunk in column.chunks:
+        if pa.types.is_dictionary(chunk.type):
+            indices = chunk.indices if selection is None else pc.take(chunk.indices, selection)
+            hits = pc.fill_null(predicate(chunk.dictionary), False)
+            chunks.append(pc.take(hits, indices))
+        else:
+            chunks.append(predicate(chunk if selection is None else pc.take(chunk, selection)))
+    return pc.fill_null(pa.chunked_array(chunks, type=pa.bool_()), False)
+
+
+class ArrowRows:
+    """Baris hasil filter dari tabel Arrow (terurut `Tanggal`). Rentang tanggal
+    jadi ``slice`` zero-copy; filter lain dan pencarian hanya menyimpan index
+    baris terpilih, dan halaman diambil lewat ``take`` lalu dikirim ke
+    ``st.dataframe`` sebagai tabel Arrow tanpa konversi ke pandas."""
+
+    def __init__(self, table, filter_args=(), selection=None):
+        start_date, end_date, kategori, customers = filter_args or (None, None, None, None)
+        if start_date is not None and end_date is not None:
+            dates = table.column("Tanggal").chunk(0).to_numpy() if table.num_rows else np.array([], "datetime64[us]")
+            lo, hi = date_slice(dates, start_date, end_date)
+            table = table.slice(lo, hi - lo)
+        self.table = table
+        self.selection = selection  # None = semua baris ``table``; else index (int64)
+        if kategori is not None:
+            self._narrow("Kategori", lambda v: pc.is_in(v, pa.array(kategori, v.type)))
+        if customers:
+            self._narrow("Nama Customer", lambda v: pc.is_in(v, pa.array(customers, v.type)))
+
+    def _selected(self, mask):
+        # ``mask`` sejajar dengan baris terpilih saat ini
+        return pc.indices_nonzero(mask) if self.selection is None else self.selection.filter(mask)
+
+    def _narrow(self, column, predicate):
+        self.selection = self._selected(_label_mask(self.table.column(column), predicate, self.selection))
+
+    def __len__(self):
+        return self.table.num_rows if self.selection is None else len(self.selection)
+
+    def search(self, query):
+        query = query.strip()
+        if not query:
+            return self
+        mask = None
+        for col in SEARCH_COLUMNS:
+            hits = _label_mask(self.table.column(col), lambda v: pc.match_substring(v, query, ignore_case=True),
+                               self.selection)
+            mask = hits if mask is None else pc.or_(mask, hits)
+        return ArrowRows(self.table, selection=self._selected(mask))
+
+    def _sort_keys(self, sort_by, ascending):
+        """Kunci sort numerik (sama seperti ``FrameRows``) untuk baris terpilih."""
+        column = self.table.column(sort_by).combine_chunks()
+        picked = slice(None) if self.selection is None else self.selection.to_numpy()
+        if pa.types.is_dictionary(column.type):
+            # Peringkat label (dictionary belum tentu terurut); null → -1
+            ranks = np.empty(len(column.dictionary) + 1, dtype="int64")
+            ranks[pc.array_sort_indices(column.dictionary).to_numpy()] = np.arange(len(column.dictionary))
+            ranks[-1] = -1
+            keys = ranks[pc.fill_null(column.indices, -1).to_numpy()[picked]]
+        else:
+            keys = column.to_numpy(zero_copy_only=False)[picked]
+            keys = keys.astype("float64") if keys.dtype.kind == "f" else keys.astype("int64")
+        return keys if ascending else -keys
+
+    def _take(self, rows):
+        if self.selection is not None:
+            rows = self.selection.take(pa.array(rows))
+        return self.table.take(rows)
+
+    def page(self, page, page_size, sort_by="Tanggal", ascending=True):
+        start, stop = _page_bounds(page, page_size, len(self))
+        if sort_by == "Tanggal":
+            if ascending and self.selection is None:
+                return self.table.slice(start, stop - start)
+            rows = np.arange(start, stop) if ascending else np.arange(len(self) - 1 - start, len(self) - 1 - stop, -1)
+            return self._take(rows)
+        return self._take(_page_order(self._sort_keys(sort_by, ascending), start, stop))
+
+    def iter_chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        for start in range(0, len(self), chunk_rows):
+            stop = min(start + chunk_rows, len(self))
+            if self.selection is None:
+                part = self.table.slice(start, stop - start)
+            else:
+                part = self.table.take(self.selection.slice(start, stop - start))
+            yield part.to_pandas()
+
+
+class _Reversed:
+    """Pembungkus kunci sort supaya ``list.sort`` mengurutkan nilai menurun."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class StoreRows:
+    """Baris hasil filter dari store Parquet; memori dibatasi per batch."""
+
+    def __init__(self, store, filter_args=()):
+        self.store = store
+        self.expr = store.filter_expression(*filter_args)
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.store.dataset().count_rows(filter=self.expr)
+        return self._count
+
+    def search(self, query):
+        query = query.strip()
+        if not query:
+            return self
+        cond = None
+        for col in SEARCH_COLUMNS:
+            match = pc.match_substring(ds.field(col), query, ignore_case=True)
+            cond = match if cond is None else cond | match
+        rows = StoreRows(self.store)
+        rows.expr = cond if self.expr is None else self.expr & cond
+        return rows
+
+    def _batches(self):
+        return self.store.dataset().to_batches(filter=self.expr)
+
+    def _row_groups(self, sort_by, ascending):
+        """[(row group, nomor baris pertamanya di store, batas kunci sort)] yang
+        statistiknya mungkin lolos filter, urut batas: min kolom sort untuk urut
+        naik, max untuk urut turun. Row group tanpa statistik, atau yang berisi
+        nilai kosong pada urut naik (batas None), dibaca lebih dulu."""
+        fragment = next(self.store.dataset().get_fragments())
+        offsets = np.cumsum([0] + [rg.num_rows for rg in fragment.row_groups])
+        column = fragment.physical_schema.get_field_index(sort_by)
+        groups = []
+        for part in fragment.split_by_row_group(self.expr):
+            info = part.row_groups[0]
+            stats = (info.statistics or {}).get(sort_by) or {}
+            bound = stats.get("min" if ascending else "max")
+            if ascending and fragment.metadata.row_group(info.id).column(column).statistics.null_count:
+                bound = None
+            groups.append((part, int(offsets[info.id]), bound))
+        groups.sort(key=lambda g: (g[2] is not None, g[2] if ascending or g[2] is None else _Reversed(g[2])))
+        return groups
+
+    def page(self, page, page_size, sort_by="Tanggal", ascending=True):
+        start, stop = _page_bounds(page, page_size, len(self))
+        if stop <= start:
+            return table_to_rows(self.store.dataset().schema.empty_table())
+
+        # Store hanya terurut per chunk (row group), jadi semua sort (termasuk
+        # Tanggal) memakai top-k berjalan: memori hanya sebesar k baris. Row
+        # group dibaca urut batas min/max kolom sort dari statistik Parquet, dan
+        # pembacaan berhenti begitu baris ke-k sudah lebih baik dari batas row
+        # group berikutnya: halaman awal cukup membaca sebagian kecil store.
+        # Seri dipecah dengan (Tanggal, nomor baris di store): tiap chunk terurut
+        # Tanggal, jadi urutannya sama dengan posisi baris di FrameRows (kecuali
+        # Tanggal turun, yang membalik seluruh urutan). Nilai kosong paling awal
+        # pada urut naik dan paling akhir pada urut turun, lewat kolom IS_NULL
+        direction = "ascending" if ascending else "descending"
+        if sort_by == "Tanggal":
+            # Tanggal kosong sudah dibuang saat ingest
+            helpers = [ROW_NUMBER]
+            order = [(sort_by, direction), (ROW_NUMBER, direction)]
+        else:
+            helpers = [ROW_NUMBER, IS_NULL]
+            order = [(IS_NULL, "descending" if ascending else "ascending"), (sort_by, direction),
+                     ("Tanggal", "ascending"), (ROW_NUMBER, "ascending")]
+        best = None
+        for part, offset, bound in self._row_groups(sort_by, ascending):
+            if best is not None and best.num_rows >= stop and bound is not None:
+                kth = best.column(sort_by)[best.num_rows - 1].as_py()
+                if kth is not None and (kth < bound if ascending else kth > bound):
+                    break
+            table = part.to_table()
+            table = table.append_column(ROW_NUMBER, pa.array(np.arange(offset, offset + table.num_rows)))
+            if IS_NULL in helpers:
+                table = table.append_column(IS_NULL, pc.is_null(table.column(sort_by)))
+            if self.expr is not None:
+                table = table.filter(self.expr)
+            if best is not None:
+                table = pa.concat_tables([best, table])
+            best = table.take(pc.select_k_unstable(table, stop, order)).sort_by(order)
+        if best is None:
+            return table_to_rows(self.store.dataset().schema.empty_table())
+        page_rows = best.slice(start, stop - start)
+        return table_to_rows(page_rows.drop_columns(helpers))
+
+    def iter_chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        for batch in self._batches():
+            if batch.num_rows:
+                yield table_to_rows(pa.Table.from_batches([batch]))
+
+
+class SqlRows:
+    """Baris hasil filter dari backend SQL; hanya halaman yang diminta dibaca."""
+
+    def __init__(self, dataset, filter_args=(), search_labels=None):
+        self.dataset = dataset
+        self.filter_args = filter_args
+        # {kolom: daftar label yang cocok dengan teks pencarian}
+        self.search_labels = search_labels
+        self._count = None
+
+    def _where(self, conn):
+        where, params = self.dataset.where(conn, *self.filter_args)
+        if self.search_labels is not None:
+            conds = []
+            for column, labels in self.search_labels.items():
+                conds.append(f"{COLUMNS[column]} IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps(labels))
+            where += " AND (" + " OR ".join(conds) + ")"
+        return where, params
+
+    def __len__(self):
+        if self._count is None:
+            with connect(self.dataset.path) as conn:
+                where, params = self._where(conn)
+                self._count = conn.execute(f"SELECT COUNT(*) FROM transactions WHERE {where}", params).fetchone()[0]
+        return self._count
+
+    def search(self, query):
+        """Seperti ``FrameRows.search``: teks dicocokkan ke label unik (tanpa
+        peka huruf besar/kecil), lalu baris disaring lewat index kolomnya."""
+        query = query.strip()
+        if not query:
+            return self
+        needle = query.casefold()
+        labels = {
+            column: [label for label in self.dataset.labels(column) if needle in label.casefold()]
+            for column in SEARCH_COLUMNS
+        }
+        return SqlRows(self.dataset, self.filter_args, labels)
+
+    def _select(self, where):
+        return f"SELECT {', '.join(COLUMNS.values())} FROM transactions WHERE {where}"
+
+    def page(self, page, page_size, sort_by="Tanggal", ascending=True):
+        start, stop = _page_bounds(page, page_size, len(self))
+        direction = "ASC" if ascending else "DESC"
+        # Urutan sama dengan FrameRows: baris seri tetap urut posisi, kecuali
+        # Tanggal turun yang membalik seluruh urutan. Dataset yang diimpor dari
+        # store hanya terurut Tanggal per chunk, jadi seri dipecah dengan
+        # (Tanggal, rowid) seperti StoreRows
+        if sort_by == "Tanggal":
+            tie = f"rowid {direction}"
+        else:
+            tie = f"{COLUMNS['Tanggal']} ASC, rowid ASC"
+        with connect(self.dataset.path) as conn:
+            where, params = self._where(conn)
+            sql = f"{self._select(where)} ORDER BY {COLUMNS[sort_by]} {direction}, {tie} LIMIT ? OFFSET ?"
+            return self.dataset.read_rows(conn, sql, params + [stop - start, start])
+
+    def iter_chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        with connect(self.dataset.path) as conn:
+            where, params = self._where(conn)
+            yield from self.dataset.iter_rows(conn, f"{self._select(where)} ORDER BY rowid", params, chunk_rows)
+
+
+def export_csv(rows):
+    """Tulis seluruh baris hasil filter ke file sementara per chunk dan
+    kembalikan file tersebut (dibaca Streamlit saat tombol unduh diklik)."""
+    out = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+    header = True
+    for chunk in rows.iter_chunks():
+        out.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+    if header:
+        out.write(",".join(SORT_COLUMNS).encode("utf-8") + b"\n")
+    out.seek(0)
+    return out
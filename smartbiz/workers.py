@@ -0,0 +1,32 @@
+"""Process pool bersama untuk pekerjaan berat yang terikat CPU (parsing file,
+render grafik). Pool dibuat sekali per proses dan dipakai lintas sesi."""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.environ.get("SMARTBIZ_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn": proses Streamlit punya banyak thread, fork tidak aman
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def reset_pool():
+    """Buang pool yang rusak (worker mati); pool baru dibuat saat dibutuhkan."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,29 @@
+import plotly.graph_objects as go
+
+from smartbiz import chart_images
+from smartbiz.report import chart_section
+
+
+def _figures():
+    return {name: go.Figure(go.Bar(x=["a", "b"], y=[1, 2]), layout={"title": name}) for name in ["satu", "dua", "tiga"]}
+
+
+def test_figures_without_png_become_interactive_html(monkeypatch):
+    monkeypatch.setattr(chart_images, "HAS_KALEIDO", False)
+    charts = chart_images.render_figures(_figures())
+    assert list(charts) == ["satu", "dua", "tiga"]
+    assert all(chart_images.is_interactive(chart) for chart in charts.values())
+    # plotly.js dimuat sekali, di grafik pertama
+    assert [chart.count("cdn.plot.ly") for chart in charts.values()] == [1, 0, 0]
+    section = chart_section(charts)
+    assert section.count("Plotly.newPlot") == 3 and "<img" not in section
+
+
+def test_png_and_interactive_charts_mix_in_figure_order():
+    figures = _figures()
+    charts = chart_images.with_interactive(figures, {"dua": b"png"})
+    assert list(charts) == ["satu", "dua", "tiga"]
+    assert charts["dua"] == b"png"
+    assert "cdn.plot.ly" in charts["satu"] and "cdn.plot.ly" not in charts["tiga"]
+    section = chart_section(charts)
+    assert section.count("<img") == 1 and section.count("Plotly.newPlot") == 2
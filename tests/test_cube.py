@@ -0,0 +1,39 @@
+import pandas as pd
+
+from smartbiz.cube import append_cube, build_cube, merge_cubes
+from smartbiz.metrics import compute_metrics
+from smartbiz.normalize import normalize_transactions
+
+
+def _transactions():
+    return normalize_transactions(pd.DataFrame({
+        "Tanggal": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03", "2024-01-03"],
+        "Nama Customer": ["A", None, "B", "A", "A"],
+        "Nama Produk": ["x", "y", None, "z", "x"],
+        "Kategori": ["k", None, "k", "l", "k"],
+        "Jumlah": [1, 2, 1, 1, 3],
+        "Harga": [100, 100, 50, 100, 100],
+        "Total": [100, 200, 50, 100, 300],
+    }))
+
+
+def _assert_same_metrics(cube, df):
+    expected, actual = compute_metrics(df), compute_metrics(cube)
+    assert actual.total_omset == expected.total_omset == df["Total"].sum()
+    assert actual.total_order == expected.total_order == len(df)
+    assert actual.total_customer == expected.total_customer
+    assert actual.unique_products == expected.unique_products
+    for name in ["produk", "customer", "kategori", "daily", "monthly", "weekday"]:
+        pd.testing.assert_frame_equal(getattr(actual, name), getattr(expected, name), check_dtype=False)
+
+
+def test_cube_keeps_rows_with_blank_names():
+    df = _transactions()
+    _assert_same_metrics(build_cube(df), df)
+
+
+def test_merged_and_appended_cubes_match_raw_totals():
+    df = _transactions()
+    head, tail = build_cube(df.iloc[:2]), build_cube(df.iloc[2:])
+    _assert_same_metrics(merge_cubes([head, tail]), df)
+    _assert_same_metrics(append_cube(head, tail), df)
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from smartbiz.customers import compute_customer_analytics, quantile_scores
+
+
+def test_quantile_scores_spread_distinct_values():
+    assert quantile_scores(np.arange(10)).tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+
+
+def test_quantile_scores_equal_values_get_equal_scores():
+    scores = quantile_scores(np.array([5, 1, 5, 5, 9, 5]))
+    assert len(set(scores[[0, 2, 3, 5]])) == 1
+    assert scores[1] < scores[0] < scores[4]
+
+
+def test_identical_customers_share_scores_and_segment():
+    df = pd.DataFrame({
+        "Tanggal": pd.to_datetime(["2024-03-01"] * 10),
+        "Nama Customer": [f"Customer {c}" for c in "ABCDEFGHIJ"],
+        "Total": 100,
+    })
+    rfm = compute_customer_analytics(df).rfm
+    for col in ["R", "F", "M", "Skor RFM", "Segmen"]:
+        assert rfm[col].nunique() == 1, col
@@ -0,0 +1,35 @@
+import json
+import logging
+
+from smartbiz import instrumentation
+from smartbiz.instrumentation import RerunRecorder
+
+
+def _run(recorder, *stages):
+    with recorder:
+        for name in stages:
+            with recorder.stage(name):
+                pass
+    return recorder
+
+
+def test_fragment_rerun_gets_its_own_records(caplog):
+    page = _run(RerunRecorder("dashboard", trace_memory=False), "cube", "metrics")
+    with caplog.at_level(logging.INFO, logger="smartbiz.perf"):
+        first = _run(page.fragment_rerun(), "section_table")
+        second = _run(first.fragment_rerun(), "section_table")
+    assert [r.name for r in page.records] == ["cube", "metrics"]
+    assert [r.name for r in first.records] == ["section_table"]
+    assert first.parent_id == second.parent_id == page.rerun_id
+    assert first.rerun_id != second.rerun_id
+    events = [json.loads(record.getMessage()) for record in caplog.records]
+    assert [(e["event"], e["parent_rerun_id"], len(e["stages"])) for e in events] == [
+        ("fragment", page.rerun_id, 1), ("fragment", page.rerun_id, 1)
+    ]
+
+
+def test_records_are_capped(monkeypatch):
+    monkeypatch.setattr(instrumentation, "MAX_RECORDS", 3)
+    recorder = _run(RerunRecorder("home", trace_memory=False), *[f"stage_{i}" for i in range(5)])
+    assert [r.name for r in recorder.records] == ["stage_2", "stage_3", "stage_4"]
+    assert len(recorder.to_frame()) == 3
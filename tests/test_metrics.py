@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from smartbiz.cube import build_cube
+from smartbiz.filters import FilterIndex
+from smartbiz.incremental import RunningAggregates
+from smartbiz.metrics import WEEKDAY_NAMES, compute_metrics
+from smartbiz.normalize import normalize_transactions
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    n = 400
+    jumlah = rng.integers(1, 6, n)
+    harga = rng.integers(10, 200, n) * 1000
+    df = pd.DataFrame({
+        "Tanggal": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 120, n), unit="D")
+        + pd.to_timedelta(rng.integers(0, 86400, n), unit="s"),
+        "Nama Customer": rng.choice(["Ani", "Budi", "Citra", "Dewi", "Eka", None], n),
+        "Nama Produk": rng.choice(["Blouse", "Dress", "Rok", "Syal", None], n),
+        "Kategori": rng.choice(["Atasan", "Bawahan", "Aksesoris", None], n),
+        "Jumlah": jumlah,
+        "Harga": harga,
+        "Total": jumlah * harga,
+    })
+    return normalize_transactions(df)
+
+
+def _pandas_metrics(df):
+    """Perhitungan per widget versi pandas biasa (seperti dashboard sebelum mesin metrik)."""
+    produk = df.groupby("Nama Produk", observed=True).agg(Total=("Total", "sum"), Jumlah=("Jumlah", "sum"))
+    customer = df.groupby("Nama Customer", observed=True)["Total"].sum()
+    kategori = df.groupby("Kategori", observed=True)["Jumlah"].count()
+    daily = df.groupby(df["Tanggal"].dt.normalize())["Jumlah"].sum()
+    monthly = df.groupby(df["Tanggal"].dt.to_period("M").astype(str))["Jumlah"].sum()
+    weekday = df.groupby(df["Tanggal"].dt.day_name())["Jumlah"].mean().reindex(WEEKDAY_NAMES)
+    pareto = {}
+    for label, totals in [("Nama Produk", produk["Total"]), ("Nama Customer", customer)]:
+        totals = totals.sort_values(ascending=False, kind="stable")
+        pareto[label] = totals[totals.cumsum() / totals.sum() <= 0.8]
+    return {
+        "total_omset": df["Total"].sum(),
+        "total_order": len(df),
+        "total_customer": df["Nama Customer"].nunique(),
+        "aov": df["Total"].mean() if len(df) else 0,
+        "unique_products": df["Nama Produk"].nunique(),
+        "produk": produk,
+        "customer": customer,
+        "kategori": kategori,
+        "daily": daily,
+        "monthly": monthly,
+        "weekday": weekday,
+        "pareto": pareto,
+    }
+
+
+def _assert_parity(metrics, df):
+    expected = _pandas_metrics(df)
+    for name in ["total_omset", "total_order", "total_customer", "unique_products"]:
+        assert getattr(metrics, name) == expected[name], name
+    assert metrics.aov == pytest.approx(expected["aov"])
+
+    produk = metrics.produk.set_index("Nama Produk")
+    assert produk.index.tolist() == expected["produk"].index.astype(str).tolist()
+    assert produk["Total"].tolist() == expected["produk"]["Total"].tolist()
+    assert produk["Jumlah"].tolist() == expected["produk"]["Jumlah"].tolist()
+    assert metrics.customer.set_index("Nama Customer")["Total"].to_dict() == expected["customer"].to_dict()
+    assert metrics.kategori.set_index("Kategori")["Jumlah"].to_dict() == expected["kategori"].to_dict()
+    assert metrics.kategori["Jumlah"].is_monotonic_decreasing
+    assert metrics.daily.set_index("Tanggal")["Jumlah"].to_dict() == expected["daily"].to_dict()
+    assert metrics.monthly.set_index("Bulan")["Jumlah"].to_dict() == expected["monthly"].to_dict()
+    np.testing.assert_allclose(metrics.weekday["Jumlah"], expected["weekday"].to_numpy())
+    for pareto, label in [(metrics.pareto_produk, "Nama Produk"), (metrics.pareto_customer, "Nama Customer")]:
+        top = expected["pareto"][label]
+        assert pareto.count == len(top)
+        assert pareto.table.set_index(label)["Total"].to_dict() == top.to_dict()
+
+
+@pytest.mark.parametrize("filter_args", [
+    (),
+    (pd.Timestamp("2024-02-01"), pd.Timestamp("2024-03-15"), None, ()),
+    (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-04-30"), ("Atasan", "Aksesoris"), ()),
+    (pd.Timestamp("2024-01-10"), pd.Timestamp("2024-02-20"), None, ("Ani", "Dewi")),
+])
+def test_metrics_match_pandas_groupbys(data, filter_args):
+    rows = FilterIndex(data).filter(*filter_args)
+    _assert_parity(compute_metrics(rows), rows)
+    _assert_parity(compute_metrics(FilterIndex(build_cube(data)).filter(*filter_args)), rows)
+
+
+def test_unfiltered_running_aggregates_match_pandas_groupbys(data):
+    _assert_parity(RunningAggregates.from_frame(build_cube(data)).to_metrics(), data)
+
+
+def test_empty_filter_gives_empty_metrics(data):
+    empty = (pd.Timestamp("2030-01-01"), pd.Timestamp("2030-12-31"), None, ())
+    for frame in [data, build_cube(data)]:
+        metrics = compute_metrics(FilterIndex(frame).filter(*empty))
+        assert metrics.empty and metrics.total_omset == 0 and metrics.aov == 0
+        assert metrics.produk.empty and metrics.customer.empty and metrics.kategori.empty
+        assert metrics.daily.empty and metrics.monthly.empty
+        assert metrics.weekday["Jumlah"].isna().all()
+        assert metrics.busiest_day() == (None, 0) and metrics.bulan_tertinggi is None
+        assert metrics.pareto_produk.count == 0 and metrics.pareto_customer.count == 0
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from smartbiz.ingest import DatasetCache, load_transactions
+from smartbiz.multi_file import concat_transactions
+from smartbiz.normalize import normalize_transactions
+
+CSV = b"Tanggal,Nama Customer,Nama Produk,Kategori,Jumlah,Harga,Total\n2024-01-01,A,x,k,1,100,100\n"
+
+
+def _frame(dates, **extra):
+    return normalize_transactions(pd.DataFrame({
+        "Tanggal": dates, "Nama Customer": "A", "Nama Produk": "x", "Kategori": "k",
+        "Jumlah": 1, "Harga": 100, "Total": 100, **extra,
+    }))
+
+
+def test_concat_keeps_union_of_extra_columns():
+    combined = concat_transactions([
+        _frame(["2024-01-02", "2024-01-03"], Outlet=["O1", "O2"]),
+        _frame(["2024-01-01"], Catatan=[7]),
+    ])
+    assert list(combined.columns[-2:]) == ["Outlet", "Catatan"]
+    assert combined["Tanggal"].is_monotonic_increasing
+    assert combined["Outlet"].isna().tolist() == [True, False, False]
+    assert combined["Catatan"].tolist()[0] == 7 and combined["Catatan"].isna().sum() == 2
+
+
+def test_load_without_memory_cache_only_writes_snapshot(tmp_path):
+    cache = DatasetCache(cache_dir=str(tmp_path))
+    key, df = load_transactions(CSV, "a.csv", cache=cache, memory=False)
+    assert len(df) == 1 and cache.stats()["entries"] == 0
+    assert len(list(tmp_path.glob(f"{key}.*.parquet"))) == 1
+    _, again = load_transactions(CSV, "a.csv", cache=cache, memory=False)
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["entries"] == 0
+    assert again.equals(df)
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from smartbiz.quality import clean_transactions
+
+
+def _row(**overrides):
+    row = {"Tanggal": "2024-01-01", "Nama Customer": "A", "Nama Produk": "x", "Kategori": "k",
+           "Jumlah": 2, "Harga": 100, "Total": 200}
+    row.update(overrides)
+    return row
+
+
+def _clean(*bad_rows):
+    # Satu baris bersih di depan: nomor baris masalah selalu mulai dari 2
+    return clean_transactions(pd.DataFrame([_row(), *bad_rows]))
+
+
+def test_clean_rows_pass():
+    df, report = _clean(_row(**{"Nama Customer": "B"}))
+    assert len(df) == 2 and report.dropped == 0 and not report.has_issues
+
+
+def test_missing_dates_are_dropped():
+    df, report = _clean(_row(Tanggal=None))
+    assert (report.missing_dates, report.invalid_dates, report.dropped) == (1, 0, 1)
+    assert report.examples["missing_dates"] == [2] and len(df) == 1
+
+
+def test_invalid_dates_are_dropped():
+    df, report = _clean(_row(Tanggal="bukan tanggal"))
+    assert (report.invalid_dates, report.missing_dates, report.dropped) == (1, 0, 1)
+    assert len(df) == 1
+
+
+def test_missing_numbers_are_dropped():
+    df, report = _clean(_row(Jumlah=None), _row(Harga=None), _row(Total=None))
+    assert (report.missing_numbers, report.invalid_numbers, report.dropped) == (3, 0, 3)
+    assert report.examples["missing_numbers"] == [2, 3, 4] and len(df) == 1
+
+
+def test_invalid_numbers_are_dropped():
+    df, report = _clean(_row(Total="dua ratus"))
+    assert (report.invalid_numbers, report.missing_numbers, report.dropped) == (1, 0, 1)
+    assert len(df) == 1
+
+
+def test_negative_quantity_is_dropped():
+    df, report = _clean(_row(Jumlah=-1, Total=-100))
+    assert (report.negative_quantity, report.dropped) == (1, 1)
+    assert len(df) == 1
+
+
+def test_total_mismatch_is_flagged_and_total_kept():
+    df, report = _clean(_row(Total=150))
+    assert (report.total_mismatch, report.dropped) == (1, 0)
+    assert df["Total"].tolist() == [200, 150]
+
+
+def test_missing_names_are_flagged_and_kept():
+    df, report = _clean(_row(**{"Nama Customer": None}), _row(Kategori=None))
+    assert (report.missing_names, report.dropped) == (2, 0)
+    assert report.examples["missing_names"] == [2, 3] and len(df) == 3
+
+
+def test_dropped_rows_are_not_also_flagged():
+    _, report = _clean(_row(Tanggal=None, Total=150, Kategori=None))
+    assert (report.missing_dates, report.total_mismatch, report.missing_names) == (1, 0, 0)
@@ -0,0 +1,50 @@
+import time
+
+from smartbiz import report_jobs
+
+
+class FinishedJob:
+    def __init__(self, path, last_used):
+        self.path = path
+        self.last_used = last_used
+
+    def done(self):
+        return True
+
+    def failed(self):
+        return False
+
+    def result(self):
+        return self
+
+
+def _fill(monkeypatch, tmp_path, ages):
+    jobs = {}
+    for i, age in enumerate(ages):
+        path = tmp_path / f"{i}.html"
+        path.write_text("laporan")
+        jobs[str(i)] = FinishedJob(str(path), time.monotonic() - age)
+    monkeypatch.setattr(report_jobs, "_jobs", report_jobs.OrderedDict(jobs))
+    monkeypatch.setattr(report_jobs, "MAX_REPORTS", 1)
+    monkeypatch.setattr(report_jobs, "REPORT_TTL_SECONDS", 60)
+
+
+def test_recently_requested_reports_are_kept(monkeypatch, tmp_path):
+    _fill(monkeypatch, tmp_path, [10, 5, 0])
+    report_jobs._evict()
+    assert list(report_jobs._jobs) == ["0", "1", "2"]
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_idle_reports_over_the_limit_are_removed(monkeypatch, tmp_path):
+    _fill(monkeypatch, tmp_path, [120, 90, 0])
+    report_jobs._evict()
+    assert list(report_jobs._jobs) == ["2"]
+    assert [p.name for p in tmp_path.iterdir()] == ["2.html"]
+
+
+def test_find_report_refreshes_last_use(monkeypatch, tmp_path):
+    _fill(monkeypatch, tmp_path, [120, 90, 0])
+    report_jobs.find_report("0")
+    report_jobs._evict()
+    assert list(report_jobs._jobs) == ["2", "0"]
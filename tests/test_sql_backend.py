@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from smartbiz import sql_backend
+from smartbiz.cube import build_cube
+from smartbiz.filters import FilterIndex
+from smartbiz.metrics import compute_metrics
+from smartbiz.normalize import normalize_transactions
+from smartbiz.sql_backend import SqlDataset, connect
+
+START, END = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")
+
+
+@pytest.fixture
+def data():
+    return normalize_transactions(pd.DataFrame({
+        "Tanggal": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-08", "2024-01-09", "2024-01-20"],
+        "Nama Customer": ["A", None, "B", "A", "C", "B"],
+        "Nama Produk": ["x", "y", None, "z", "x", "y"],
+        "Kategori": ["k", None, "k", "l", "k", "l"],
+        "Jumlah": [1, 2, 1, 1, 3, 2],
+        "Harga": [100, 100, 50, 100, 100, 75],
+        "Total": [100, 200, 50, 100, 300, 150],
+    }))
+
+
+@pytest.mark.parametrize("filter_args", [
+    (),
+    (START, END, None, ()),
+    (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-09"), None, ()),
+    (START, END, ("k",), ()),
+    (START, END, None, ("A", "B")),
+    (START, END, ("l",), ("B",)),
+])
+def test_sql_metrics_match_cube_metrics(tmp_path, data, filter_args):
+    dataset = SqlDataset("k1", path=str(tmp_path / "db.sqlite")).import_frame(data)
+    expected = compute_metrics(FilterIndex(build_cube(data)).filter(*filter_args))
+    actual = dataset.metrics(*filter_args)
+    assert actual.total_omset == expected.total_omset
+    assert actual.total_order == expected.total_order
+    for name in ["produk", "customer", "kategori", "daily", "monthly", "weekday"]:
+        pd.testing.assert_frame_equal(getattr(actual, name), getattr(expected, name), check_dtype=False)
+
+
+def test_schema_is_created_once_per_database(tmp_path, monkeypatch):
+    path = str(tmp_path / "db.sqlite")
+    with connect(path):
+        pass
+    executed = []
+    real_connect = sql_backend.sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(executed.append)
+        return conn
+
+    monkeypatch.setattr(sql_backend.sqlite3, "connect", traced_connect)
+    with connect(path) as conn:
+        conn.execute("SELECT COUNT(*) FROM datasets").fetchone()
+    assert not [sql for sql in executed if sql.startswith(("PRAGMA", "CREATE"))]
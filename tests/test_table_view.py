@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smartbiz.filters import FilterIndex
+from smartbiz.ingest import parse_transactions
+from smartbiz.normalize import normalize_transactions
+from smartbiz.sql_backend import SqlDataset
+from smartbiz.streaming import ingest_csv_stream
+from smartbiz.table_view import SORT_COLUMNS, ArrowRows, FrameRows, SqlRows, StoreRows, arrow_table
+
+PAGE_SIZE = 16
+FILTERS = [
+    (),
+    (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-04"), None, ()),
+    (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05"), ("Atasan",), ("Ani", "Budi")),
+]
+
+
+@pytest.fixture(scope="module")
+def csv_bytes():
+    # Data penuh nilai seri: 5 tanggal, sedikit label, jumlah & harga berulang
+    rng = np.random.default_rng(3)
+    n = 120
+    jumlah = rng.integers(1, 3, n)
+    harga = rng.choice([1000, 2000], n)
+    df = pd.DataFrame({
+        "Tanggal": rng.choice(pd.date_range("2024-01-01", periods=5).strftime("%Y-%m-%d"), n),
+        "Nama Customer": rng.choice(["Ani", "Budi", "Citra", None], n),
+        "Nama Produk": rng.choice(["Blouse", "Rok", None], n),
+        "Kategori": rng.choice(["Atasan", "Bawahan"], n),
+        "Jumlah": jumlah,
+        "Harga": harga,
+        "Total": jumlah * harga,
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def backends(csv_bytes, tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("backends")
+    df = normalize_transactions(parse_transactions(csv_bytes, "data.csv"))
+    table = arrow_table(df)
+    # Chunk kecil: store terdiri dari beberapa row group yang masing-masing terurut Tanggal
+    store = ingest_csv_stream(io.BytesIO(csv_bytes), "k", chunksize=25, root=str(tmp / "store"))
+    from_frame = SqlDataset("frame", path=str(tmp / "db.sqlite")).import_frame(df)
+    from_store = SqlDataset("store", path=str(tmp / "db.sqlite")).import_chunks(StoreRows(store).iter_chunks())
+    index = FilterIndex(df)
+    return {
+        "frame": lambda args: FrameRows(df, index.positions(*args) if args else slice(0, len(df))),
+        "arrow": lambda args: ArrowRows(table, args),
+        "store": lambda args: StoreRows(store, args),
+        "sql": lambda args: SqlRows(from_frame, args),
+        "sql_store": lambda args: SqlRows(from_store, args),
+    }
+
+
+def _pages(rows, sort_by, ascending):
+    pages = [rows.page(p, PAGE_SIZE, sort_by, ascending) for p in range(-(-len(rows) // PAGE_SIZE))]
+    if not pages:
+        return []
+    out = pd.concat([p if isinstance(p, pd.DataFrame) else p.to_pandas() for p in pages], ignore_index=True)
+    return out[SORT_COLUMNS].astype(str).values.tolist()
+
+
+@pytest.mark.parametrize("filter_args", FILTERS)
+@pytest.mark.parametrize("query", ["", "ani", "ok"])
+def test_backends_return_same_pages(backends, filter_args, query):
+    rows = {name: make(filter_args).search(query) for name, make in backends.items()}
+    counts = {name: len(r) for name, r in rows.items()}
+    assert len(set(counts.values())) == 1, counts
+    for sort_by in SORT_COLUMNS:
+        for ascending in (True, False):
+            expected = _pages(rows["frame"], sort_by, ascending)
+            for name, r in rows.items():
+                assert _pages(r, sort_by, ascending) == expected, (name, sort_by, ascending)